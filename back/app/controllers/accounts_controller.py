@@ -1,5 +1,7 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from app.dal.queries.account_queries import ACCOUNT_COLUMNS
 from app.entities.requests.create_account_request import CreateAccountRequest
 from app.entities.requests.delete_account_request import DeleteAccountRequest
 from app.entities.requests.get_accounts_request import GetAccountsRequest
@@ -7,6 +9,8 @@ from app.entities.requests.login_request import LoginRequest
 from app.entities.requests.patient_request import PatientRequest
 from app.interfaces.controller import Controller
 from app.dal.proxy import Proxy
+from app.services.utils.pagination import Pagination
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 class AccountsController(Controller):
     """
@@ -50,6 +54,9 @@ class AccountsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="accounts")
+
         @app.post("/create-account", tags=["Controller Accounts"], summary="Create Account")
         async def create_account(create_account_request: CreateAccountRequest):
             """
@@ -66,10 +73,10 @@ class AccountsController(Controller):
             """
             try:
                 if create_account_request.role == 'doctor':
-                    account_db_instance.create_doctor(create_account_request)
+                    await Proxy.call(account_db_instance.create_doctor, create_account_request)
                     return {"success": True}
                 elif create_account_request.role == 'admin':
-                    account_db_instance.create_admin(create_account_request)
+                    await Proxy.call(account_db_instance.create_admin, create_account_request)
                     return {"success": True}
                 else:
                     return {"success": False}
@@ -91,14 +98,14 @@ class AccountsController(Controller):
             HTTPException: If there's an error creating the admin (status code 500).
             """
             try:
-                account_db_instance.delete_account(delete_account_request)
+                await Proxy.call(account_db_instance.delete_account, delete_account_request)
                 return {"success": True}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error creating admin: {e}")
 
         # Endpoint to handle login
         @app.post("/login", tags=["Controller Accounts"], summary="Login to the app")
-        def login(data: LoginRequest):
+        async def login(data: LoginRequest):
             """
             Auth account to perform login to the database.
 
@@ -113,7 +120,7 @@ class AccountsController(Controller):
             """
             try:
                 # Call the login method from AccountProxy
-                account = account_db_instance.login(data.email, data.password)
+                account = await Proxy.call(account_db_instance.login, data.email, data.password)
                 if account:
                     return {"success": True, "account": account[0]}
                 else:
@@ -131,21 +138,39 @@ class AccountsController(Controller):
             dict: A dictionary indicating the health status of the service.
             """
             return {"status": "ok", "message": "Service is up and running"}
+
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
         # Endpoint to create a new patient
         
         @app.post("/get-accounts", tags=["Accounts"], summary="Get all the accounts")
-        def get_accounts(account_data: GetAccountsRequest):
+        async def get_accounts(account_data: GetAccountsRequest):
             """
-            Get all the accounts from the database.
+            Get all the accounts from the database, or a page of them when a limit is given.
 
             Args:
-            - account_data (GetAccountsRequest): Contains the id field.
+            - account_data (GetAccountsRequest): Contains the id field, and the limit and cursor of a page.
 
             Returns:
-            - dict: Success message or error message with the accounts.
+            - dict: Success message or error message with the accounts, and the cursor of the next page when paginated.
+
+            Raises:
+            - HTTPException: If the cursor is invalid (status code 400).
             """
+            if account_data.limit is not None:
+                try:
+                    after_id = Pagination.decode_cursor(account_data.cursor)
+                except ValueError as e:
+                    raise HTTPException(status_code=400, detail=str(e))
+                try:
+                    rows = await Proxy.call(account_db_instance.get_accounts_page, account_data.id, after_id, account_data.limit + 1)
+                    accounts, next_cursor = Pagination.get_page(rows, account_data.limit, ACCOUNT_COLUMNS)
+                    return {"success": True, "accounts": accounts, "next_cursor": next_cursor}
+                except Exception as e:
+                    raise HTTPException(status_code=500, detail=f"Error retrieving accounts: {e}")
+
             try:
-                account_list = account_db_instance.get_accounts(account_data.id)
+                account_list = await Proxy.call(account_db_instance.get_accounts, account_data.id)
                 if account_list:
                     return {"success": True, "accounts": account_list}
                 else:
@@ -153,4 +178,26 @@ class AccountsController(Controller):
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error retrieving accounts: {e}")
 
+        # Endpoint to export the accounts as CSV
+        @app.get("/export-accounts/{id}", tags=["Accounts"], summary="Export the accounts as CSV")
+        async def export_accounts(id: int):
+            """
+            Stream all the accounts except the account with the id as CSV, without loading them in memory.
+
+            Args:
+            - id (int): The id of the user.
+
+            Returns:
+            - StreamingResponse: CSV file with the ACCOUNT_COLUMNS columns.
+
+            Raises:
+            - HTTPException: If there is an error reading the accounts (status code 500).
+            """
+            try:
+                rows = await Pagination.prefetch(account_db_instance.stream_accounts(id, Pagination.CONFIG["export_batch_size"]))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error exporting accounts: {e}")
+            return StreamingResponse(Pagination.stream_csv(ACCOUNT_COLUMNS, rows), media_type="text/csv",
+                                     headers={"Content-Disposition": 'attachment; filename="accounts.csv"'})
+
         return app
\ No newline at end of file
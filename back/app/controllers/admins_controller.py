@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.entities.requests.create_account_request import CreateAccountRequest
 from app.interfaces.controller import Controller
 from app.dal.proxy import Proxy
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 class AdminsController(Controller):
     """
@@ -46,6 +47,9 @@ class AdminsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="admins")
+
         # Endpoint to create a new admin
         @app.post("/create-admin", tags=["Controller Admins"], summary="Create Admin")
         async def create_admin(user_id: int):
@@ -62,7 +66,7 @@ class AdminsController(Controller):
             HTTPException: If there's an error creating the admin (status code 500).
             """
             try:
-                account_db_instance.create_admin(user_id)
+                await Proxy.call(account_db_instance.create_admin, user_id)
                 return {"message": "Admin created successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error creating admin: {e}")
@@ -83,7 +87,7 @@ class AdminsController(Controller):
             HTTPException: If admin is not found (status code 404) or if there's an error retrieving admin (status code 500).
             """
             try:
-                admin = account_db_instance.get_admin_by_user_id(user_id)
+                admin = await Proxy.call(account_db_instance.get_admin_by_user_id, user_id)
                 if admin:
                     return admin
                 else:
@@ -107,7 +111,7 @@ class AdminsController(Controller):
             HTTPException: If there's an error deleting the admin (status code 500).
             """
             try:
-                account_db_instance.delete_admin(user_id)
+                await Proxy.call(account_db_instance.delete_admin, user_id)
                 return {"message": "Admin deleted successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error deleting admin: {e}")
@@ -123,4 +127,7 @@ class AdminsController(Controller):
             """
             return {"status": "ok", "message": "Service is up and running"}
 
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
         return app
\ No newline at end of file
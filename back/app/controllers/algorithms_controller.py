@@ -2,6 +2,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from app.dal.proxy import Proxy
 from app.interfaces.controller import Controller
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 class AlgorithmsController(Controller):
     """
@@ -45,9 +46,12 @@ class AlgorithmsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="algorithms")
+
         # Endpoint to create a new algorithm
         @app.post("/create-algorithm", tags=["Controller Algorithms"], summary="Create Algorithm")
-        def create_algorithm(algorithm_name: str, success_rank: int, num_uses: int):
+        async def create_algorithm(algorithm_name: str, success_rank: int, num_uses: int):
             """
             Create a new algorithm.
 
@@ -63,14 +67,14 @@ class AlgorithmsController(Controller):
             HTTPException: If there's an error creating the algorithm (status code 500).
             """
             try:
-                algorithm_db_instance.create_algorithm(algorithm_name, success_rank, num_uses)
+                await Proxy.call(algorithm_db_instance.create_algorithm, algorithm_name, success_rank, num_uses)
                 return {"message": "Algorithm created successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error creating algorithm: {e}")
 
         # Endpoint to get all algorithms
         @app.get("/get-algorithms", tags=["Controller Algorithms"], summary="Get All Algorithms")
-        def get_algorithms():
+        async def get_algorithms():
             """
             Get all algorithms.
 
@@ -81,7 +85,7 @@ class AlgorithmsController(Controller):
             HTTPException: If algorithms are not found (status code 404) or if there's an error retrieving algorithms (status code 500).
             """
             try:
-                algorithms = algorithm_db_instance.get_algorithms()
+                algorithms = await Proxy.call(algorithm_db_instance.get_algorithms)
                 if algorithms:
                     return algorithms
                 else:
@@ -91,7 +95,7 @@ class AlgorithmsController(Controller):
 
         # Endpoint to get an algorithm by ID
         @app.get("/get-algorithm/{algorithm_id}", tags=["Controller Algorithms"], summary="Get Algorithm by ID")
-        def get_algorithm_by_id(algorithm_id: int):
+        async def get_algorithm_by_id(algorithm_id: int):
             """
             Get an algorithm by ID.
 
@@ -105,7 +109,7 @@ class AlgorithmsController(Controller):
             HTTPException: If algorithm is not found (status code 404) or if there's an error retrieving algorithm (status code 500).
             """
             try:
-                algorithm = algorithm_db_instance.get_algorithm_by_id(algorithm_id)
+                algorithm = await Proxy.call(algorithm_db_instance.get_algorithm_by_id, algorithm_id)
                 if algorithm:
                     return algorithm
                 else:
@@ -115,7 +119,7 @@ class AlgorithmsController(Controller):
 
         # Endpoint to update an algorithm
         @app.put("/update-algorithm/{algorithm_id}", tags=["Controller Algorithms"], summary="Update Algorithm")
-        def update_algorithm(algorithm_id: int, algorithm_name: str, success_rank: int, num_uses: int):
+        async def update_algorithm(algorithm_id: int, algorithm_name: str, success_rank: int, num_uses: int):
             """
             Update an existing algorithm.
 
@@ -132,14 +136,14 @@ class AlgorithmsController(Controller):
             HTTPException: If there's an error updating the algorithm (status code 500).
             """
             try:
-                algorithm_db_instance.update_algorithm(algorithm_id, algorithm_name, success_rank, num_uses)
+                await Proxy.call(algorithm_db_instance.update_algorithm, algorithm_id, algorithm_name, success_rank, num_uses)
                 return {"message": "Algorithm updated successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error updating algorithm: {e}")
 
         # Endpoint to delete an algorithm
         @app.delete("/delete-algorithm/{algorithm_id}", tags=["Controller Algorithms"], summary="Delete Algorithm")
-        def delete_algorithm(algorithm_id: int):
+        async def delete_algorithm(algorithm_id: int):
             """
             Delete an algorithm.
 
@@ -153,14 +157,14 @@ class AlgorithmsController(Controller):
             HTTPException: If there's an error deleting the algorithm (status code 500).
             """
             try:
-                algorithm_db_instance.delete_algorithm(algorithm_id)
+                await Proxy.call(algorithm_db_instance.delete_algorithm, algorithm_id)
                 return {"message": "Algorithm deleted successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error deleting algorithm: {e}")
 
         # Endpoint to get statistics related to algorithms
         @app.get("/get-algorithm-statistics", tags=["Controller Algorithms"], summary="Get Algorithm Statistics")
-        def get_algorithm_statistics():
+        async def get_algorithm_statistics():
             """
             Get statistics related to algorithms.
 
@@ -171,7 +175,7 @@ class AlgorithmsController(Controller):
             HTTPException: If algorithm statistics are not found (status code 404) or if there's an error retrieving algorithm statistics (status code 500).
             """
             try:
-                statistics = algorithm_db_instance.get_statistics()
+                statistics = await Proxy.call(algorithm_db_instance.get_statistics)
                 if statistics:
                     return statistics
                 else:
@@ -190,4 +194,7 @@ class AlgorithmsController(Controller):
             """
             return {"status": "ok", "message": "Service is up and running"}
 
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
         return app
\ No newline at end of file
@@ -1,12 +1,16 @@
 import sys
 import os
 from fastapi.responses import JSONResponse
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from app.services.utils.mapper import Mapper
 from app.entities.requests.risk_assessment_request import RiskAssessmentRequest
+from app.entities.requests.batch_risk_assessment_request import BatchRiskAssessmentRequest
 from app.services.dataset_ops.dataset_operation_service import DatasetOperationService
+from app.services.utils.inference_pool import InferencePool, InferencePoolFull
+from app.services.utils.job_queue import JobQueue, JobQueueFull
 from app.interfaces.controller import Controller
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -48,45 +52,165 @@ class DatasetPperationsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="dataset_operations")
+
         # Endpoint to preprocess all datasets
         @app.post("/preprocess_datasets", tags=["Controller DatasetOps"], summary="Preprocess all datasets")
-        def preprocess_datasets_controller():
+        def preprocess_datasets_controller(background: bool = Query(False)):
             """
             Endpoint to preprocess all datasets.
 
+            Args:
+            background (bool): Queue the preprocessing as a background job instead of waiting for it.
+
             Returns:
-            JSONResponse: A JSON response with a message indicating the result of the preprocessing.
+            JSONResponse: A JSON response with a message indicating the result of the preprocessing,
+                          or with the identifier of the training job when run in the background.
+
+            Raises:
+            HTTPException: If too many training jobs are already pending or running.
             """
+            if background:
+                try:
+                    job_id = DatasetOperationService.submit_preprocess_datasets()
+                except JobQueueFull as e:
+                    raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "60"})
+                return JSONResponse(status_code=202, content={"job_id": job_id})
+
             message = DatasetOperationService.preprocess_datasets()
             return JSONResponse(content={"message": message})
 
         # Endpoint to process all datasets
         @app.post("/process_datasets", tags=["Controller DatasetOps"], summary="Process all datasets")
-        def process_datasets_controller():
+        def process_datasets_controller(background: bool = Query(False)):
             """
             Endpoint to process all datasets.
 
+            Args:
+            background (bool): Queue the processing as a background job instead of waiting for it.
+
             Returns:
-            JSONResponse: A JSON response with a message indicating the result of the processing.
+            JSONResponse: A JSON response with a message indicating the result of the processing,
+                          or with the identifier of the training job when run in the background.
+
+            Raises:
+            HTTPException: If too many training jobs are already pending or running.
             """
+            if background:
+                try:
+                    job_id = DatasetOperationService.submit_process_datasets()
+                except JobQueueFull as e:
+                    raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "60"})
+                return JSONResponse(status_code=202, content={"job_id": job_id})
+
             message = DatasetOperationService.process_datasets()
             return JSONResponse(content={"message": message})
 
+        # Endpoint to list the training jobs
+        @app.get("/training-jobs", tags=["Controller DatasetOps"], summary="List training jobs")
+        def list_training_jobs_controller():
+            """
+            Endpoint to list the preprocess and process jobs, oldest first, without their results.
+
+            Returns:
+            JSONResponse: A JSON response with the training jobs.
+            """
+            return JSONResponse(content={"jobs": DatasetOperationService.get_training_jobs().list()})
+
+        # Endpoint to get the status of a training job
+        @app.get("/training-jobs/{job_id}", tags=["Controller DatasetOps"], summary="Get training job status")
+        def get_training_job_controller(job_id: str):
+            """
+            Endpoint to get the status and progress of a training job.
+
+            Args:
+            job_id (str): Identifier of the training job.
+
+            Returns:
+            JSONResponse: A JSON response with the training job without its result, its progress holds the
+                          current stage and the datasets or models done so far.
+
+            Raises:
+            HTTPException: If the training job is not found.
+            """
+            job = DatasetOperationService.get_training_jobs().get(job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail="Training job not found")
+            job.pop("result")
+            return JSONResponse(content=job)
+
+        # Endpoint to get the result of a training job
+        @app.get("/training-jobs/{job_id}/result", tags=["Controller DatasetOps"], summary="Get training job result")
+        def get_training_job_result_controller(job_id: str):
+            """
+            Endpoint to get the result of a finished training job.
+
+            Args:
+            job_id (str): Identifier of the training job.
+
+            Returns:
+            JSONResponse: A JSON response with the message of the preprocessing or processing.
+
+            Raises:
+            HTTPException: If the training job is not found, is not done, or failed.
+            """
+            job = DatasetOperationService.get_training_jobs().get(job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail="Training job not found")
+            if job["status"] == JobQueue.FAILED:
+                raise HTTPException(status_code=500, detail=f"Training job failed: {job['error']}")
+            if job["status"] != JobQueue.DONE:
+                raise HTTPException(status_code=409, detail=f"Training job is {job['status']}")
+            return JSONResponse(content={"message": job["result"]})
+
+        # Endpoint to cancel a training job
+        @app.post("/training-jobs/{job_id}/cancel", tags=["Controller DatasetOps"], summary="Cancel training job", status_code=202)
+        def cancel_training_job_controller(job_id: str):
+            """
+            Endpoint to cancel a training job. A pending job is cancelled right away, a running one
+            stops at its next dataset or model, without installing the models it trained.
+
+            Args:
+            job_id (str): Identifier of the training job.
+
+            Returns:
+            JSONResponse: A JSON response with the training job without its result.
+
+            Raises:
+            HTTPException: If the training job is not found or already finished.
+            """
+            jobs = DatasetOperationService.get_training_jobs()
+            job = jobs.get(job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail="Training job not found")
+            if job["status"] in JobQueue.FINISHED:
+                raise HTTPException(status_code=409, detail=f"Training job is {job['status']}")
+            job = jobs.cancel(job_id)
+            job.pop("result")
+            return JSONResponse(status_code=202, content=job)
+
         # Endpoint to get risk assessment
         @app.post("/get-risk-assessment", tags=["Controller DatasetOps"], summary="Get risk assessment")
-        def get_risk_assessment_controller(data: RiskAssessmentRequest):
+        async def get_risk_assessment_controller(data: RiskAssessmentRequest):
             """
-            Endpoint to get risk assessment.
+            Endpoint to get risk assessment, calculated in the inference pool so the other endpoints stay responsive.
 
             Args:
             data (RiskAssessmentRequest): The risk assessment request data.
 
             Returns:
             JSONResponse: A JSON response with details of the risk assessment calculations.
+
+            Raises:
+            HTTPException: If the inference pool has too many pending risk assessments.
             """
             request = Mapper().map_to_risk_assessment_request(data)
 
-            result = DatasetOperationService.get_risk_assessment(request)
+            try:
+                result = await DatasetOperationService.get_risk_assessment_async(request)
+            except InferencePoolFull as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
             message = ""
 
@@ -94,7 +218,59 @@ class DatasetPperationsController(Controller):
                 message += f"- {key}: {value}\n"
 
             return JSONResponse(content={"message": message})
+
+        # Endpoint to get the risk assessment of several patients at once
+        @app.post("/get-risk-assessments", tags=["Controller DatasetOps"], summary="Get risk assessments of several patients")
+        async def get_risk_assessments_controller(data: BatchRiskAssessmentRequest):
+            """
+            Endpoint to get the risk assessment of several patients in a single request.
+
+            Args:
+            data (BatchRiskAssessmentRequest): The risk assessment request data of each patient.
+
+            Returns:
+            JSONResponse: A JSON response with the risk assessment of each patient, in request order.
+
+            Raises:
+            HTTPException: If the inference pool has too many pending risk assessments.
+            """
+            mapper = Mapper()
+            requests = [mapper.map_to_risk_assessment_request(patient) for patient in data.patients]
+
+            try:
+                results = await DatasetOperationService.get_risk_assessments_async(requests)
+            except InferencePoolFull as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+            assessments = [
+                {"name": patient.name, "email": patient.email, "assessment": result}
+                for patient, result in zip(data.patients, results)
+            ]
+
+            return JSONResponse(content={"assessments": assessments})
     
+        # Endpoint to get the risk assessment cache counters
+        @app.get("/risk-assessment-cache", tags=["Controller DatasetOps"], summary="Get risk assessment cache statistics")
+        def get_risk_assessment_cache_controller():
+            """
+            Endpoint to get the hit and miss counters of the risk assessment cache.
+
+            Returns:
+            JSONResponse: A JSON response with the cache statistics.
+            """
+            return JSONResponse(content=DatasetOperationService.get_cache().get_stats())
+
+        # Endpoint to get the inference pool counters
+        @app.get("/inference-pool", tags=["Controller DatasetOps"], summary="Get inference pool statistics")
+        def get_inference_pool_controller():
+            """
+            Endpoint to get the configuration and task counters of the inference worker pool.
+
+            Returns:
+            JSONResponse: A JSON response with the inference pool statistics.
+            """
+            return JSONResponse(content=InferencePool.get_instance().get_stats())
+
         # Endpoint for health check
         @app.get("/health", tags=["Health Check"], summary="Health Check")
         def health_check():
@@ -106,4 +282,7 @@ class DatasetPperationsController(Controller):
             """
             return {"status": "ok", "message": "Service is up and running"}
 
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
         return app
\ No newline at end of file
@@ -8,6 +8,7 @@ from app.entities.datasets.ckd import Ckd
 from app.entities.datasets.disease import Disease
 from app.entities.datasets.maternal import Maternal
 from app.interfaces.controller import Controller
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -52,6 +53,9 @@ class DatasetViewsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="dataset_views")
+
         # Summary explaining the controllers
         """
         This FastAPI application provides endpoints for various functionalities including account management, dataset management, preprocessing, model training, and patient risk assessment. Each controller is categorized based on its functionality.
@@ -71,7 +75,7 @@ class DatasetViewsController(Controller):
             dict: A dictionary with a message indicating the success of the operation.
             """
             try:
-                ds_db_instance.create_dataset(name, description)
+                await Proxy.call(ds_db_instance.create_dataset, name, description)
                 return {"message": "Dataset created successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error creating dataset: {e}")
@@ -92,7 +96,7 @@ class DatasetViewsController(Controller):
             HTTPException: If the dataset with the given ID is not found.
             """
             try:
-                dataset = ds_db_instance.get_dataset_by_id(dataset_id)
+                dataset = await Proxy.call(ds_db_instance.get_dataset_by_id, dataset_id)
                 if dataset:
                     return dataset
                 else:
@@ -117,7 +121,7 @@ class DatasetViewsController(Controller):
             HTTPException: If there is an error updating the dataset description.
             """
             try:
-                ds_db_instance.update_dataset_description(dataset_id, new_description)
+                await Proxy.call(ds_db_instance.update_dataset_description, dataset_id, new_description)
                 return {"message": "Dataset description updated successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error updating dataset description: {e}")
@@ -138,7 +142,7 @@ class DatasetViewsController(Controller):
             HTTPException: If there is an error deleting the dataset.
             """
             try:
-                ds_db_instance.delete_dataset(dataset_id)
+                await Proxy.call(ds_db_instance.delete_dataset, dataset_id)
                 return {"message": "Dataset deleted successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error deleting dataset: {e}")
@@ -171,4 +175,7 @@ class DatasetViewsController(Controller):
             """
             return {"status": "ok", "message": "Service is up and running"}
 
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
         return app
\ No newline at end of file
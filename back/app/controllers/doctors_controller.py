@@ -4,6 +4,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from app.dal.proxy import Proxy
 from app.interfaces.controller import Controller
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 # Add parent directory to sys.path to ensure relative imports work correctly
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -49,6 +50,9 @@ class DoctorsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="doctors")
+
         # Summary explaining the controllers
         """
         This FastAPI application provides endpoints for various functionalities including account management, dataset management, preprocessing, model training, and patient risk assessment. Each controller is categorized based on its functionality.
@@ -56,7 +60,7 @@ class DoctorsController(Controller):
 
         # Endpoint to create a doctor
         @app.post("/create-doctor", tags=["Controller Doctors"], summary="Create Doctor")
-        def create_doctor(user_id: int, rank: str, phoneNumber: str, numberOfPatients: int, active: bool, dateOfBirth: str):
+        async def create_doctor(user_id: int, rank: str, phoneNumber: str, numberOfPatients: int, active: bool, dateOfBirth: str):
             """
             Endpoint to create a new doctor.
 
@@ -75,14 +79,14 @@ class DoctorsController(Controller):
             HTTPException: If there is an error creating the doctor.
             """
             try:
-                account_db_instance.create_doctor(user_id, rank, phoneNumber, numberOfPatients, active, dateOfBirth)
+                await Proxy.call(account_db_instance.create_doctor, user_id, rank, phoneNumber, numberOfPatients, active, dateOfBirth)
                 return {"message": "Doctor created successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error creating doctor: {e}")
 
         # Endpoint to get a doctor by user ID
         @app.get("/get-doctor/{user_id}", tags=["Controller Doctors"], summary="Get Doctor by User ID")
-        def get_doctor_by_user_id(user_id: int):
+        async def get_doctor_by_user_id(user_id: int):
             """
             Endpoint to get doctor details by user ID.
 
@@ -96,7 +100,7 @@ class DoctorsController(Controller):
             HTTPException: If the doctor with the given ID is not found.
             """
             try:
-                doctor = account_db_instance.get_doctor_by_user_id(user_id)
+                doctor = await Proxy.call(account_db_instance.get_doctor_by_user_id, user_id)
                 if doctor:
                     return doctor
                 else:
@@ -106,7 +110,7 @@ class DoctorsController(Controller):
 
         # Endpoint to update a doctor
         @app.put("/update-doctor/{user_id}", tags=["Controller Doctors"], summary="Update Doctor")
-        def update_doctor(user_id: int, rank: str, phoneNumber: str, numberOfPatients: int, active: bool, dateOfBirth: str):
+        async def update_doctor(user_id: int, rank: str, phoneNumber: str, numberOfPatients: int, active: bool, dateOfBirth: str):
             """
             Endpoint to update doctor details.
 
@@ -125,14 +129,14 @@ class DoctorsController(Controller):
             HTTPException: If there is an error updating the doctor.
             """
             try:
-                account_db_instance.update_doctor(user_id, rank, phoneNumber, numberOfPatients, active, dateOfBirth)
+                await Proxy.call(account_db_instance.update_doctor, user_id, rank, phoneNumber, numberOfPatients, active, dateOfBirth)
                 return {"message": "Doctor updated successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error updating doctor: {e}")
 
         # Endpoint to delete a doctor
         @app.delete("/delete-doctor/{user_id}", tags=["Controller Doctors"], summary="Delete Doctor")
-        def delete_doctor(user_id: int):
+        async def delete_doctor(user_id: int):
             """
             Endpoint to delete a doctor.
 
@@ -146,7 +150,7 @@ class DoctorsController(Controller):
             HTTPException: If there is an error deleting the doctor.
             """
             try:
-                account_db_instance.delete_doctor(user_id)
+                await Proxy.call(account_db_instance.delete_doctor, user_id)
                 return {"message": "Doctor deleted successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error deleting doctor: {e}")
@@ -162,4 +166,7 @@ class DoctorsController(Controller):
             """
             return {"status": "ok", "message": "Service is up and running"}
 
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
         return app
\ No newline at end of file
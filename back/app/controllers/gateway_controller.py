@@ -0,0 +1,149 @@
+import sys
+import os
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
+from app.interfaces.controller import Controller
+from app.controllers.accounts_controller import AccountsController
+from app.controllers.admins_controller import AdminsController
+from app.controllers.algorithms_controller import AlgorithmsController
+from app.controllers.dataset_operations_controller import DatasetPperationsController
+from app.controllers.dataset_views_controller import DatasetViewsController
+from app.controllers.doctors_controller import DoctorsController
+from app.controllers.models_controller import ModelsController
+from app.controllers.patients_controller import PatientsController
+from app.controllers.tools_controller import ToolsController
+from app.controllers.utils_controller import UtilsController
+from app.controllers.widgets_controller import WidgetsController
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
+
+# Add parent directory to sys.path to ensure relative imports work correctly
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+class GatewayController(Controller):
+    """
+    Controller class serving the endpoints of every controller from a single FastAPI application.
+    """
+
+    _instance = None
+
+    # Controllers mounted in the gateway, in the order of their ports in the per-port layout
+    CONTROLLERS = [
+        AccountsController,
+        AdminsController,
+        AlgorithmsController,
+        DatasetPperationsController,
+        DatasetViewsController,
+        DoctorsController,
+        ModelsController,
+        PatientsController,
+        WidgetsController,
+        UtilsController,
+        ToolsController
+    ]
+
+    # Endpoints keeping their state in the process serving them: the trained models and the training
+    # and evaluation jobs. With several gateway workers, the next request would reach another worker.
+    STATEFUL_PATHS = (
+        "/preprocess_datasets",
+        "/process_datasets",
+        "/training-jobs",
+        "/evaluate",
+        "/evaluations"
+    )
+
+    @classmethod
+    def get_app(cls, workers=1):
+        """
+        Singleton method to get or create an instance of the FastAPI application.
+
+        Args:
+        workers (int, optional): Number of gateway worker processes serving the application. Defaults to 1.
+
+        Returns:
+        FastAPI: An instance of the FastAPI application.
+        """
+        if cls._instance is None:
+            cls._instance = cls._create_instance(workers)
+        return cls._instance
+
+    @staticmethod
+    def _refuse(route):
+        """
+        Replace an endpoint that cannot be served by several gateway workers by one answering 501.
+
+        Args:
+        route (APIRoute): Route of the stateful endpoint.
+
+        Returns:
+        APIRoute: Route with the same path and methods, always answering 501.
+        """
+        def refuse():
+            """
+            Endpoint refusing a request that must be served by a single process.
+
+            Raises:
+            HTTPException: Always, the endpoint is not available with several gateway workers.
+            """
+            raise HTTPException(status_code=501, detail=f"{route.path} is not available when the gateway runs several "
+                                                        "worker processes, start it with --workers 1 or in ports mode")
+
+        return APIRoute(route.path, refuse, methods=route.methods, tags=route.tags, summary=route.summary)
+
+    @classmethod
+    def _create_instance(cls, workers=1):
+        """
+        Private method to create a new instance of the FastAPI application.
+
+        The API routes of every controller application are added to the gateway, each path and
+        method being served by the first controller declaring it, so the health check is only
+        served once. With several workers, the STATEFUL_PATHS endpoints answer 501.
+
+        Args:
+        workers (int, optional): Number of gateway worker processes serving the application. Defaults to 1.
+
+        Returns:
+        FastAPI: A new instance of the FastAPI application.
+        """
+        app = FastAPI(debug=True)
+
+        # Configure CORS middleware for cross-origin requests
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["*"],  # Replace "*" with your specific origins if needed
+            allow_credentials=True,
+            allow_methods=["GET", "POST", "PUT", "DELETE"],
+            allow_headers=["Content-Type", "Authorization"],
+        )
+
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="gateway")
+
+        # Endpoint for health check
+        @app.get("/health", tags=["Health Check"], summary="Health Check")
+        def health_check():
+            """
+            Health check endpoint to verify the service is running.
+
+            Returns:
+            dict: A dictionary indicating the health status of the service.
+            """
+            return {"status": "ok", "message": "Service is up and running"}
+
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
+        mounted = {(route.path, method) for route in app.router.routes if isinstance(route, APIRoute) for method in route.methods}
+        for controller in cls.CONTROLLERS:
+            for route in controller.get_app().router.routes:
+                if not isinstance(route, APIRoute):
+                    continue  # Documentation routes are generated by the gateway itself
+                keys = {(route.path, method) for method in route.methods}
+                if keys & mounted:
+                    continue
+                if workers > 1 and route.path.startswith(cls.STATEFUL_PATHS):
+                    route = cls._refuse(route)
+                app.router.routes.append(route)
+                mounted |= keys
+
+        return app
@@ -4,6 +4,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from app.dal.proxy import Proxy
 from app.interfaces.controller import Controller
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 # Add parent directory to sys.path to ensure relative imports work correctly
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -49,6 +50,9 @@ class ModelsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="models")
+
         # Summary explaining the controllers
         """
         This FastAPI application provides endpoints for various functionalities including account management, dataset management, preprocessing, model training, and patient risk assessment. Each controller is categorized based on its functionality.
@@ -56,7 +60,7 @@ class ModelsController(Controller):
 
         # Endpoint to create a model
         @app.post("/create-model", tags=["Controller Models"], summary="Create Model")
-        def create_model(name: str, labeled: bool):
+        async def create_model(name: str, labeled: bool):
             """
             Endpoint to create a new model.
 
@@ -71,14 +75,14 @@ class ModelsController(Controller):
             HTTPException: If there is an error creating the model.
             """
             try:
-                models_db_instance.create_model(name, labeled)
+                await Proxy.call(models_db_instance.create_model, name, labeled)
                 return {"message": "Model created successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error creating model: {e}")
 
         # Endpoint to get a model by ID
         @app.get("/get-model/{model_id}", tags=["Controller Models"], summary="Get Model by ID")
-        def get_model(model_id: int):
+        async def get_model(model_id: int):
             """
             Endpoint to get model details by ID.
 
@@ -92,7 +96,7 @@ class ModelsController(Controller):
             HTTPException: If the model with the given ID is not found.
             """
             try:
-                model = models_db_instance.get_model_by_id(model_id)
+                model = await Proxy.call(models_db_instance.get_model_by_id, model_id)
                 if model:
                     return model
                 else:
@@ -102,7 +106,7 @@ class ModelsController(Controller):
 
         # Endpoint to update a model
         @app.put("/update-model/{model_id}", tags=["Controller Models"], summary="Update Model")
-        def update_model(model_id: int, name: str, labeled: bool):
+        async def update_model(model_id: int, name: str, labeled: bool):
             """
             Endpoint to update model details.
 
@@ -118,14 +122,14 @@ class ModelsController(Controller):
             HTTPException: If there is an error updating the model.
             """
             try:
-                models_db_instance.update_model(model_id, name, labeled)
+                await Proxy.call(models_db_instance.update_model, model_id, name, labeled)
                 return {"message": "Model updated successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error updating model: {e}")
 
         # Endpoint to delete a model
         @app.delete("/delete-model/{model_id}", tags=["Controller Models"], summary="Delete Model")
-        def delete_model(model_id: int):
+        async def delete_model(model_id: int):
             """
             Endpoint to delete a model.
 
@@ -139,14 +143,14 @@ class ModelsController(Controller):
             HTTPException: If there is an error deleting the model.
             """
             try:
-                models_db_instance.delete_model(model_id)
+                await Proxy.call(models_db_instance.delete_model, model_id)
                 return {"message": "Model deleted successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error deleting model: {e}")
 
         # Endpoint to get all models
         @app.get("/get-all-models", tags=["Controller Models"], summary="Get All Models")
-        def get_all_models():
+        async def get_all_models():
             """
             Endpoint to get all models.
 
@@ -157,7 +161,7 @@ class ModelsController(Controller):
             HTTPException: If there is an error retrieving models.
             """
             try:
-                models = models_db_instance.get_all_models()
+                models = await Proxy.call(models_db_instance.get_all_models)
                 if models:
                     return models
                 else:
@@ -176,4 +180,7 @@ class ModelsController(Controller):
             """
             return {"status": "ok", "message": "Service is up and running"}
 
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
         return app
\ No newline at end of file
@@ -1,12 +1,18 @@
 import base64
 import sys
 import os
-from fastapi import Body, FastAPI, File, Form, HTTPException, Request, UploadFile
+from typing import Literal, Optional
+from fastapi import Body, FastAPI, File, Form, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from app.dal.proxy import Proxy
+from app.dal.queries.account_queries import PATIENT_COLUMNS
 from app.entities.requests.patient_request import PatientRequest
 from app.interfaces.controller import Controller
+from app.services.utils.image_store import ImageStore
+from app.services.utils.pagination import Pagination
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 # Add parent directory to sys.path to ensure relative imports work correctly
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -42,6 +48,7 @@ class PatientsController(Controller):
 
         proxy_instance = Proxy()
         account_db_instance = proxy_instance.account_db
+        image_store = ImageStore.get_instance()
 
         # Configure CORS middleware for cross-origin requests
         app.add_middleware(
@@ -52,6 +59,9 @@ class PatientsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="patients")
+
         # Summary explaining the controllers
         """
         This FastAPI application provides endpoints for various functionalities including account management, dataset management, preprocessing, model training, and patient risk assessment. Each controller is categorized based on its functionality.
@@ -78,50 +88,210 @@ class PatientsController(Controller):
             HTTPException: If there is an error creating the patient.
             """
             try:
-                base64_data = patient_data.image.split('base64,')[1]
+                header, base64_data = patient_data.image.split('base64,', 1)
+                content_type = header.removeprefix('data:').rstrip(';') or "image/jpeg"
 
-                image_data = base64.b64decode(base64_data)
+                # Decoding and writing the photo are blocking, keep them off the event loop
+                image_data = await run_in_threadpool(base64.b64decode, base64_data)
+                file_name = await run_in_threadpool(image_store.save_bytes, image_data, content_type)
 
-                file_name = f'app\\dal\\images\\{patient_data.email}.jpg'  # You can change the file extension based on the image type
+                await Proxy.call(account_db_instance.create_patient, patient_data.name, patient_data.age, patient_data.phone_number, file_name, patient_data.email, patient_data.doctor_id)
+                return {"message": "Patient created successfully"}
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error creating patient: {e}")
 
-                with open(file_name, 'wb') as f:
-                    f.write(image_data)
+        # Endpoint to create a patient from a multipart form with the photo as a file
+        @app.post("/upload-patient", tags=["Controller Patients"], summary="Create Patient with Photo Upload")
+        async def upload_patient(name: str = Form(...), age: int = Form(...), phone_number: str = Form(...), email: str = Form(...),
+                                 doctor_id: int = Form(...), photo: UploadFile = File(...), downscale: bool = Form(False)):
+            """
+            Endpoint to create a new patient, streaming the photo to disk instead of sending it as base64.
 
-                account_db_instance.create_patient(patient_data.name, patient_data.age, patient_data.phone_number, f'{patient_data.email}.jpg', patient_data.email, patient_data.doctor_id)
-                return {"message": "Patient created successfully"}
+            Args:
+            name (str): The name of the patient.
+            age (int): The age of the patient.
+            phone_number (str): The phone number of the patient.
+            email (str): Email address of the patient.
+            doctor_id (int): ID of the doctor associated with the patient.
+            photo (UploadFile): Photo of the patient, a JPEG, PNG, GIF or WebP image.
+            downscale (bool, optional): Whether to downscale the photo to the maximum dimension. Defaults to False.
+
+            Returns:
+            dict: A dictionary with a message indicating the success of the operation and the file name of the photo.
+
+            Raises:
+            HTTPException: If the photo is invalid, or there is an error creating the patient.
+            """
+            try:
+                # The photo is hashed and written in chunks in a worker thread
+                file_name = await run_in_threadpool(image_store.save, photo.file, photo.content_type, downscale)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except ImportError as e:
+                raise HTTPException(status_code=501, detail=str(e))
+            finally:
+                await photo.close()
+
+            try:
+                await Proxy.call(account_db_instance.create_patient, name, age, phone_number, file_name, email, doctor_id)
+                return {"message": "Patient created successfully", "photo": file_name}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error creating patient: {e}")
-            
-        def load_image_as_base64(image_path):
-            with open(image_path, 'rb') as image_file:
-                return base64.b64encode(image_file.read()).decode('utf-8')
-            
+
+        def get_image(file_name, images, request):
+            # Image of a patient in a listing: URL of the photo, base64 thumbnail or base64 photo
+            path = image_store.get_path(file_name)
+            if path is None:
+                return None
+            if images == "url":
+                return str(request.url_for("get_patient_image", file_name=file_name))
+            if images == "thumbnail":
+                try:
+                    return ImageStore.load_base64(image_store.get_thumbnail_path(file_name))
+                except ImportError as e:
+                    print(f"Error: {e}")  # Without Pillow the full photo is sent
+                except OSError as e:
+                    # A photo Pillow cannot read, such as a corrupt or truncated file, only loses its thumbnail
+                    print(f"Error creating thumbnail of {file_name}: {e}")
+                    return str(request.url_for("get_patient_image", file_name=file_name))
+            return ImageStore.load_base64(path)
+
+        def load_patient_images(patients, images, request):
+            modified_patients = []
+            for patient in patients:
+                image = get_image(patient[5], images, request)  # Assuming index 5 is the path to the image
+                if image is not None:
+                    new_patient = patient[:5] + (image,) + patient[6:]
+                    modified_patients.append(new_patient)
+                else:
+                    print(f"Image not found for patient: {patient[1]}")
+                    modified_patients.append(patient)
+            return modified_patients
+
+        def load_page_images(patients, images, request):
+            for patient in patients:
+                image = get_image(patient["photo"], images, request)
+                if image is not None:
+                    patient["photo"] = image
+            return patients
+
+        def send_image(path, request):
+            # Send an image file, or a 304 when the client copy is current, ranges are handled by FileResponse
+            etag, last_modified, stat_result = ImageStore.get_validators(path)
+            headers = {"etag": etag, "last-modified": last_modified, "cache-control": ImageStore.CONFIG["cache_control"]}
+            if ImageStore.is_not_modified(request.headers, etag, last_modified):
+                return Response(status_code=304, headers=headers)
+            return FileResponse(path, stat_result=stat_result, headers=headers)
+
         # Endpoint to get patients by doctor ID
         @app.get("/get-patients/{doctor_id}", tags=["Controller Patients"], summary="Get Patients by Doctor ID")
-        def get_patients_by_doctor_id(doctor_id: int):
+        async def get_patients_by_doctor_id(doctor_id: int, request: Request, limit: Optional[int] = Query(None, ge=1, le=Pagination.CONFIG["max_limit"]), cursor: Optional[str] = None,
+                                            images: Literal["url", "thumbnail", "base64"] = "url"):
+            """
+            Endpoint to get the patients of a doctor, or a page of them when a limit is given.
+
+            Args:
+            doctor_id (int): ID of the doctor.
+            limit (int, optional): Page size, every patient is returned when it is not set.
+            cursor (str, optional): Cursor token of the next page, returned by the previous page.
+            images (str, optional): Photo of each patient as the URL of the photo, a base64 thumbnail or the base64 photo. Defaults to 'url'.
+
+            Returns:
+            list or dict: Patients of the doctor, or the patients of the page and the cursor of the next page.
+
+            Raises:
+            HTTPException: If the cursor is invalid or there is an error retrieving the patients.
+            """
+            if limit is not None:
+                try:
+                    after_id = Pagination.decode_cursor(cursor)
+                except ValueError as e:
+                    raise HTTPException(status_code=400, detail=str(e))
+                try:
+                    rows = await Proxy.call(account_db_instance.get_patients_page_by_doctor_id, doctor_id, after_id, limit + 1)
+                    patients, next_cursor = Pagination.get_page(rows, limit, PATIENT_COLUMNS)
+                    return {"patients": await run_in_threadpool(load_page_images, patients, images, request), "next_cursor": next_cursor}
+                except Exception as e:
+                    raise HTTPException(status_code=500, detail=f"Error retrieving patients: {e}")
+
             try:
-                patients = account_db_instance.get_patients_by_doctor_id(doctor_id)
+                patients = await Proxy.call(account_db_instance.get_patients_by_doctor_id, doctor_id)
                 if not patients:
                     return []
 
-                modified_patients = []
-                for patient in patients:
-                    image_path = f'app\\dal\\images\\{patient[5]}'  # Assuming index 5 is the path to the image
-                    if os.path.exists(image_path):
-                        image_binary = load_image_as_base64(image_path)
-                        new_patient = patient[:5] + (image_binary,) + patient[6:]
-                        modified_patients.append(new_patient)
-                    else:
-                        print(f"Image not found for patient: {patient[1]}")
-                        modified_patients.append(patient)
-    
-                return modified_patients
+                # Reading the images is blocking, keep it off the event loop
+                return await run_in_threadpool(load_patient_images, patients, images, request)
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error retrieving patients: {e}")
 
+        # Endpoint to get the photo of a patient
+        @app.get("/patient-image/{file_name}", name="get_patient_image", tags=["Controller Patients"], summary="Get Patient Photo")
+        async def get_patient_image(file_name: str, request: Request):
+            """
+            Endpoint to get the photo of a patient, with ETag and Last-Modified validators and range support.
+
+            Args:
+            file_name (str): File name of the photo.
+
+            Returns:
+            FileResponse: Photo of the patient, or an empty 304 response if the client copy is current.
+
+            Raises:
+            HTTPException: If the photo is not found.
+            """
+            path = image_store.get_path(file_name)
+            if path is None:
+                raise HTTPException(status_code=404, detail="Image not found")
+            return send_image(path, request)
+
+        # Endpoint to get the thumbnail of the photo of a patient
+        @app.get("/patient-thumbnail/{file_name}", tags=["Controller Patients"], summary="Get Patient Photo Thumbnail")
+        async def get_patient_thumbnail(file_name: str, request: Request):
+            """
+            Endpoint to get the thumbnail of the photo of a patient, generated on first use and cached.
+
+            Args:
+            file_name (str): File name of the photo.
+
+            Returns:
+            FileResponse: Thumbnail of the photo, or an empty 304 response if the client copy is current.
+
+            Raises:
+            HTTPException: If the photo is not found, or thumbnails are not available.
+            """
+            try:
+                thumbnail_path = await run_in_threadpool(image_store.get_thumbnail_path, file_name)
+            except ImportError as e:
+                raise HTTPException(status_code=501, detail=str(e))
+            if thumbnail_path is None:
+                raise HTTPException(status_code=404, detail="Image not found")
+            return send_image(thumbnail_path, request)
+
+        # Endpoint to export the patients of a doctor as CSV
+        @app.get("/export-patients/{doctor_id}", tags=["Controller Patients"], summary="Export Patients by Doctor ID as CSV")
+        async def export_patients_by_doctor_id(doctor_id: int):
+            """
+            Endpoint to stream the patients of a doctor as CSV, without loading them in memory.
+
+            Args:
+            doctor_id (int): ID of the doctor.
+
+            Returns:
+            StreamingResponse: CSV file with the PATIENT_COLUMNS columns.
+
+            Raises:
+            HTTPException: If there is an error reading the patients.
+            """
+            try:
+                rows = await Pagination.prefetch(account_db_instance.stream_patients_by_doctor_id(doctor_id, Pagination.CONFIG["export_batch_size"]))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error exporting patients: {e}")
+            return StreamingResponse(Pagination.stream_csv(PATIENT_COLUMNS, rows), media_type="text/csv",
+                                     headers={"Content-Disposition": f'attachment; filename="patients_{doctor_id}.csv"'})
+
         # Endpoint to update a patient
         @app.put("/update-patient/{patient_id}", tags=["Controller Patients"], summary="Update Patient")
-        def update_patient(patient_id: int, name: str, description: str, imagePath: str, email: str, doctor_id: int):
+        async def update_patient(patient_id: int, name: str, description: str, imagePath: str, email: str, doctor_id: int):
             """
             Endpoint to update patient details.
 
@@ -140,14 +310,14 @@ class PatientsController(Controller):
             HTTPException: If there is an error updating the patient.
             """
             try:
-                account_db_instance.update_patient(name, description, imagePath, email, doctor_id, patient_id)
+                await Proxy.call(account_db_instance.update_patient, name, description, imagePath, email, doctor_id, patient_id)
                 return {"message": "Patient updated successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error updating patient: {e}")
 
         # Endpoint to delete a patient
         @app.delete("/delete-patient/{patient_id}", tags=["Controller Patients"], summary="Delete Patient")
-        def delete_patient(patient_id: int):
+        async def delete_patient(patient_id: int):
             """
             Endpoint to delete a patient.
 
@@ -161,7 +331,7 @@ class PatientsController(Controller):
             HTTPException: If there is an error deleting the patient.
             """
             try:
-                account_db_instance.delete_patient(patient_id)
+                await Proxy.call(account_db_instance.delete_patient, patient_id)
                 return {"message": "Patient deleted successfully"}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error deleting patient: {e}")
@@ -177,4 +347,7 @@ class PatientsController(Controller):
             """
             return {"status": "ok", "message": "Service is up and running"}
 
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
         return app
\ No newline at end of file
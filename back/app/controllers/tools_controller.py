@@ -1,15 +1,21 @@
 import sys
 import os
+from typing import Literal, Optional
 from fastapi.responses import JSONResponse
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 import pandas as pd  
+from app.services.utils.dataset_bundle import DatasetBundle
+from app.services.utils.evaluation_engine import EvaluationEngine
+from app.services.utils.job_queue import JobQueueFull
+from app.services.utils.result_writer import ResultWriter
 from app.services.utils.tools import filter_test_columns, process_and_append_cass_data, process_and_append_ckd_data, process_and_append_disease_data, process_and_append_maternal_data, split_dataset
 from app.entities.datasets.disease import Disease
 from app.entities.datasets.ckd import Ckd
 from app.entities.datasets.cassi import Cassi
 from app.entities.datasets.maternal import Maternal
 from app.interfaces.controller import Controller
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 # Add parent directory to sys.path to ensure relative imports work correctly
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -52,17 +58,35 @@ class ToolsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="tools")
+
+        def check_output_format(output_format):
+            # Parquet output needs pyarrow, checked before the dataset is scored
+            try:
+                ResultWriter.check_format(output_format)
+            except ImportError as e:
+                raise HTTPException(status_code=501, detail=str(e))
+
         # Endpoint to test cass dataset
         @app.post("/test-cass", tags=["Controller Tools"], summary="Test cass")
-        def test_cass_controller():
+        def test_cass_controller(output_format: Literal["csv", "parquet"] = "csv"):
             """
             Endpoint to test cass dataset.
 
+            Args:
+            output_format (str): Format of the result files, "csv" or "parquet".
+
             Returns:
             JSONResponse: A JSON response indicating the success of the operation.
+
+            Raises:
+            HTTPException: If the output format needs a package that is not installed.
             """
+            check_output_format(output_format)
+
             # 1. Load the CSV
-            cassi = Cassi()
+            cassi = DatasetBundle.pin(Cassi())
             df = cassi.df_raw
 
             # 2. Split the dataset
@@ -74,19 +98,27 @@ class ToolsController(Controller):
             df = filter_test_columns(test_df, columns_to_keep)
 
             # Pass the processed DataFrame to the second function
-            return process_and_append_cass_data(cassi, df)
+            return process_and_append_cass_data(cassi, df, output_format=output_format)
 
         # Endpoint to test maternal dataset
         @app.post("/test-maternal", tags=["Controller Tools"], summary="Test maternal")
-        def test_maternal_controller():
+        def test_maternal_controller(output_format: Literal["csv", "parquet"] = "csv"):
             """
             Endpoint to test maternal dataset.
 
+            Args:
+            output_format (str): Format of the result files, "csv" or "parquet".
+
             Returns:
             JSONResponse: A JSON response indicating the success of the operation.
+
+            Raises:
+            HTTPException: If the output format needs a package that is not installed.
             """
+            check_output_format(output_format)
+
             # 1. Load the CSV
-            maternal = Maternal()
+            maternal = DatasetBundle.pin(Maternal())
             df = maternal.df_raw
 
             # 2. Split the dataset
@@ -98,19 +130,27 @@ class ToolsController(Controller):
             df = filter_test_columns(test_df, columns_to_keep)
 
             # Pass the processed DataFrame to the second function
-            return process_and_append_maternal_data(maternal, df)
+            return process_and_append_maternal_data(maternal, df, output_format=output_format)
 
         # Endpoint to test ckd dataset
         @app.post("/test-ckd", tags=["Controller Tools"], summary="Test ckd")
-        def test_ckd_controller():
+        def test_ckd_controller(output_format: Literal["csv", "parquet"] = "csv"):
             """
             Endpoint to test ckd dataset.
 
+            Args:
+            output_format (str): Format of the result files, "csv" or "parquet".
+
             Returns:
             JSONResponse: A JSON response indicating the success of the operation.
+
+            Raises:
+            HTTPException: If the output format needs a package that is not installed.
             """
+            check_output_format(output_format)
+
             # 1. Load the CSV
-            ckd = Ckd()
+            ckd = DatasetBundle.pin(Ckd())
             df = ckd.df_raw
 
             # 2. Split the dataset
@@ -122,19 +162,27 @@ class ToolsController(Controller):
             df = filter_test_columns(test_df, columns_to_keep)
 
             # Pass the processed DataFrame to the second function
-            return process_and_append_ckd_data(ckd, df)
+            return process_and_append_ckd_data(ckd, df, output_format=output_format)
 
         # Endpoint to test disease dataset
         @app.post("/test-disease", tags=["Controller Tools"], summary="Test disease")
-        def test_disease_controller():
+        def test_disease_controller(output_format: Literal["csv", "parquet"] = "csv"):
             """
             Endpoint to test disease dataset.
 
+            Args:
+            output_format (str): Format of the result files, "csv" or "parquet".
+
             Returns:
             JSONResponse: A JSON response indicating the success of the operation.
+
+            Raises:
+            HTTPException: If the output format needs a package that is not installed.
             """
+            check_output_format(output_format)
+
             # 1. Load the CSV
-            disease = Disease()
+            disease = DatasetBundle.pin(Disease())
             df = disease.df_raw
 
             # 2. Split the dataset
@@ -146,7 +194,7 @@ class ToolsController(Controller):
             df = filter_test_columns(test_df, columns_to_keep)
 
             # Pass the processed DataFrame to the second function
-            return process_and_append_disease_data(disease, df)
+            return process_and_append_disease_data(disease, df, output_format=output_format)
 
         # Endpoint to create test files
         @app.post("/make-test-files", tags=["Controller Tools"], summary="Make test files")
@@ -228,6 +276,53 @@ class ToolsController(Controller):
 
             return JSONResponse(content={"message": "Done"})
 
+        # Endpoint to evaluate the models of a dataset as a background job
+        @app.post("/evaluate/{dataset_name}", tags=["Controller Tools"], summary="Evaluate dataset models", status_code=202)
+        def evaluate_controller(dataset_name: Literal["cass", "maternal", "ckd", "disease"],
+                                ratio: Optional[float] = Query(None, gt=0, lt=1),
+                                k: int = Query(1, ge=1)):
+            """
+            Endpoint to queue the evaluation of a dataset models on a held-out split of its raw data.
+
+            Args:
+            dataset_name (str): Dataset to evaluate.
+            ratio (float, optional): Train ratio of the split, the models are evaluated on the remaining 1 - ratio
+                                     of the rows. Defaults to the dataset train ratio.
+            k (int): Number of nearest neighbors used to impute the missing values.
+
+            Returns:
+            JSONResponse: A JSON response with the identifier of the evaluation job.
+
+            Raises:
+            HTTPException: If too many evaluation jobs are already pending or running.
+            """
+            try:
+                job_id = EvaluationEngine.get_instance().submit(dataset_name, ratio, k)
+            except JobQueueFull as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "60"})
+            return JSONResponse(status_code=202, content={"job_id": job_id})
+
+        # Endpoint to get an evaluation job
+        @app.get("/evaluations/{job_id}", tags=["Controller Tools"], summary="Get evaluation")
+        def get_evaluation_controller(job_id: str):
+            """
+            Endpoint to get the status and, once done, the result of an evaluation job.
+
+            Args:
+            job_id (str): Identifier of the evaluation job.
+
+            Returns:
+            JSONResponse: A JSON response with the evaluation job, including per model accuracy,
+                          confusion counts and time taken by each stage once done.
+
+            Raises:
+            HTTPException: If the evaluation job is not found.
+            """
+            job = EvaluationEngine.get_instance().jobs.get(job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail="Evaluation not found")
+            return JSONResponse(content=job)
+
         # Endpoint for health check
         @app.get("/health", tags=["Health Check"], summary="Health Check")
         def health_check():
@@ -239,4 +334,7 @@ class ToolsController(Controller):
             """
             return {"status": "ok", "message": "Service is up and running"}
 
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
         return app
\ No newline at end of file
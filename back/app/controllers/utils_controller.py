@@ -1,10 +1,10 @@
 import sys
 import os
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from app.services.utils.utils import Utils
 from app.interfaces.controller import Controller
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 # Add parent directory to sys.path to ensure relative imports work correctly
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -47,6 +47,9 @@ class UtilsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="utils")
+
         # Summary explaining the controllers
         """
         This FastAPI application provides endpoints for various functionalities including account management, dataset management, preprocessing, model training, and patient risk assessment. Each controller is categorized based on its functionality.
@@ -54,34 +57,27 @@ class UtilsController(Controller):
 
         # Endpoint to get all enums
         @app.get("/get-enums", tags=["Controller Utils"], summary="Get all enums")
-        def get_enums_controller():
+        def get_enums_controller(request: Request):
             """
             Endpoint to fetch all enums.
 
+            The response body is precomputed and carries an ETag, so a client sending it back
+            in If-None-Match gets a 304 response without the enums being serialized again.
+
+            Args:
+            request (Request): The incoming request.
+
             Returns:
-            JSONResponse: A JSON response containing selected enums.
+            Response: A JSON response containing selected enums, or an empty 304 response if the client copy is current.
             """
-            enums = Utils.get_enums()
-
-            selected_enums = {
-                "Operative_Procedure": [],
-                "Feelings_and_Urge": [],
-                "Disease": [],
-                "Critical_Feelings": []
-            }
-
-            # Extract and organize selected enums
-            for enum in enums:
-                if "Operative_Procedure" in enum:
-                    selected_enums["Operative_Procedure"].extend(enum["Operative_Procedure"])
-                if "Feelings_and_Urge" in enum:
-                    selected_enums["Feelings_and_Urge"].extend(enum["Feelings_and_Urge"])
-                if "Disease" in enum:
-                    selected_enums["Disease"].extend(enum["Disease"])
-                if "Critical_Feelings" in enum:
-                    selected_enums["Critical_Feelings"].extend(enum["Critical_Feelings"])
-                    
-            return JSONResponse(content={"enums": selected_enums})
+            body, etag = Utils.get_enums_payload()
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+            if_none_match = request.headers.get("if-none-match", "")
+            if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+                return Response(status_code=304, headers=headers)
+
+            return Response(content=body, media_type="application/json", headers=headers)
 
         # Endpoint for health check
         @app.get("/health", tags=["Health Check"], summary="Health Check")
@@ -94,4 +90,7 @@ class UtilsController(Controller):
             """
             return {"status": "ok", "message": "Service is up and running"}
 
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
         return app
\ No newline at end of file
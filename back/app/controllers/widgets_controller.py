@@ -2,8 +2,10 @@ import sys
 import os
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from app.interfaces.controller import Controller
-from app.dal.proxy import Proxy
+from app.dal.widget_stats import WidgetStats
+from app.services.utils.instrumentation import Instrumentation, InstrumentationMiddleware
 
 # Add parent directory to sys.path to ensure relative imports work correctly
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -37,9 +39,8 @@ class WidgetsController(Controller):
         """
         app = FastAPI(debug=True)
 
-        # Initialize proxy instance for widget database
-        proxy_instance = Proxy()
-        widgets_db_instance = proxy_instance.widget_db
+        # Widget counters kept in memory and refreshed in the background
+        widget_stats = WidgetStats.get_instance()
 
         # Configure CORS middleware for cross-origin requests
         app.add_middleware(
@@ -50,6 +51,9 @@ class WidgetsController(Controller):
             allow_headers=["Content-Type", "Authorization"],
         )
 
+        # Record the latency of every endpoint
+        app.add_middleware(InstrumentationMiddleware, service="widgets")
+
         # Summary explaining the controllers
         """
         This FastAPI application provides endpoints for various functionalities including account management, dataset management, preprocessing, model training, and patient risk assessment. Each controller is categorized based on its functionality.
@@ -57,15 +61,18 @@ class WidgetsController(Controller):
 
         # Endpoint to get widgets
         @app.get("/get-widgets", tags=["Controller Widgets"], summary="Get Widgets")
-        def get_widgets():
+        async def get_widgets():
             """
-            Endpoint to fetch all widgets.
+            Endpoint to fetch all widgets, served from the counters refreshed in the background.
 
             Returns:
             list: A list of widgets fetched from the widget database.
             """
             try:
-                widgets = widgets_db_instance.get_widgets()
+                widgets = widget_stats.get()
+                if widgets is None:
+                    # The counters were not read yet, read them for this request
+                    widgets = await run_in_threadpool(widget_stats.refresh)
                 if widgets:
                     return widgets
                 else:
@@ -84,4 +91,7 @@ class WidgetsController(Controller):
             """
             return {"status": "ok", "message": "Service is up and running"}
 
+        # Endpoint for metrics
+        Instrumentation.add_metrics_route(app)
+
         return app
\ No newline at end of file
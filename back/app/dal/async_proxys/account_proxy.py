@@ -0,0 +1,333 @@
+from app.dal.databases.async_postgresql_connection import AsyncPostgresqlConnection
+from app.dal.queries.account_queries import (
+    CREATE_ADMIN_QUERY, CREATE_DOCTOR_QUERY, CREATE_PATIENT_QUERY, DELETE_ACCOUNT_QUERY,
+    DELETE_ADMIN_QUERY, DELETE_DOCTOR_PATIENTS_QUERY, DELETE_DOCTOR_QUERY, DELETE_PATIENT_QUERY,
+    GET_ACCOUNTS, GET_ACCOUNTS_PAGE, GET_ADMIN_BY_USER_ID_QUERY, GET_DOCTOR_BY_USER_ID_QUERY,
+    GET_PATIENTS_BY_DOCTOR_ID_QUERY, GET_PATIENTS_PAGE_BY_DOCTOR_ID_QUERY, LOGIN
+)
+from app.dal.widget_stats import WidgetStats
+
+class AsyncAccountProxy:
+    """
+    Asynchronous proxy class for interacting with the database through PostgreSQL queries.
+    """
+
+    def __init__(self):
+        """
+        Initializes the AsyncAccountProxy instance with the asynchronous PostgreSQL connection pool its queries borrow connections from.
+        """
+        self.pool = AsyncPostgresqlConnection.get_instance()
+
+    async def create_admin(self, request):
+        """
+        Creates a new admin in the database.
+
+        Args:
+        user_id (str): User ID of the admin.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(CREATE_ADMIN_QUERY, (request.email, request.username, request.password))
+            WidgetStats.invalidate()
+            print("Admin created successfully")
+        except Exception as e:
+            print(f"Error creating admin: {e}")
+
+    async def create_doctor(self, request):
+        """
+        Creates a new doctor in the database.
+
+        Args:
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(CREATE_DOCTOR_QUERY, (request.email, request.username, request.password))
+            WidgetStats.invalidate()
+            print("Doctor created successfully")
+        except Exception as e:
+            print(f"Error creating doctor: {e}")
+
+    async def create_patient(self, name, age, phoneNumber, imagePath, email, doctorId):
+        """
+        Creates a new patient in the database.
+
+        Args:
+        name (str): Name of the patient.
+        age (int): Age of the patient.
+        phoneNumber (str): Phone number of the patient.
+        imagePath (str): Image path of the patient.
+        email (str): Email address of the patient.
+        doctor_id (int): ID of the doctor associated with the patient.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(CREATE_PATIENT_QUERY, (name, age, phoneNumber, imagePath, email, doctorId))
+            WidgetStats.invalidate()
+            print("Patient created successfully")
+        except Exception as e:
+            print(f"Error creating patient: {e}")
+
+    async def get_admin_by_user_id(self, user_id):
+        """
+        Retrieves admin information from the database based on user ID.
+
+        Args:
+        user_id (str): User ID of the admin.
+
+        Returns:
+        tuple: Admin information fetched from the database.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchone(GET_ADMIN_BY_USER_ID_QUERY, (user_id,))
+        except Exception as e:
+            print(f"Error retrieving admin: {e}")
+
+    async def get_doctor_by_user_id(self, user_id):
+        """
+        Retrieves doctor information from the database based on user ID.
+
+        Args:
+        user_id (str): User ID of the doctor.
+
+        Returns:
+        tuple: Doctor information fetched from the database.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchone(GET_DOCTOR_BY_USER_ID_QUERY, (user_id,))
+        except Exception as e:
+            print(f"Error retrieving doctor: {e}")
+
+    async def get_patients_by_doctor_id(self, doctor_id):
+        """
+        Retrieves patients associated with a doctor from the database based on doctor ID.
+
+        Args:
+        doctor_id (int): ID of the doctor.
+
+        Returns:
+        list: List of patients associated with the specified doctor.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchall(GET_PATIENTS_BY_DOCTOR_ID_QUERY, (doctor_id,))
+        except Exception as e:
+            print(f"Error retrieving patients: {e}")
+
+    async def get_patients_page_by_doctor_id(self, doctor_id, after_id, limit):
+        """
+        Retrieves a page of the patients associated with a doctor, ordered by patient ID.
+
+        Args:
+        doctor_id (int): ID of the doctor.
+        after_id (int or None): ID of the last patient of the previous page, None for the first page.
+        limit (int): Maximum number of patients to retrieve.
+
+        Returns:
+        list: Patients of the page, with the PATIENT_COLUMNS columns.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchall(GET_PATIENTS_PAGE_BY_DOCTOR_ID_QUERY, (doctor_id, after_id, after_id, limit))
+        except Exception as e:
+            print(f"Error retrieving patients: {e}")
+            raise  # An empty page would read as the last one
+
+    async def stream_patients_by_doctor_id(self, doctor_id, batch_size):
+        """
+        Streams the patients associated with a doctor, ordered by patient ID, one keyset page at a time.
+
+        Asynchronous connections do not support server-side cursors, each batch is a keyset page query.
+
+        Args:
+        doctor_id (int): ID of the doctor.
+        batch_size (int): Number of rows fetched from the server at a time.
+
+        Yields:
+        tuple: Patient with the PATIENT_COLUMNS columns.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query, the stream is then interrupted.
+        """
+        after_id = None
+        while True:
+            rows = await self.pool.fetchall(GET_PATIENTS_PAGE_BY_DOCTOR_ID_QUERY, (doctor_id, after_id, after_id, batch_size))
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1][0]
+
+    async def delete_admin(self, user_id):
+        """
+        Deletes admin from the database based on user ID.
+
+        Args:
+        user_id (str): User ID of the admin.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(DELETE_ADMIN_QUERY, (user_id,))
+            WidgetStats.invalidate()
+            print("Admin deleted successfully")
+        except Exception as e:
+            print(f"Error deleting admin: {e}")
+
+    async def delete_doctor(self, user_id):
+        """
+        Deletes doctor from the database based on user ID.
+
+        Args:
+        user_id (str): User ID of the doctor.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(DELETE_DOCTOR_QUERY, (user_id,))
+            WidgetStats.invalidate()
+            print("Doctor deleted successfully")
+        except Exception as e:
+            print(f"Error deleting doctor: {e}")
+
+    async def delete_patient(self, patient_id):
+        """
+        Deletes patient from the database based on patient ID.
+
+        Args:
+        patient_id (int): ID of the patient.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(DELETE_PATIENT_QUERY, (patient_id,))
+            WidgetStats.invalidate()
+            print("Patient deleted successfully")
+        except Exception as e:
+            print(f"Error deleting patient: {e}")
+
+    async def login(self, email, password):
+        """
+        Get account by email and password.
+
+        Args:
+        email (str): The email of the user.
+        password (str): The password of the user.
+
+        Returns:
+        list: List of accounts fetched from the database.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchall(LOGIN, (email, password))
+        except Exception as e:
+            print(f"Error retrieving accounts: {e}")
+
+    async def get_accounts(self, id):
+        """
+        Get all accounts except the account with the id.
+
+        Args:
+        id (int): The id of the user.
+
+        Returns:
+        list: List of accounts fetched from the database.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchall(GET_ACCOUNTS, (id,))
+        except Exception as e:
+            print(f"Error retrieving accounts: {e}")
+
+    async def get_accounts_page(self, id, after_id, limit):
+        """
+        Get a page of the accounts except the account with the id, ordered by account ID.
+
+        Args:
+        id (int): The id of the user.
+        after_id (int or None): ID of the last account of the previous page, None for the first page.
+        limit (int): Maximum number of accounts to retrieve.
+
+        Returns:
+        list: Accounts of the page, with the ACCOUNT_COLUMNS columns.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchall(GET_ACCOUNTS_PAGE, (id, after_id, after_id, limit))
+        except Exception as e:
+            print(f"Error retrieving accounts: {e}")
+            raise  # An empty page would read as the last one
+
+    async def stream_accounts(self, id, batch_size):
+        """
+        Stream all accounts except the account with the id, ordered by account ID, one keyset page at a time.
+
+        Asynchronous connections do not support server-side cursors, each batch is a keyset page query.
+
+        Args:
+        id (int): The id of the user.
+        batch_size (int): Number of rows fetched from the server at a time.
+
+        Yields:
+        tuple: Account with the ACCOUNT_COLUMNS columns.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query, the stream is then interrupted.
+        """
+        after_id = None
+        while True:
+            rows = await self.pool.fetchall(GET_ACCOUNTS_PAGE, (id, after_id, after_id, batch_size))
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1][0]
+
+    async def delete_account(self, request):
+        """
+        Deletes account from the database.
+
+        Args:
+        request (DeleteAccountRequest): delete account request.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            if request.role == 2:
+                await self.pool.execute(DELETE_ACCOUNT_QUERY, (request.email, request.name, request.password, 2))
+                WidgetStats.invalidate()
+                print("Admin deleted successfully")
+            else:
+                await self.pool.transaction([
+                    (DELETE_ACCOUNT_QUERY, (request.email, request.name, request.password, 1)),
+                    (DELETE_DOCTOR_PATIENTS_QUERY, (request.id,))
+                ])
+                WidgetStats.invalidate()
+                print("Doctor deleted successfully")
+        except Exception as e:
+            print(f"Error deleting admin: {e}")
@@ -0,0 +1,121 @@
+from app.dal.databases.async_postgresql_connection import AsyncPostgresqlConnection
+from app.dal.queries.algorithm_queries import (
+    CREATE_ALGORITHM_QUERY, DELETE_ALGORITHM_QUERY, GET_ALGORITHM_BY_ID_QUERY,
+    GET_ALGORITHMS, GET_STATS_QUERY, UPDATE_ALGORITHM_QUERY
+)
+from app.dal.widget_stats import WidgetStats
+
+class AsyncAlgorithmProxy:
+    """
+    Asynchronous proxy class for interacting with the database through PostgreSQL queries related to algorithms.
+    """
+
+    def __init__(self):
+        """
+        Initializes the AsyncAlgorithmProxy instance with the asynchronous PostgreSQL connection pool its queries borrow connections from.
+        """
+        self.pool = AsyncPostgresqlConnection.get_instance()
+
+    async def create_algorithm(self, algorithm_name, success_rank, num_uses):
+        """
+        Creates a new algorithm in the database.
+
+        Args:
+        algorithm_name (str): Name of the algorithm.
+        success_rank (float): Success rank of the algorithm.
+        num_uses (int): Number of times the algorithm has been used.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(CREATE_ALGORITHM_QUERY, (algorithm_name, success_rank, num_uses))
+            WidgetStats.invalidate()
+            print("Algorithm created successfully")
+        except Exception as e:
+            print(f"Error creating algorithm: {e}")
+
+    async def get_algorithm_by_id(self, algorithm_id):
+        """
+        Retrieves an algorithm from the database based on algorithm ID.
+
+        Args:
+        algorithm_id (int): ID of the algorithm.
+
+        Returns:
+        tuple: Algorithm information fetched from the database.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchone(GET_ALGORITHM_BY_ID_QUERY, (algorithm_id,))
+        except Exception as e:
+            print(f"Error retrieving algorithm: {e}")
+
+    async def update_algorithm(self, algorithm_id, algorithm_name, success_rank, num_uses):
+        """
+        Updates an existing algorithm in the database.
+
+        Args:
+        algorithm_id (int): ID of the algorithm.
+        algorithm_name (str): Name of the algorithm.
+        success_rank (float): Success rank of the algorithm.
+        num_uses (int): Number of times the algorithm has been used.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(UPDATE_ALGORITHM_QUERY, (algorithm_name, success_rank, num_uses, algorithm_id))
+            WidgetStats.invalidate()
+            print("Algorithm updated successfully")
+        except Exception as e:
+            print(f"Error updating algorithm: {e}")
+
+    async def delete_algorithm(self, algorithm_id):
+        """
+        Deletes an algorithm from the database based on algorithm ID.
+
+        Args:
+        algorithm_id (int): ID of the algorithm.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(DELETE_ALGORITHM_QUERY, (algorithm_id,))
+            WidgetStats.invalidate()
+            print("Algorithm deleted successfully")
+        except Exception as e:
+            print(f"Error deleting algorithm: {e}")
+
+    async def get_algorithms(self):
+        """
+        Retrieves all algorithms from the database.
+
+        Returns:
+        list: List of algorithms fetched from the database.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchall(GET_ALGORITHMS)
+        except Exception as e:
+            print(f"Error retrieving algorithms: {e}")
+
+    async def get_statistics(self):
+        """
+        Retrieves statistics related to algorithms from the database.
+
+        Returns:
+        tuple: Statistics fetched from the database.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchone(GET_STATS_QUERY)
+        except Exception as e:
+            print(f"Error retrieving statistics: {e}")
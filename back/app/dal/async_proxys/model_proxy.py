@@ -0,0 +1,101 @@
+from app.dal.databases.async_postgresql_connection import AsyncPostgresqlConnection
+from app.dal.queries.model_queries import CREATE_MODEL_QUERY, DELETE_MODEL_QUERY, GET_ALL_MODELS_QUERY, GET_MODEL_BY_ID_QUERY, UPDATE_MODEL_QUERY
+from app.dal.widget_stats import WidgetStats
+
+class AsyncModelProxy:
+    """
+    Asynchronous proxy class for interacting with the database through PostgreSQL queries related to models.
+    """
+
+    def __init__(self):
+        """
+        Initializes the AsyncModelProxy instance with the asynchronous PostgreSQL connection pool its queries borrow connections from.
+        """
+        self.pool = AsyncPostgresqlConnection.get_instance()
+
+    async def create_model(self, name, labeled):
+        """
+        Creates a new model in the database.
+
+        Args:
+        name (str): Name of the model.
+        labeled (bool): Whether the model is labeled or not.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(CREATE_MODEL_QUERY, (name, labeled))
+            WidgetStats.invalidate()
+            print("Model created successfully")
+        except Exception as e:
+            print(f"Error creating model: {e}")
+
+    async def get_model_by_id(self, model_id):
+        """
+        Retrieves a model from the database based on model ID.
+
+        Args:
+        model_id (int): ID of the model.
+
+        Returns:
+        tuple: Model information fetched from the database.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchone(GET_MODEL_BY_ID_QUERY, (model_id,))
+        except Exception as e:
+            print(f"Error retrieving model: {e}")
+
+    async def update_model(self, model_id, name, labeled):
+        """
+        Updates the details of an existing model in the database.
+
+        Args:
+        model_id (int): ID of the model.
+        name (str): New name for the model.
+        labeled (bool): Whether the model is labeled or not.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(UPDATE_MODEL_QUERY, (name, labeled, model_id))
+            WidgetStats.invalidate()
+            print("Model updated successfully")
+        except Exception as e:
+            print(f"Error updating model: {e}")
+
+    async def delete_model(self, model_id):
+        """
+        Deletes a model from the database based on model ID.
+
+        Args:
+        model_id (int): ID of the model.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            await self.pool.execute(DELETE_MODEL_QUERY, (model_id,))
+            WidgetStats.invalidate()
+            print("Model deleted successfully")
+        except Exception as e:
+            print(f"Error deleting model: {e}")
+
+    async def get_all_models(self):
+        """
+        Retrieves all models stored in the database.
+
+        Returns:
+        list: List of tuples, each containing information about a model.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchall(GET_ALL_MODELS_QUERY)
+        except Exception as e:
+            print(f"Error retrieving models: {e}")
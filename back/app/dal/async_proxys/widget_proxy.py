@@ -0,0 +1,28 @@
+from app.dal.databases.async_postgresql_connection import AsyncPostgresqlConnection
+from app.dal.queries.widget_queries import GET_WIDGETS_QUERY
+
+class AsyncWidgetProxy:
+    """
+    Asynchronous proxy class for interacting with the database through PostgreSQL queries related to widgets.
+    """
+
+    def __init__(self):
+        """
+        Initializes the AsyncWidgetProxy instance with the asynchronous PostgreSQL connection pool its queries borrow connections from.
+        """
+        self.pool = AsyncPostgresqlConnection.get_instance()
+
+    async def get_widgets(self):
+        """
+        Retrieves widgets from the database.
+
+        Returns:
+        tuple: Widget information fetched from the database.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            return await self.pool.fetchone(GET_WIDGETS_QUERY)
+        except Exception as e:
+            print(f"Error retrieving widgets: {e}")
@@ -0,0 +1,410 @@
+import asyncio
+import os
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+import psycopg2
+from psycopg2 import InterfaceError, OperationalError
+from psycopg2.extensions import POLL_OK, POLL_READ, POLL_WRITE, TRANSACTION_STATUS_IDLE
+from psycopg2.pool import PoolError
+from app.entities.configs.postgresql import Postgresql
+
+def _wake(waiter):
+    """
+    Resolve a waiter future unless it is already done.
+
+    Args:
+    waiter (asyncio.Future): Future awaited by a coroutine.
+    """
+    if not waiter.done():
+        waiter.set_result(None)
+
+class AsyncPostgresqlConnection:
+    """
+    Singleton pool of asynchronous PostgreSQL database connections using psycopg2.
+
+    The connections are opened in psycopg2 asynchronous mode and their socket is awaited with
+    the reader and writer callbacks of the running event loop, so queries never block the loop.
+    The pool mirrors PostgresqlConnection: min/max size, a checkout timeout, health checking of
+    connections idle for longer than the health check interval and replacement of broken
+    connections. Asynchronous connections run in autocommit mode, statements that must be
+    atomic are run with the transaction method.
+
+    It requires an event loop supporting add_reader, on Windows the selector event loop.
+
+    Attributes:
+    min_size (int): Connections opened by the first checkout.
+    max_size (int): Maximum number of connections open at the same time.
+    timeout (float): Seconds to wait for a free connection before giving up.
+    health_check_interval (float): Seconds a connection may stay idle before it is checked on checkout.
+    pid (int): Process the pool belongs to, a forked process creates its own pool.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+    _inherited = []  # Pools of a parent process, kept alive so their connections are never closed from a child
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Singleton method to get or create the asynchronous PostgreSQL connection pool of the current process.
+
+        Returns:
+        AsyncPostgresqlConnection: The connection pool.
+        """
+        with cls._lock:
+            if cls._instance is None or cls._instance.pid != os.getpid():
+                if cls._instance is not None:
+                    cls._inherited.append(cls._instance)
+                cls._instance = cls(Postgresql.MIN_CONNECTIONS, Postgresql.MAX_CONNECTIONS,
+                                    Postgresql.CHECKOUT_TIMEOUT, Postgresql.HEALTH_CHECK_INTERVAL)
+        return cls._instance
+
+    def __init__(self, min_size, max_size, timeout, health_check_interval):
+        """
+        Initialize an empty pool, connections need a running event loop and are opened on checkout.
+
+        Args:
+        min_size (int): Connections opened by the first checkout.
+        max_size (int): Maximum number of connections open at the same time.
+        timeout (float): Seconds to wait for a free connection before giving up.
+        health_check_interval (float): Seconds a connection may stay idle before it is checked on checkout.
+        """
+        self.min_size = min_size
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.pid = os.getpid()
+        self._idle = deque()  # Idle connections and the loop time they were returned, most recent last
+        self._size = 0  # Open connections, idle or borrowed
+        self._waiters = deque()  # Futures of the checkouts waiting for a free connection
+        self._state_lock = threading.Lock()  # Only held for bookkeeping, never across an await
+        self._filled = False
+
+    @staticmethod
+    async def _wait(connection):
+        """
+        Wait until the pending operation of an asynchronous connection is complete.
+
+        Args:
+        connection (psycopg2.connection): Asynchronous connection.
+
+        Raises:
+        OperationalError: If the connection reports an error.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            state = connection.poll()
+            if state == POLL_OK:
+                return
+            if state == POLL_READ:
+                add, remove = loop.add_reader, loop.remove_reader
+            elif state == POLL_WRITE:
+                add, remove = loop.add_writer, loop.remove_writer
+            else:
+                raise OperationalError(f"Unexpected connection poll state: {state}")
+
+            waiter = loop.create_future()
+            file_descriptor = connection.fileno()
+            add(file_descriptor, _wake, waiter)
+            try:
+                await waiter
+            finally:
+                remove(file_descriptor)
+
+    @classmethod
+    async def _create_connection(cls):
+        """
+        Private method to create a new asynchronous PostgreSQL database connection.
+
+        Returns:
+        psycopg2.connection: A new asynchronous PostgreSQL database connection.
+
+        Raises:
+        OperationalError: If the database cannot be reached.
+        """
+        connection = psycopg2.connect(
+            dbname=Postgresql.DBNAME,
+            user=Postgresql.USER,
+            password=Postgresql.PASSWORD,
+            host=Postgresql.HOST,
+            port=Postgresql.PORT,
+            async_=True)
+        try:
+            await cls._wait(connection)
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+    async def _fill(self):
+        """
+        Open the first min_size connections of the pool, reporting a database that cannot be reached.
+        """
+        with self._state_lock:
+            if self._filled:
+                return
+            self._filled = True
+            missing = max(0, min(self.min_size, self.max_size) - self._size)
+            self._size += missing
+
+        for opened in range(missing):
+            try:
+                connection = await self._create_connection()
+            except OperationalError as e:
+                print(f"Error: {e}")
+                for _ in range(missing - opened):
+                    self._release_slot()
+                return
+            self._checkin_idle(connection)
+
+    def _notify(self):
+        """
+        Wake up the oldest checkout waiting for a free connection. The state lock must be held.
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+                return
+
+    def _release_slot(self):
+        """
+        Forget a connection that was closed or could not be opened, and wake up a waiting checkout.
+        """
+        with self._state_lock:
+            self._size -= 1
+            self._notify()
+
+    def _checkin_idle(self, connection):
+        """
+        Put a usable connection back in the idle connections, and wake up a waiting checkout.
+
+        Args:
+        connection (psycopg2.connection): Connection in a usable state.
+        """
+        with self._state_lock:
+            self._idle.append((connection, asyncio.get_running_loop().time()))
+            self._notify()
+
+    async def _is_healthy(self, connection, returned_at):
+        """
+        Check that an idle connection is still usable.
+
+        Args:
+        connection (psycopg2.connection): Idle connection.
+        returned_at (float): Loop time the connection was returned to the pool.
+
+        Returns:
+        bool: True if the connection can be reused.
+        """
+        if connection.closed:
+            return False
+        if asyncio.get_running_loop().time() - returned_at < self.health_check_interval:
+            return True
+        try:
+            await self._run(connection, "SELECT 1")
+            return True
+        except (OperationalError, InterfaceError):
+            return False
+
+    async def _checkout(self):
+        """
+        Borrow a connection, reusing an idle one or opening a new one below the maximum size.
+
+        Returns:
+        psycopg2.connection: Borrowed connection.
+
+        Raises:
+        PoolError: If no connection is free before the checkout timeout.
+        OperationalError: If a new connection cannot be opened.
+        """
+        if not self._filled:
+            await self._fill()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while True:
+            with self._state_lock:
+                if self._idle:
+                    connection, returned_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection, returned_at = None, None
+                    break
+                waiter = loop.create_future()
+                self._waiters.append(waiter)
+
+            try:
+                await asyncio.wait_for(waiter, max(0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                raise PoolError("Timed out waiting for a free database connection")
+            finally:
+                with self._state_lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+
+        if connection is not None:
+            if await self._is_healthy(connection, returned_at):
+                return connection
+            connection.close()  # Reconnect in the slot of the broken connection
+
+        try:
+            return await self._create_connection()
+        except BaseException:
+            self._release_slot()
+            raise
+
+    async def _checkin(self, connection):
+        """
+        Return a borrowed connection, rolling back any transaction left open on it.
+
+        A connection returned while a query is still running, after a cancellation, is closed.
+
+        Args:
+        connection (psycopg2.connection): Borrowed connection.
+        """
+        if not connection.closed:
+            try:
+                if connection.isexecuting():
+                    connection.close()
+                elif connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    await self._run(connection, "ROLLBACK")
+            except (OperationalError, InterfaceError):
+                connection.close()
+
+        if connection.closed:
+            self._release_slot()
+        else:
+            self._checkin_idle(connection)
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Asynchronous context manager borrowing a connection for one unit of work.
+
+        Yields:
+        psycopg2.connection: Borrowed asynchronous connection.
+        """
+        connection = await self._checkout()
+        try:
+            yield connection
+        finally:
+            await self._checkin(connection)
+
+    async def _run(self, connection, query, params=None, fetch=None):
+        """
+        Run a query on a connection without blocking the event loop.
+
+        Args:
+        connection (psycopg2.connection): Asynchronous connection.
+        query (str): SQL query.
+        params (tuple, optional): Query parameters. Defaults to None.
+        fetch (str, optional): "one" or "all" to fetch the result rows. Defaults to None.
+
+        Returns:
+        tuple, list or None: Fetched rows, or None if nothing is fetched.
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute(query, params)
+            await self._wait(connection)
+            if fetch == "one":
+                return cursor.fetchone()
+            if fetch == "all":
+                return cursor.fetchall()
+            return None
+        finally:
+            cursor.close()
+
+    async def execute(self, query, params=None):
+        """
+        Run a statement on a borrowed connection.
+
+        Args:
+        query (str): SQL statement.
+        params (tuple, optional): Statement parameters. Defaults to None.
+        """
+        async with self.connection() as connection:
+            await self._run(connection, query, params)
+
+    async def fetchone(self, query, params=None):
+        """
+        Run a query on a borrowed connection and fetch its first row.
+
+        Args:
+        query (str): SQL query.
+        params (tuple, optional): Query parameters. Defaults to None.
+
+        Returns:
+        tuple or None: First row of the result.
+        """
+        async with self.connection() as connection:
+            return await self._run(connection, query, params, "one")
+
+    async def fetchall(self, query, params=None):
+        """
+        Run a query on a borrowed connection and fetch all its rows.
+
+        Args:
+        query (str): SQL query.
+        params (tuple, optional): Query parameters. Defaults to None.
+
+        Returns:
+        list: Rows of the result.
+        """
+        async with self.connection() as connection:
+            return await self._run(connection, query, params, "all")
+
+    async def transaction(self, statements):
+        """
+        Run several statements on a borrowed connection as one transaction.
+
+        Args:
+        statements (list): SQL statements and their parameters, as (query, params) tuples.
+        """
+        async with self.connection() as connection:
+            await self._run(connection, "BEGIN")
+            for query, params in statements:
+                await self._run(connection, query, params)
+            await self._run(connection, "COMMIT")
+
+    async def health_check(self):
+        """
+        Check that the database can be reached through the pool.
+
+        Returns:
+        bool: True if a pooled connection answers a query.
+        """
+        try:
+            return await self.fetchone("SELECT 1") == (1,)
+        except Exception as e:
+            print(f"Error: {e}")
+            return False
+
+    def get_stats(self):
+        """
+        Get the current size of the pool.
+
+        Returns:
+        dict: Open, idle and borrowed connections, and the maximum size of the pool.
+        """
+        with self._state_lock:
+            return {
+                "open": self._size,
+                "idle": len(self._idle),
+                "borrowed": self._size - len(self._idle),
+                "max_size": self.max_size
+            }
+
+    def close(self):
+        """
+        Close the idle connections of the pool.
+        """
+        with self._state_lock:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                connection.close()
+                self._size -= 1
+            self._notify()
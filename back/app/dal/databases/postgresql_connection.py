@@ -1,26 +1,83 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 import psycopg2
-from psycopg2 import OperationalError
+from psycopg2 import InterfaceError, OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.pool import PoolError
 from app.entities.configs.postgresql import Postgresql
 
 class PostgresqlConnection:
     """
-    Singleton class for managing PostgreSQL database connections using psycopg2.
+    Singleton thread-safe pool of PostgreSQL database connections using psycopg2.
+
+    Each unit of work borrows a connection with the connection context manager and returns it
+    when done, so concurrent requests use separate connections. A returned connection that is
+    left in a transaction, including one aborted by a failed statement, is rolled back before
+    it is reused. Connections idle for longer than the health check interval are checked on
+    checkout, and broken connections are replaced by new ones.
+
+    Attributes:
+    min_size (int): Connections opened when the pool is created.
+    max_size (int): Maximum number of connections open at the same time.
+    timeout (float): Seconds to wait for a free connection before giving up.
+    health_check_interval (float): Seconds a connection may stay idle before it is checked on checkout.
+    pid (int): Process the pool belongs to, a forked process creates its own pool.
     """
 
     _instance = None
+    _lock = threading.Lock()
+    _inherited = []  # Pools of a parent process, kept alive so their connections are never closed from a child
 
     @classmethod
     def get_instance(cls):
         """
-        Singleton method to get or create an instance of the PostgreSQL connection.
+        Singleton method to get or create the PostgreSQL connection pool of the current process.
 
         Returns:
-        psycopg2.connection: An instance of the PostgreSQL database connection.
+        PostgresqlConnection: The connection pool.
         """
-        if cls._instance is None:
-            cls._instance = cls._create_connection()
+        with cls._lock:
+            if cls._instance is None or cls._instance.pid != os.getpid():
+                if cls._instance is not None:
+                    cls._inherited.append(cls._instance)
+                cls._instance = cls(Postgresql.MIN_CONNECTIONS, Postgresql.MAX_CONNECTIONS,
+                                    Postgresql.CHECKOUT_TIMEOUT, Postgresql.HEALTH_CHECK_INTERVAL)
         return cls._instance
 
+    def __init__(self, min_size, max_size, timeout, health_check_interval):
+        """
+        Initialize the pool and open its first connections.
+
+        A database that cannot be reached is reported and the pool starts empty, connections
+        are then opened on checkout.
+
+        Args:
+        min_size (int): Connections opened when the pool is created.
+        max_size (int): Maximum number of connections open at the same time.
+        timeout (float): Seconds to wait for a free connection before giving up.
+        health_check_interval (float): Seconds a connection may stay idle before it is checked on checkout.
+        """
+        self.min_size = min_size
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.pid = os.getpid()
+        self._idle = deque()  # Idle connections and the time they were returned, most recent last
+        self._size = 0  # Open connections, idle or borrowed
+        self._condition = threading.Condition()
+
+        for _ in range(min(min_size, self.max_size)):
+            try:
+                connection = self._create_connection()
+            except OperationalError as e:
+                print(f"Error: {e}")
+                break
+            self._size += 1
+            self._idle.append((connection, time.monotonic()))
+
     @classmethod
     def _create_connection(cls):
         """
@@ -28,24 +85,160 @@ class PostgresqlConnection:
 
         Returns:
         psycopg2.connection: A new instance of the PostgreSQL database connection.
+
+        Raises:
+        OperationalError: If the database cannot be reached.
+        """
+        return psycopg2.connect(
+            dbname=Postgresql.DBNAME,
+            user=Postgresql.USER,
+            password=Postgresql.PASSWORD,
+            host=Postgresql.HOST,
+            port=Postgresql.PORT)
+
+    def _is_healthy(self, connection, returned_at):
+        """
+        Check that an idle connection is still usable.
+
+        Args:
+        connection (psycopg2.connection): Idle connection.
+        returned_at (float): Monotonic time the connection was returned to the pool.
+
+        Returns:
+        bool: True if the connection can be reused.
+        """
+        if connection.closed:
+            return False
+        if time.monotonic() - returned_at < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except (OperationalError, InterfaceError):
+            return False
+
+    def _release_slot(self):
+        """
+        Forget a connection that was closed or could not be opened, and wake up a waiting checkout.
+        """
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def _checkout(self):
+        """
+        Borrow a connection, reusing an idle one or opening a new one below the maximum size.
+
+        Returns:
+        psycopg2.connection: Borrowed connection.
+
+        Raises:
+        PoolError: If no connection is free before the checkout timeout.
+        OperationalError: If a new connection cannot be opened.
+        """
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            while True:
+                if self._idle:
+                    connection, returned_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection, returned_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolError("Timed out waiting for a free database connection")
+                self._condition.wait(remaining)
+
+        if connection is not None:
+            if self._is_healthy(connection, returned_at):
+                return connection
+            connection.close()  # Reconnect in the slot of the broken connection
+
+        try:
+            return self._create_connection()
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _checkin(self, connection):
+        """
+        Return a borrowed connection, rolling back any transaction left open on it.
+
+        Args:
+        connection (psycopg2.connection): Borrowed connection.
+        """
+        if not connection.closed:
+            try:
+                if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except (OperationalError, InterfaceError):
+                connection.close()
+
+        if connection.closed:
+            self._release_slot()
+            return
+
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager borrowing a connection for one unit of work.
+
+        Changes must be committed before the block ends, anything left uncommitted is rolled back.
+
+        Yields:
+        psycopg2.connection: Borrowed connection.
+        """
+        connection = self._checkout()
+        try:
+            yield connection
+        finally:
+            self._checkin(connection)
+
+    def health_check(self):
+        """
+        Check that the database can be reached through the pool.
+
+        Returns:
+        bool: True if a pooled connection answers a query.
         """
         try:
-            connection = psycopg2.connect(
-                dbname=Postgresql.DBNAME,
-                user=Postgresql.USER,
-                password=Postgresql.PASSWORD,
-                host=Postgresql.HOST,
-                port=Postgresql.PORT)
-            return connection
-        except OperationalError as e:
+            with self.connection() as connection, connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                return cursor.fetchone() == (1,)
+        except Exception as e:
             print(f"Error: {e}")
-            return None
+            return False
 
-    def get_connection(self):
+    def get_stats(self):
         """
-        Method to return the existing PostgreSQL database connection instance.
+        Get the current size of the pool.
 
         Returns:
-        psycopg2.connection: The existing instance of the PostgreSQL database connection.
+        dict: Open, idle and borrowed connections, and the maximum size of the pool.
+        """
+        with self._condition:
+            return {
+                "open": self._size,
+                "idle": len(self._idle),
+                "borrowed": self._size - len(self._idle),
+                "max_size": self.max_size
+            }
+
+    def close(self):
+        """
+        Close the idle connections of the pool.
         """
-        return self._instance
\ No newline at end of file
+        with self._condition:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                connection.close()
+                self._size -= 1
+            self._condition.notify_all()
@@ -1,12 +1,23 @@
+import inspect
+from starlette.concurrency import run_in_threadpool
+from app.dal.async_proxys.account_proxy import AsyncAccountProxy
+from app.dal.async_proxys.algorithm_proxy import AsyncAlgorithmProxy
+from app.dal.async_proxys.dataset_proxy import AsyncDatasetProxy
+from app.dal.async_proxys.model_proxy import AsyncModelProxy
+from app.dal.async_proxys.widget_proxy import AsyncWidgetProxy
 from app.dal.proxys.account_proxy import AccountProxy
 from app.dal.proxys.algorithm_proxy import AlgorithmProxy
 from app.dal.proxys.dataset_proxy import DatasetProxy
 from app.dal.proxys.model_proxy import ModelProxy
 from app.dal.proxys.widget_proxy import WidgetProxy
+from app.entities.configs.postgresql import Postgresql
 
 class Proxy:
     """
     Singleton class representing a proxy for accessing various data entities using different proxies.
+
+    The proxies use the synchronous connection pool, or the asynchronous one when Postgresql.ASYNC_DAL
+    is set. Endpoints call them through Proxy.call, which works with both.
     """
 
     _instance = None
@@ -20,9 +31,35 @@ class Proxy:
         """
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance.dataset_db = DatasetProxy()
-            cls._instance.account_db = AccountProxy()
-            cls._instance.algorithm_db = AlgorithmProxy()
-            cls._instance.model_db = ModelProxy()
-            cls._instance.widget_db = WidgetProxy()
-        return cls._instance
\ No newline at end of file
+            if Postgresql.ASYNC_DAL:
+                cls._instance.dataset_db = AsyncDatasetProxy()
+                cls._instance.account_db = AsyncAccountProxy()
+                cls._instance.algorithm_db = AsyncAlgorithmProxy()
+                cls._instance.model_db = AsyncModelProxy()
+                cls._instance.widget_db = AsyncWidgetProxy()
+            else:
+                cls._instance.dataset_db = DatasetProxy()
+                cls._instance.account_db = AccountProxy()
+                cls._instance.algorithm_db = AlgorithmProxy()
+                cls._instance.model_db = ModelProxy()
+                cls._instance.widget_db = WidgetProxy()
+        return cls._instance
+
+    @staticmethod
+    async def call(method, *args):
+        """
+        Call a proxy method from an async endpoint without blocking the event loop.
+
+        Methods of the asynchronous proxies are awaited, methods of the synchronous proxies run in
+        the thread pool.
+
+        Args:
+        method (callable): Proxy method.
+        *args: Arguments of the method.
+
+        Returns:
+        Result of the method.
+        """
+        if inspect.iscoroutinefunction(method):
+            return await method(*args)
+        return await run_in_threadpool(method, *args)
@@ -2,10 +2,12 @@ from fastapi.responses import FileResponse
 from app.dal.databases.postgresql_connection import PostgresqlConnection
 from app.dal.queries.account_queries import (
     CREATE_ADMIN_QUERY, CREATE_DOCTOR_QUERY, CREATE_PATIENT_QUERY, DELETE_ACCOUNT_QUERY,
-    DELETE_ADMIN_QUERY, DELETE_DOCTOR_PATIENTS_QUERY, DELETE_DOCTOR_QUERY, DELETE_PATIENT_QUERY, GET_ACCOUNTS,
+    DELETE_ADMIN_QUERY, DELETE_DOCTOR_PATIENTS_QUERY, DELETE_DOCTOR_QUERY, DELETE_PATIENT_QUERY,
+    EXPORT_ACCOUNTS, EXPORT_PATIENTS_BY_DOCTOR_ID_QUERY, GET_ACCOUNTS, GET_ACCOUNTS_PAGE,
     GET_ADMIN_BY_USER_ID_QUERY, GET_DOCTOR_BY_USER_ID_QUERY,
-    GET_PATIENTS_BY_DOCTOR_ID_QUERY, LOGIN
+    GET_PATIENTS_BY_DOCTOR_ID_QUERY, GET_PATIENTS_PAGE_BY_DOCTOR_ID_QUERY, LOGIN
 )
+from app.dal.widget_stats import WidgetStats
 
 class AccountProxy:
     """
@@ -14,9 +16,9 @@ class AccountProxy:
 
     def __init__(self):
         """
-        Initializes the AccountProxy instance by obtaining a PostgreSQL database connection instance.
+        Initializes the AccountProxy instance with the PostgreSQL connection pool its queries borrow connections from.
         """
-        self.db = PostgresqlConnection.get_instance()
+        self.pool = PostgresqlConnection.get_instance()
 
     def create_admin(self, request):
         """
@@ -29,10 +31,11 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(CREATE_ADMIN_QUERY, (request.email, request.username, request.password))
-            self.db.commit()
-            print("Admin created successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(CREATE_ADMIN_QUERY, (request.email, request.username, request.password))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Admin created successfully")
         except Exception as e:
             print(f"Error creating admin: {e}")
 
@@ -46,10 +49,11 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(CREATE_DOCTOR_QUERY, (request.email, request.username, request.password))
-            self.db.commit()
-            print("Doctor created successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(CREATE_DOCTOR_QUERY, (request.email, request.username, request.password))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Doctor created successfully")
         except Exception as e:
             print(f"Error creating doctor: {e}")
 
@@ -75,10 +79,11 @@ class AccountProxy:
                 print(f"Error creating patient: {e}")
                 return
             
-            cursor = self.db.cursor()
-            cursor.execute(CREATE_PATIENT_QUERY, (name, age, phoneNumber, imagePath, email, doctorId))
-            self.db.commit()
-            print("Patient created successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(CREATE_PATIENT_QUERY, (name, age, phoneNumber, imagePath, email, doctorId))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Patient created successfully")
         except Exception as e:
             print(f"Error creating patient: {e}")
 
@@ -96,9 +101,9 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(GET_ADMIN_BY_USER_ID_QUERY, (user_id,))
-            return cursor.fetchone()
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_ADMIN_BY_USER_ID_QUERY, (user_id,))
+                return cursor.fetchone()
         except Exception as e:
             print(f"Error retrieving admin: {e}")
 
@@ -116,9 +121,9 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(GET_DOCTOR_BY_USER_ID_QUERY, (user_id,))
-            return cursor.fetchone()
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_DOCTOR_BY_USER_ID_QUERY, (user_id,))
+                return cursor.fetchone()
         except Exception as e:
             print(f"Error retrieving doctor: {e}")
 
@@ -136,12 +141,56 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(GET_PATIENTS_BY_DOCTOR_ID_QUERY, (doctor_id,))
-            return cursor.fetchall()
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_PATIENTS_BY_DOCTOR_ID_QUERY, (doctor_id,))
+                return cursor.fetchall()
         except Exception as e:
             print(f"Error retrieving patients: {e}")
 
+    def get_patients_page_by_doctor_id(self, doctor_id, after_id, limit):
+        """
+        Retrieves a page of the patients associated with a doctor, ordered by patient ID.
+
+        Args:
+        doctor_id (int): ID of the doctor.
+        after_id (int or None): ID of the last patient of the previous page, None for the first page.
+        limit (int): Maximum number of patients to retrieve.
+
+        Returns:
+        list: Patients of the page, with the PATIENT_COLUMNS columns.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_PATIENTS_PAGE_BY_DOCTOR_ID_QUERY, (doctor_id, after_id, after_id, limit))
+                return cursor.fetchall()
+        except Exception as e:
+            print(f"Error retrieving patients: {e}")
+            raise  # An empty page would read as the last one
+
+    def stream_patients_by_doctor_id(self, doctor_id, batch_size):
+        """
+        Streams the patients associated with a doctor, ordered by patient ID, through a server-side cursor.
+
+        The connection is borrowed until the generator is exhausted or closed.
+
+        Args:
+        doctor_id (int): ID of the doctor.
+        batch_size (int): Number of rows fetched from the server at a time.
+
+        Yields:
+        tuple: Patient with the PATIENT_COLUMNS columns.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query, the stream is then interrupted.
+        """
+        with self.pool.connection() as connection, connection.cursor(name="export_patients") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(EXPORT_PATIENTS_BY_DOCTOR_ID_QUERY, (doctor_id,))
+            yield from cursor
+
     def delete_admin(self, user_id):
         """
         Deletes admin from the database based on user ID.
@@ -153,10 +202,11 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(DELETE_ADMIN_QUERY, (user_id,))
-            self.db.commit()
-            print("Admin deleted successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(DELETE_ADMIN_QUERY, (user_id,))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Admin deleted successfully")
         except Exception as e:
             print(f"Error deleting admin: {e}")
 
@@ -171,10 +221,11 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(DELETE_DOCTOR_QUERY, (user_id,))
-            self.db.commit()
-            print("Doctor deleted successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(DELETE_DOCTOR_QUERY, (user_id,))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Doctor deleted successfully")
         except Exception as e:
             print(f"Error deleting doctor: {e}")
 
@@ -189,10 +240,11 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(DELETE_PATIENT_QUERY, (patient_id,))
-            self.db.commit()
-            print("Patient deleted successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(DELETE_PATIENT_QUERY, (patient_id,))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Patient deleted successfully")
         except Exception as e:
             print(f"Error deleting patient: {e}")
 
@@ -211,14 +263,12 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(LOGIN, (email, password))
-            accounts = cursor.fetchall()
-            return accounts
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(LOGIN, (email, password))
+                accounts = cursor.fetchall()
+                return accounts
         except Exception as e:
             print(f"Error retrieving accounts: {e}")
-        finally:
-            cursor.close()
 
 
     def get_accounts(self, id):
@@ -235,14 +285,56 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(GET_ACCOUNTS, (id,))
-            accounts = cursor.fetchall()
-            return accounts
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_ACCOUNTS, (id,))
+                accounts = cursor.fetchall()
+                return accounts
         except Exception as e:
             print(f"Error retrieving accounts: {e}")
-        finally:
-            cursor.close()
+
+    def get_accounts_page(self, id, after_id, limit):
+        """
+        Get a page of the accounts except the account with the id, ordered by account ID.
+
+        Args:
+        id (int): The id of the user.
+        after_id (int or None): ID of the last account of the previous page, None for the first page.
+        limit (int): Maximum number of accounts to retrieve.
+
+        Returns:
+        list: Accounts of the page, with the ACCOUNT_COLUMNS columns.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query.
+        """
+        try:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_ACCOUNTS_PAGE, (id, after_id, after_id, limit))
+                return cursor.fetchall()
+        except Exception as e:
+            print(f"Error retrieving accounts: {e}")
+            raise  # An empty page would read as the last one
+
+    def stream_accounts(self, id, batch_size):
+        """
+        Stream all accounts except the account with the id, ordered by account ID, through a server-side cursor.
+
+        The connection is borrowed until the generator is exhausted or closed.
+
+        Args:
+        id (int): The id of the user.
+        batch_size (int): Number of rows fetched from the server at a time.
+
+        Yields:
+        tuple: Account with the ACCOUNT_COLUMNS columns.
+
+        Raises:
+        Exception: If there's an error while executing the SQL query, the stream is then interrupted.
+        """
+        with self.pool.connection() as connection, connection.cursor(name="export_accounts") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(EXPORT_ACCOUNTS, (id,))
+            yield from cursor
 
     def delete_account(self, request):
         """
@@ -255,16 +347,18 @@ class AccountProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            if request.role == 2:
-                cursor.execute(DELETE_ACCOUNT_QUERY, (request.email, request.name, request.password, 2))
-                self.db.commit()
-                print("Admin deleted successfully")
-            else:
-                cursor.execute(DELETE_ACCOUNT_QUERY, (request.email, request.name, request.password, 1))
-                cursor.execute(DELETE_DOCTOR_PATIENTS_QUERY, (request.id,))
-                self.db.commit()
-                print("Doctor deleted successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                if request.role == 2:
+                    cursor.execute(DELETE_ACCOUNT_QUERY, (request.email, request.name, request.password, 2))
+                    connection.commit()
+                    WidgetStats.invalidate()
+                    print("Admin deleted successfully")
+                else:
+                    cursor.execute(DELETE_ACCOUNT_QUERY, (request.email, request.name, request.password, 1))
+                    cursor.execute(DELETE_DOCTOR_PATIENTS_QUERY, (request.id,))
+                    connection.commit()
+                    WidgetStats.invalidate()
+                    print("Doctor deleted successfully")
 
         except Exception as e:
             print(f"Error deleting admin: {e}")
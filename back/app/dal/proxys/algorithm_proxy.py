@@ -3,6 +3,7 @@ from app.dal.queries.algorithm_queries import (
     CREATE_ALGORITHM_QUERY, DELETE_ALGORITHM_QUERY, GET_ALGORITHM_BY_ID_QUERY,
     GET_ALGORITHMS, GET_STATS_QUERY, UPDATE_ALGORITHM_QUERY
 )
+from app.dal.widget_stats import WidgetStats
 
 class AlgorithmProxy:
     """
@@ -11,9 +12,9 @@ class AlgorithmProxy:
 
     def __init__(self):
         """
-        Initializes the AlgorithmProxy instance by obtaining a PostgreSQL database connection instance.
+        Initializes the AlgorithmProxy instance with the PostgreSQL connection pool its queries borrow connections from.
         """
-        self.db = PostgresqlConnection.get_instance()
+        self.pool = PostgresqlConnection.get_instance()
 
     def create_algorithm(self, algorithm_name, success_rank, num_uses):
         """
@@ -28,10 +29,11 @@ class AlgorithmProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(CREATE_ALGORITHM_QUERY, (algorithm_name, success_rank, num_uses))
-            self.db.commit()
-            print("Algorithm created successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(CREATE_ALGORITHM_QUERY, (algorithm_name, success_rank, num_uses))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Algorithm created successfully")
         except Exception as e:
             print(f"Error creating algorithm: {e}")
 
@@ -49,9 +51,9 @@ class AlgorithmProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(GET_ALGORITHM_BY_ID_QUERY, (algorithm_id,))
-            return cursor.fetchone()
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_ALGORITHM_BY_ID_QUERY, (algorithm_id,))
+                return cursor.fetchone()
         except Exception as e:
             print(f"Error retrieving algorithm: {e}")
 
@@ -69,10 +71,11 @@ class AlgorithmProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(UPDATE_ALGORITHM_QUERY, (algorithm_name, success_rank, num_uses, algorithm_id))
-            self.db.commit()
-            print("Algorithm updated successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(UPDATE_ALGORITHM_QUERY, (algorithm_name, success_rank, num_uses, algorithm_id))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Algorithm updated successfully")
         except Exception as e:
             print(f"Error updating algorithm: {e}")
 
@@ -87,10 +90,11 @@ class AlgorithmProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(DELETE_ALGORITHM_QUERY, (algorithm_id,))
-            self.db.commit()
-            print("Algorithm deleted successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(DELETE_ALGORITHM_QUERY, (algorithm_id,))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Algorithm deleted successfully")
         except Exception as e:
             print(f"Error deleting algorithm: {e}")
 
@@ -105,10 +109,10 @@ class AlgorithmProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(GET_ALGORITHMS)
-            algorithms = cursor.fetchall()
-            return algorithms
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_ALGORITHMS)
+                algorithms = cursor.fetchall()
+                return algorithms
         except Exception as e:
             print(f"Error retrieving algorithms: {e}")
 
@@ -123,9 +127,9 @@ class AlgorithmProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(GET_STATS_QUERY)
-            stats = cursor.fetchone()
-            return stats
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_STATS_QUERY)
+                stats = cursor.fetchone()
+                return stats
         except Exception as e:
             print(f"Error retrieving statistics: {e}")
\ No newline at end of file
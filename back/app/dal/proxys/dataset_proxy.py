@@ -8,9 +8,9 @@ class DatasetProxy:
 
     def __init__(self):
         """
-        Initializes the DatasetProxy instance by obtaining a PostgreSQL database connection instance.
+        Initializes the DatasetProxy instance with the PostgreSQL connection pool its queries borrow connections from.
         """
-        self.connection = PostgresqlConnection.get_instance()
+        self.pool = PostgresqlConnection.get_instance()
 
     def create_dataset(self, name, description):
         """
@@ -24,9 +24,9 @@ class DatasetProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            with self.connection.cursor() as cursor:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
                 cursor.execute(CREATE_DATASET, (name, description))
-                self.connection.commit()
+                connection.commit()
                 print("Dataset created successfully")
         except Exception as e:
             print(f"Error creating dataset: {e}")
@@ -45,7 +45,7 @@ class DatasetProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            with self.connection.cursor() as cursor:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
                 cursor.execute(SELECT_DATASET_BY_ID, (dataset_id,))
                 return cursor.fetchone()
         except Exception as e:
@@ -63,9 +63,9 @@ class DatasetProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            with self.connection.cursor() as cursor:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
                 cursor.execute(UPDATE_DATASET_DESCRIPTION, (new_description, dataset_id))
-                self.connection.commit()
+                connection.commit()
                 print("Dataset description updated successfully")
         except Exception as e:
             print(f"Error updating dataset description: {e}")
@@ -81,9 +81,9 @@ class DatasetProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            with self.connection.cursor() as cursor:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
                 cursor.execute(DELETE_DATASET, (dataset_id,))
-                self.connection.commit()
+                connection.commit()
                 print("Dataset deleted successfully")
         except Exception as e:
             print(f"Error deleting dataset: {e}")
\ No newline at end of file
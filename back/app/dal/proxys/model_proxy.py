@@ -1,5 +1,6 @@
 from app.dal.databases.postgresql_connection import PostgresqlConnection
 from app.dal.queries.model_queries import CREATE_MODEL_QUERY, DELETE_MODEL_QUERY, GET_ALL_MODELS_QUERY, GET_MODEL_BY_ID_QUERY, UPDATE_MODEL_QUERY
+from app.dal.widget_stats import WidgetStats
 
 class ModelProxy:
     """
@@ -8,9 +9,9 @@ class ModelProxy:
 
     def __init__(self):
         """
-        Initializes the ModelProxy instance by obtaining a PostgreSQL database connection instance.
+        Initializes the ModelProxy instance with the PostgreSQL connection pool its queries borrow connections from.
         """
-        self.db = PostgresqlConnection.get_instance()
+        self.pool = PostgresqlConnection.get_instance()
 
     def create_model(self, name, labeled):
         """
@@ -24,10 +25,11 @@ class ModelProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(CREATE_MODEL_QUERY, (name, labeled))
-            self.db.commit()
-            print("Model created successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(CREATE_MODEL_QUERY, (name, labeled))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Model created successfully")
         except Exception as e:
             print(f"Error creating model: {e}")
 
@@ -45,9 +47,9 @@ class ModelProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(GET_MODEL_BY_ID_QUERY, (model_id,))
-            return cursor.fetchone()
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_MODEL_BY_ID_QUERY, (model_id,))
+                return cursor.fetchone()
         except Exception as e:
             print(f"Error retrieving model: {e}")
 
@@ -64,10 +66,11 @@ class ModelProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(UPDATE_MODEL_QUERY, (name, labeled, model_id))
-            self.db.commit()
-            print("Model updated successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(UPDATE_MODEL_QUERY, (name, labeled, model_id))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Model updated successfully")
         except Exception as e:
             print(f"Error updating model: {e}")
 
@@ -82,10 +85,11 @@ class ModelProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(DELETE_MODEL_QUERY, (model_id,))
-            self.db.commit()
-            print("Model deleted successfully")
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(DELETE_MODEL_QUERY, (model_id,))
+                connection.commit()
+                WidgetStats.invalidate()
+                print("Model deleted successfully")
         except Exception as e:
             print(f"Error deleting model: {e}")
 
@@ -100,8 +104,8 @@ class ModelProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(GET_ALL_MODELS_QUERY)
-            return cursor.fetchall()
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_ALL_MODELS_QUERY)
+                return cursor.fetchall()
         except Exception as e:
             print(f"Error retrieving models: {e}")
\ No newline at end of file
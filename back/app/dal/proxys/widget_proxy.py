@@ -8,9 +8,9 @@ class WidgetProxy:
 
     def __init__(self):
         """
-        Initializes the WidgetProxy instance by obtaining a PostgreSQL database connection instance.
+        Initializes the WidgetProxy instance with the PostgreSQL connection pool its queries borrow connections from.
         """
-        self.db = PostgresqlConnection.get_instance()
+        self.pool = PostgresqlConnection.get_instance()
 
     def get_widgets(self):
         """
@@ -23,8 +23,8 @@ class WidgetProxy:
         Exception: If there's an error while executing the SQL query.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(GET_WIDGETS_QUERY)
-            return cursor.fetchone()
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(GET_WIDGETS_QUERY)
+                return cursor.fetchone()
         except Exception as e:
             print(f"Error retrieving widgets: {e}")
\ No newline at end of file
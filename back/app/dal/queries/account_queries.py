@@ -16,6 +16,22 @@ WHERE D.user_id = %s
 """
 GET_PATIENTS_BY_DOCTOR_ID_QUERY = "SELECT * FROM Patients WHERE doctor_id = %s"
 
+# Columns of the paginated and exported patient listings, the first one is the keyset
+PATIENT_COLUMNS = ["id", "full_name", "age", "phone_number", "photo", "email", "doctor_id"]
+GET_PATIENTS_PAGE_BY_DOCTOR_ID_QUERY = f"""
+SELECT {", ".join(PATIENT_COLUMNS)}
+FROM Patients
+WHERE doctor_id = %s AND (%s IS NULL OR id > %s)
+ORDER BY id
+LIMIT %s
+"""
+EXPORT_PATIENTS_BY_DOCTOR_ID_QUERY = f"""
+SELECT {", ".join(PATIENT_COLUMNS)}
+FROM Patients
+WHERE doctor_id = %s
+ORDER BY id
+"""
+
 LOGIN = """
 SELECT *
 FROM Users
@@ -28,6 +44,22 @@ FROM Users
 WHERE id <> %s
 """
 
+# Columns of the paginated and exported account listings, the first one is the keyset
+ACCOUNT_COLUMNS = ["id", "email", "name", "role"]
+GET_ACCOUNTS_PAGE = f"""
+SELECT {", ".join(ACCOUNT_COLUMNS)}
+FROM Users
+WHERE id <> %s AND (%s IS NULL OR id > %s)
+ORDER BY id
+LIMIT %s
+"""
+EXPORT_ACCOUNTS = f"""
+SELECT {", ".join(ACCOUNT_COLUMNS)}
+FROM Users
+WHERE id <> %s
+ORDER BY id
+"""
+
 UPDATE_DOCTOR_QUERY = "UPDATE Doctors SET rank = %s, phoneNumber = %s, numberOfPatients = %s, active = %s, dateOfBirth = %s WHERE user_id = %s"
 UPDATE_PATIENT_QUERY = "UPDATE Patients SET name = %s, description = %s, imagePath = %s, email = %s, doctor_id = %s WHERE id = %s"
 
@@ -0,0 +1,149 @@
+import os
+import threading
+import time
+from app.dal.proxys.widget_proxy import WidgetProxy
+
+class WidgetStats:
+    """
+    Dashboard widget counters served from memory and refreshed in the background.
+
+    GET_WIDGETS_QUERY scans every counted table, so it runs on a background thread instead of on
+    every dashboard request: every refresh_interval seconds, and shortly after the proxies report a
+    write that changes the counters. Writes arriving while a refresh runs are folded into the next
+    refresh, which waits at least min_refresh_interval seconds after the previous one. Reading the
+    counters is then O(1) whatever the size of the tables.
+
+    The refresher uses the synchronous WidgetProxy, also when the asynchronous DAL serves the
+    endpoints, as it runs outside of the event loop.
+
+    Attributes:
+    refresh_interval (float): Seconds between two refreshes when nothing is written.
+    min_refresh_interval (float): Minimum seconds between two refreshes.
+    pid (int): Process the counters belong to, a forked process starts its own refresher.
+    refreshes (int): Number of successful refreshes.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    # Seconds between two refreshes without writes, and minimum seconds between two refreshes
+    CONFIG = {
+        "refresh_interval": 30,
+        "min_refresh_interval": 1
+    }
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Singleton method to get or create the widget counters of the current process.
+
+        Returns:
+        WidgetStats: The widget counters.
+        """
+        with cls._lock:
+            if cls._instance is None or cls._instance.pid != os.getpid():
+                cls._instance = cls(WidgetProxy().get_widgets, cls.CONFIG["refresh_interval"], cls.CONFIG["min_refresh_interval"])
+        return cls._instance
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Report a write changing the counters, so they are refreshed without waiting for the refresh interval.
+
+        Does nothing until the counters are first used.
+        """
+        instance = cls._instance
+        if instance is not None and instance.pid == os.getpid():
+            instance._dirty.set()
+
+    def __init__(self, loader, refresh_interval, min_refresh_interval):
+        """
+        Initialize the counters, which are loaded by the first refresh.
+
+        Args:
+        loader (callable): Function returning the widget counters, or None if they cannot be read.
+        refresh_interval (float): Seconds between two refreshes when nothing is written.
+        min_refresh_interval (float): Minimum seconds between two refreshes.
+        """
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.pid = os.getpid()
+        self.refreshes = 0
+        self._widgets = None
+        self._refreshed_at = None
+        self._dirty = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._state_lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the background refresher, which refreshes the counters right away.
+        """
+        with self._state_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._refresh_loop, name="widget-stats", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background refresher.
+        """
+        self._stopped.set()
+        self._dirty.set()
+
+    def _refresh_loop(self):
+        """
+        Refresh the counters until the refresher is stopped.
+        """
+        while not self._stopped.is_set():
+            self._dirty.clear()
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing widgets: {e}")
+            if self._stopped.wait(self.min_refresh_interval):
+                return
+            self._dirty.wait(max(0, self.refresh_interval - self.min_refresh_interval))
+
+    def refresh(self):
+        """
+        Read the counters from the database, keeping the previous ones if they cannot be read.
+
+        Returns:
+        tuple or None: Current widget counters, or None if they were never read.
+        """
+        widgets = self.loader()
+        with self._state_lock:
+            if widgets is not None:
+                self._widgets = widgets
+                self._refreshed_at = time.monotonic()
+                self.refreshes += 1
+            return self._widgets
+
+    def get(self):
+        """
+        Get the last counters read, starting the background refresher on first use.
+
+        Returns:
+        tuple or None: Widget counters, or None if they were not read yet.
+        """
+        if self._thread is None:
+            self.start()
+        return self._widgets
+
+    def get_stats(self):
+        """
+        Get the state of the counters.
+
+        Returns:
+        dict: Age in seconds of the counters, number of refreshes and refresh intervals.
+        """
+        with self._state_lock:
+            return {
+                "age_seconds": time.monotonic() - self._refreshed_at if self._refreshed_at is not None else None,
+                "refreshes": self.refreshes,
+                "refresh_interval": self.refresh_interval,
+                "min_refresh_interval": self.min_refresh_interval
+            }
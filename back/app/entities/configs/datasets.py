@@ -1,3 +1,6 @@
+import os
+import re
+
 class Datasets:
     """
     Class to define paths to various datasets.
@@ -13,11 +16,47 @@ class Datasets:
     cassi = r'app\\datasets\\clean\\ca_ssi_adult_odp_2022.csv'
     maternal = r'app\\datasets\\clean\\maternal_health_risk.csv'
 
+    snapshots = r'app\\datasets\\snapshots'
+
     ckd_train = 'ckd'
     disease_train = 'Critical'
     cassi_train = 'SIR'
     maternal_train = 'RiskLevel'
 
+    # Names of the datasets, as accepted by the getters below
+    names = ('ckd', 'disease', 'cassi', 'maternal')
+
+    @classmethod
+    def get_file_name(cls, dataset_name):
+        """
+        Method to retrieve the file name of a dataset, shared by its raw and clean CSV files.
+
+        Args:
+        dataset_name (str): The name of the dataset.
+
+        Returns:
+        str: The file name of the dataset.
+        """
+        return re.split(r'[\\/]+', cls.get_raw_dataset(dataset_name))[-1]
+
+    @classmethod
+    def use_directory(cls, directory):
+        """
+        Method to point the raw datasets, clean datasets and model snapshots at another directory,
+        such as the synthetic datasets written by DatasetScaler.
+
+        The directory holds raw, clean and snapshots subdirectories, the CSV files keep their names.
+        It must be called before the dataset instances are created.
+
+        Args:
+        directory (str): The directory of the datasets.
+        """
+        for dataset_name in cls.names:
+            file_name = cls.get_file_name(dataset_name)
+            setattr(cls, f'raw_{dataset_name}', os.path.join(directory, 'raw', file_name))
+            setattr(cls, dataset_name, os.path.join(directory, 'clean', file_name))
+        cls.snapshots = os.path.join(directory, 'snapshots')
+
     @classmethod
     def get_raw_dataset(cls, dataset_name):
         """
@@ -44,6 +83,19 @@ class Datasets:
         """
         return getattr(cls, dataset_name.lower())
 
+    @classmethod
+    def get_enums_file(cls, dataset_name):
+        """
+        Method to retrieve the path of the enums file kept next to a clean dataset.
+
+        Args:
+        dataset_name (str): The name of the dataset.
+
+        Returns:
+        str: The path to the enums file of the dataset.
+        """
+        return f'{os.path.splitext(cls.get_clean_dataset(dataset_name))[0]}_enums.json'
+
     @classmethod
     def get_train_label(cls, dataset_name):
         """
@@ -5,6 +5,12 @@ class Endpoint:
     host = "127.0.0.1"
     port = 8001
 
+    # Deployment mode: "ports" serves each controller on its own port starting at port,
+    # "gateway" serves every controller from one application on gateway_port with several workers
+    mode = "ports"
+    gateway_port = 8000
+    workers = 4
+
     @classmethod
     def get_host(cls):
         """
@@ -8,10 +8,21 @@ class Postgresql:
     PASSWORD (str): The password for database authentication.
     HOST (str): The host address where the database server is located.
     PORT (int): The port number on which the database server is listening.
+    MIN_CONNECTIONS (int): Connections opened when the pool is created.
+    MAX_CONNECTIONS (int): Maximum number of connections open at the same time.
+    CHECKOUT_TIMEOUT (float): Seconds to wait for a free connection before giving up.
+    HEALTH_CHECK_INTERVAL (float): Seconds a connection may stay idle before it is checked on checkout.
+    ASYNC_DAL (bool): Use the asynchronous proxies and connection pool instead of the synchronous ones.
     """
 
     DBNAME = "Emergensee"
     USER = "postgres"
     PASSWORD = "Ori102102"
     HOST = "localhost"
-    PORT = 5432
\ No newline at end of file
+    PORT = 5432
+
+    MIN_CONNECTIONS = 1
+    MAX_CONNECTIONS = 10
+    CHECKOUT_TIMEOUT = 30
+    HEALTH_CHECK_INTERVAL = 30
+    ASYNC_DAL = False
\ No newline at end of file
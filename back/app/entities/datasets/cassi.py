@@ -1,8 +1,8 @@
-import pandas as pd
 from app.entities.configs.datasets import Datasets
 from app.entities.configs.models import Models
 from app.services.preprocesses.cassi_preprocessor import CassiPreprocessor
 from app.services.proccessors.cassi_processor import CassiProcessor
+from app.services.utils.row_encoder import RowEncoder
 
 class Cassi:
     """
@@ -23,6 +23,8 @@ class Cassi:
     metrics (list): List to store evaluation metrics.
     min_max (None): Placeholder for min-max scaling parameters (not used in current implementation).
     frequencies (None): Placeholder for feature frequencies (not used in current implementation).
+    dissimilarities (dict or None): Categorical dissimilarity tables built from the frequencies.
+    encoder (RowEncoder or None): Encoder of prediction rows fitted from the training columns.
     rows (int or None): Number of rows in the processed dataset.
     risk_weight (int): Weight for risk assessment (default is 0).
 
@@ -32,7 +34,10 @@ class Cassi:
     preprocess(): Executes data preprocessing steps using CassiPreprocessor.
     process(): Trains models and evaluates their performance using CassiProcessor.
     predict(row_to_predict): Predicts using trained models on a new input row.
+    predict_rows(rows_to_predict): Predicts using trained models on several input rows at once.
     preprocess_row(input_row): Preprocesses a single input row for prediction.
+    preprocess_rows(input_rows): Preprocesses several input rows for prediction at once.
+    get_encoder(): Gets the encoder of prediction rows fitted from the training columns.
     """
 
     _instance = None
@@ -66,6 +71,8 @@ class Cassi:
         self.metrics = []
         self.min_max = None  # Placeholder for min-max scaling (not used)
         self.frequencies = None  # Placeholder for feature frequencies (not used)
+        self.dissimilarities = None
+        self.encoder = None
         self.rows = None
         self.risk_weight = 0
 
@@ -84,8 +91,8 @@ class Cassi:
         """
         Trains models and evaluates their performance using CassiProcessor.
         """
-        self.processor.train_models(self.models, self.X_train, self.y_train)
-        self.metrics.append(self.processor.test_models(self.models, self.X_test, self.y_test))
+        self.processor.train_models(self.models, RowEncoder.get_matrix(self.X_train), self.y_train)
+        self.metrics.append(self.processor.test_models(self.models, RowEncoder.get_matrix(self.X_test), self.y_test))
 
     def predict(self, row_to_predict):
         """
@@ -98,6 +105,18 @@ class Cassi:
         list: Predicted values from each model.
         """
         return self.processor.predict_models(self.models, row_to_predict)
+
+    def predict_rows(self, rows_to_predict):
+        """
+        Predicts using trained models on several input rows at once.
+
+        Args:
+        rows_to_predict (np.ndarray): Encoded input rows to predict.
+
+        Returns:
+        list: Predicted values from each model, one dictionary per row.
+        """
+        return self.processor.predict_models_batch(self.models, rows_to_predict)
     
     def preprocess_row(self, input_row):
         """
@@ -107,12 +126,32 @@ class Cassi:
         input_row (dict or list): Input row to preprocess.
 
         Returns:
-        DataFrame: Preprocessed input row as DataFrame.
+        np.ndarray: Encoded input row as a one-row feature matrix.
+        """
+        return self.preprocess_rows([input_row])
+
+    def preprocess_rows(self, input_rows):
+        """
+        Preprocesses several input rows for prediction at once.
+
+        Args:
+        input_rows (list): Input rows to preprocess.
+
+        Returns:
+        np.ndarray: Encoded input rows, one row per input in training column order.
+        """
+        return self.get_encoder().encode_rows(input_rows)
+
+    def get_encoder(self):
+        """
+        Gets the encoder of prediction rows, fitting it again when the training columns changed.
+
+        Returns:
+        RowEncoder: Encoder fitted from the training feature columns.
         """
-        df_row = pd.DataFrame([input_row])
-        df_row = self.preprocessor.convert(df_row)
-        df_row = df_row.reindex(columns=self.X_train.columns, fill_value=0)
-        return df_row
+        if self.encoder is None or not self.encoder.is_compiled_for(self.X_train.columns):
+            self.encoder = RowEncoder(self.X_train.columns, self.preprocessor.CATEGORICAL_COLUMNS)
+        return self.encoder
     
     def get_dataset_info(self):
         """
@@ -0,0 +1,7 @@
+from typing import List
+from pydantic import BaseModel
+from app.entities.requests.risk_assessment_request import RiskAssessmentRequest
+
+class BatchRiskAssessmentRequest(BaseModel):
+    # Patients to assess, each one as a single risk assessment request
+    patients: List[RiskAssessmentRequest]
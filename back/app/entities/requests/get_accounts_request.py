@@ -1,5 +1,12 @@
-from typing_extensions import Annotated
+from typing import Optional
 from pydantic import BaseModel, conint
+from app.services.utils.pagination import Pagination
 
 class GetAccountsRequest(BaseModel):
     id: int
+
+    # Page size of a paginated listing, every account is returned when it is not set
+    limit: Optional[conint(ge=1, le=Pagination.CONFIG["max_limit"])] = None
+
+    # Cursor token of the next page, returned by the previous page
+    cursor: Optional[str] = None
@@ -1,12 +1,23 @@
+import asyncio
 import math
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from app.entities.datasets.cassi import Cassi
 from app.entities.datasets.ckd import Ckd
 from app.entities.datasets.disease import Disease
 from app.entities.datasets.maternal import Maternal
 from app.services.risk_assessments.risk_assessments import RiskAssessments
+from app.services.risk_assessments.risk_assessment_cache import RiskAssessmentCache
+from app.services.utils.dataset_bundle import DatasetBundle
 from app.services.utils.datasets_tools import DatasetsTools
+from app.services.utils.inference_pool import InferencePool
+from app.services.utils.instrumentation import Instrumentation
+from app.services.utils.job_queue import JobQueue
 from app.services.utils.mapper import Mapper
+from app.services.utils.model_snapshot_store import ModelSnapshotStore
+from app.services.utils.training_scheduler import TrainingScheduler
+from app.services.utils.utils import Utils
 
 class DatasetOperationService:
     # Configuration to enable or disable datasets
@@ -17,180 +28,592 @@ class DatasetOperationService:
         "MaternalHealth": True
     }
 
+    # Dataset class of each CONFIG key, the keys are not all the class names
+    DATASET_CLASSES = {
+        "Disease": Disease,
+        "CKD": Ckd,
+        "CASSI": Cassi,
+        "MaternalHealth": Maternal
+    }
+
+    # Configuration to score the datasets of a risk assessment concurrently
+    CONCURRENCY = {
+        "enabled": True,
+        "max_workers": 4
+    }
+
+    # Configuration of the risk assessment result cache
+    CACHE = {
+        "enabled": True,
+        "max_size": 1024,
+        "ttl_seconds": 600
+    }
+
+    # Configuration of the background training jobs, one preprocess or process runs at a time
+    # and at most max_pending are queued or running, further ones are rejected
+    TRAINING_JOBS = {
+        "max_workers": 1,
+        "max_jobs": 100,
+        "max_pending": 4
+    }
+
+    _executor = None
+    _training_jobs = None
+    _training_lock = threading.Lock()  # Preprocess and process runs mutate the dataset singletons, never run two at once
+
+    @staticmethod
+    def get_enabled_datasets(datasets):
+        """
+        Filters the datasets enabled in CONFIG.
+
+        Args:
+        datasets (list): Dataset instances.
+
+        Returns:
+        list: Instances of the datasets whose CONFIG key is enabled, in the given order.
+        """
+        enabled_classes = tuple(dataset_class for name, dataset_class in DatasetOperationService.DATASET_CLASSES.items()
+                                if DatasetOperationService.CONFIG.get(name, False))
+        return [dataset for dataset in datasets if isinstance(dataset, enabled_classes)]
+
     @staticmethod
-    def preprocess_datasets():
+    def preprocess_datasets(job=None):
         """
         Preprocesses enabled datasets.
 
+        A generation never pairs new training columns with models fitted on other columns: when the
+        columns of a dataset change, its models are trained on the staged data before it is published.
+
+        Args:
+        job (JobContext, optional): Context of the background job running the preprocessing, to report
+                                    the preprocessed datasets and stop when the job is cancelled. Defaults to None.
+
         Returns:
         str: Success message with the time taken for preprocessing.
+
+        Raises:
+        JobCancelled: If the job was cancelled, the datasets preprocessed before stay preprocessed.
         """
-        start_time = time.time()
+        with DatasetOperationService._training_lock:
+            start_time = time.time()
 
-        datasets_instance = DatasetsTools.get_instance()
-        datasets = datasets_instance.get_datasets_instances()
-        
-        for dataset in datasets:
-            dataset_name = type(dataset).__name__
-            if DatasetOperationService.CONFIG.get(dataset_name, False):
-                dataset.preprocess()
+            datasets_instance = DatasetsTools.get_instance()
+            datasets = datasets_instance.get_datasets_instances()
+            enabled_datasets = DatasetOperationService.get_enabled_datasets(datasets)
+
+            try:
+                for done, dataset in enumerate(enabled_datasets):
+                    if job is not None:
+                        job.check_cancelled()
+                        job.report(stage="preprocess", done=done, total=len(enabled_datasets), dataset=type(dataset).__name__)
+                    # Build the new data off to the side, risk assessments keep reading the current generation
+                    staged = DatasetBundle.stage(dataset)
+                    staged.preprocess()
+                    datasets_instance.set_distance_statistics(staged)
+                    if dataset.X_train is not None and not staged.X_train.columns.equals(dataset.X_train.columns):
+                        # The current models were fitted on other columns, only publish the data with models fitted on it
+                        TrainingScheduler.get_instance().process([staged], job)
+                        ModelSnapshotStore.get_instance().save(staged)
+                    DatasetBundle.publish(dataset, staged)
+            finally:
+                DatasetOperationService.get_cache().invalidate()
+                Utils.clear_enums()
+                InferencePool.get_instance().restart()
 
-        end_time = time.time()
-        return f"Success: Preprocess datasets completed. Time taken: {end_time - start_time} seconds."
+            end_time = time.time()
+            if job is not None:
+                job.report(stage="preprocess", done=len(enabled_datasets), total=len(enabled_datasets), dataset=None)
+            return f"Success: Preprocess datasets completed. Time taken: {end_time - start_time} seconds."
     
     @staticmethod
-    def process_datasets():
+    def process_datasets(job=None):
         """
         Processes enabled datasets.
 
+        Args:
+        job (JobContext, optional): Context of the background job running the processing, to report
+                                    the trained models and stop when the job is cancelled. Defaults to None.
+
         Returns:
         str: Success message with the time taken for processing.
+
+        Raises:
+        JobCancelled: If the job was cancelled before the trained models were installed.
+        """
+        with DatasetOperationService._training_lock:
+            start_time = time.time()
+
+            datasets_instance = DatasetsTools.get_instance()
+            datasets = datasets_instance.get_datasets_instances()
+            snapshot_store = ModelSnapshotStore.get_instance()
+
+            enabled_datasets = DatasetOperationService.get_enabled_datasets(datasets)
+
+            # Train on staged generations, risk assessments keep reading the current models until they are published
+            staged_datasets = [DatasetBundle.stage(dataset) for dataset in enabled_datasets]
+            TrainingScheduler.get_instance().process(staged_datasets, job)
+
+            for dataset, staged in zip(enabled_datasets, staged_datasets):
+                if job is not None:
+                    job.report(stage="save", dataset=type(dataset).__name__)
+                snapshot_store.save(staged)
+                DatasetBundle.publish(dataset, staged)
+
+            DatasetOperationService.get_cache().invalidate()
+            InferencePool.get_instance().restart()
+
+            end_time = time.time()
+            return f"Success: Process datasets completed. Time taken: {end_time - start_time} seconds."
+
+    @staticmethod
+    def get_training_jobs():
+        """
+        Gets the queue of the background preprocess and process jobs, creating it on first use.
+
+        Returns:
+        JobQueue: Job queue bounded by TRAINING_JOBS["max_workers"].
+        """
+        if DatasetOperationService._training_jobs is None:
+            DatasetOperationService._training_jobs = JobQueue("training", DatasetOperationService.TRAINING_JOBS["max_workers"],
+                                                              DatasetOperationService.TRAINING_JOBS["max_jobs"],
+                                                              DatasetOperationService.TRAINING_JOBS["max_pending"])
+        return DatasetOperationService._training_jobs
+
+    @staticmethod
+    def submit_preprocess_datasets():
+        """
+        Queues the preprocessing of the enabled datasets as a background job.
+
+        Returns:
+        str: Identifier of the preprocess job.
+
+        Raises:
+        JobQueueFull: If too many training jobs are already pending or running.
+        """
+        return DatasetOperationService.get_training_jobs().submit_cancellable("Preprocess datasets", DatasetOperationService.preprocess_datasets)
+
+    @staticmethod
+    def submit_process_datasets():
+        """
+        Queues the processing of the enabled datasets as a background job.
+
+        Returns:
+        str: Identifier of the process job.
+
+        Raises:
+        JobQueueFull: If too many training jobs are already pending or running.
+        """
+        return DatasetOperationService.get_training_jobs().submit_cancellable("Process datasets", DatasetOperationService.process_datasets)
+
+    # Datasets taking part in risk assessments: CONFIG key, dataset class, input weight key, row mapper and result label
+    RISK_ASSESSMENT_DATASETS = [
+        ("Disease", Disease, "Disease_Weight", Mapper.map_to_disease_row, "Probability of patient in Critical Condition per Disease dataset"),
+        ("CKD", Ckd, "CKD_Weight", Mapper.map_to_ckd_row, "Probability of patient having Chronic Kidney Disease per CKD dataset"),
+        ("CASSI", Cassi, "SIR_Weight", Mapper.map_to_cassi_row, "Probability of patient having new infections per CASSI Adult ODP 2022 dataset"),
+        ("MaternalHealth", Maternal, "MA_Weight", Mapper.map_to_maternal_row, "Patient's risk level per Maternal Health Risk dataset"),
+    ]
+
+    @staticmethod
+    def get_relative_weights(weights, method='linear'):
         """
-        start_time = time.time()
+        Calculates relative weights based on the provided method.
+
+        Args:
+        weights (list of float): List of weights for different datasets.
+        method (str, optional): Method for calculating relative weights ('linear' or 'square'). Defaults to 'linear'.
+
+        Returns:
+        list of float: List of relative weights.
         
-        datasets_instance = DatasetsTools.get_instance()
-        datasets = datasets_instance.get_datasets_instances()
-    
-        for dataset in datasets:
-            dataset_name = type(dataset).__name__
-            if DatasetOperationService.CONFIG.get(dataset_name, False):
-                dataset.process()
+        Raises:
+        ValueError: If an invalid method is provided.
+        """
+        total_sum = sum(weights)
+        if total_sum == 0:
+            return [0] * len(weights)
+
+        if method == 'linear':
+            relative_weights = [weight / total_sum for weight in weights]
+        elif method == 'square':
+            sqrt_weights = [math.sqrt(weight) for weight in weights]
+            total_sqrt = sum(sqrt_weights)
+            relative_weights = [sqrt_weight / total_sqrt for sqrt_weight in sqrt_weights]
+        else:
+            raise ValueError("Invalid method. Please choose 'linear' or 'square'.")
+
+        return relative_weights
+
+    @staticmethod
+    def multiply_fractions_with_ratio(rows_weight, user_weight, P=0.25):
+        """
+        Multiplies fractions with ratio to calculate weighted result.
+
+        Args:
+        rows_weight (float): Weight of dataset rows.
+        user_weight (float): Weight of user input.
+        P (float, optional): Proportion factor. Defaults to 0.25.
 
-        end_time = time.time()
-        return f"Success: Process datasets completed. Time taken: {end_time - start_time} seconds."
+        Returns:
+        float: Weighted result.
+        """
+        weight1 = P
+        weight2 = 1 - P
+
+        result_numerator_linear = (rows_weight * weight1) + (user_weight * weight2)
+        result = result_numerator_linear
+
+        return result
 
     @staticmethod
-    def get_risk_assessment(input):
+    def get_input_relative_weights(input):
+        """
+        Calculates the relative weight of each risk assessment dataset from the input weights.
+
+        Args:
+        input (dict): Input data containing weights for each dataset.
+
+        Returns:
+        list of float: Relative weights in RISK_ASSESSMENT_DATASETS order, disabled datasets weigh 0.
+        """
+        weights = [
+            input.get(weight_key) if DatasetOperationService.CONFIG[name] else 0
+            for name, _, weight_key, _, _ in DatasetOperationService.RISK_ASSESSMENT_DATASETS
+        ]
+        return DatasetOperationService.get_relative_weights(weights)
+
+    @staticmethod
+    def get_executor():
+        """
+        Gets the thread pool shared by the concurrent dataset scoring, creating it on first use.
+
+        Returns:
+        ThreadPoolExecutor: Thread pool bounded by CONCURRENCY["max_workers"].
+        """
+        if DatasetOperationService._executor is None:
+            DatasetOperationService._executor = ThreadPoolExecutor(
+                max_workers=DatasetOperationService.CONCURRENCY["max_workers"],
+                thread_name_prefix="risk-assessment"
+            )
+        return DatasetOperationService._executor
+
+    @staticmethod
+    def map_enabled_datasets(score_dataset):
+        """
+        Scores every enabled risk assessment dataset, concurrently if configured.
+
+        Args:
+        score_dataset (callable): Function receiving a dataset instance and its RISK_ASSESSMENT_DATASETS
+                                  entry, returning the dataset predictions.
+
+        Returns:
+        list: Tuples of RISK_ASSESSMENT_DATASETS index, pinned dataset generation and predictions,
+              in RISK_ASSESSMENT_DATASETS order whatever the order the datasets finish in.
+        """
+        enabled = []
+        for index, spec in enumerate(DatasetOperationService.RISK_ASSESSMENT_DATASETS):
+            name, dataset_class, _, _, _ = spec
+            if DatasetOperationService.CONFIG[name]:
+                enabled.append((index, DatasetBundle.pin(dataset_class()), spec))
+
+        def score(entry):
+            index, dataset, spec = entry
+            return index, dataset, score_dataset(dataset, spec)
+
+        if DatasetOperationService.CONCURRENCY["enabled"] and len(enabled) > 1:
+            return list(DatasetOperationService.get_executor().map(score, enabled))
+        return [score(entry) for entry in enabled]
+
+    @staticmethod
+    def get_cache():
+        """
+        Gets the risk assessment result cache, configured by CACHE.
+
+        Returns:
+        RiskAssessmentCache: Singleton instance of RiskAssessmentCache.
+        """
+        return RiskAssessmentCache.get_instance(DatasetOperationService.CACHE["max_size"], DatasetOperationService.CACHE["ttl_seconds"])
+
+    @staticmethod
+    def get_cache_key(input, k):
+        """
+        Builds the cache key of a risk assessment input.
+
+        Args:
+        input (dict): Input data containing weights for each dataset.
+        k (int): Number of nearest neighbors to consider.
+
+        Returns:
+        tuple: Cache key of the input with the enabled datasets and k.
+        """
+        enabled = tuple(name for name, enabled in DatasetOperationService.CONFIG.items() if enabled)
+        return RiskAssessmentCache.get_key(input, (enabled, k))
+
+    @staticmethod
+    def get_risk_assessment(input, k=5):
+        """
+        Gets the risk assessment of the input, from the result cache when it was already calculated.
+
+        Args:
+        input (dict): Input data containing weights for each dataset.
+        k (int, optional): Number of nearest neighbors to consider. Defaults to 5.
+
+        Returns:
+        OrderedDict: Calculated risk assessment score.
+        """
+        if not DatasetOperationService.CACHE["enabled"]:
+            return DatasetOperationService.calculate_risk_assessment(input, k)
+
+        cache = DatasetOperationService.get_cache()
+        key = DatasetOperationService.get_cache_key(input, k)
+        generation = cache.generation
+
+        score = cache.get(key)
+        if score is None:
+            score = DatasetOperationService.calculate_risk_assessment(input, k)
+            cache.put(key, score, generation)
+        return score
+
+    @staticmethod
+    async def get_risk_assessment_async(input, k=5):
+        """
+        Gets the risk assessment of the input without blocking the event loop, from the result cache
+        when it was already calculated and otherwise in the inference pool.
+
+        When the inference pool is disabled, get_risk_assessment runs in a thread instead.
+
+        Args:
+        input (dict): Input data containing weights for each dataset.
+        k (int, optional): Number of nearest neighbors to consider. Defaults to 5.
+
+        Returns:
+        OrderedDict: Calculated risk assessment score.
+
+        Raises:
+        InferencePoolFull: If the inference pool has too many pending risk assessments.
+        """
+        pool = InferencePool.get_instance()
+        if not pool.enabled:
+            return await asyncio.to_thread(DatasetOperationService.get_risk_assessment, input, k)
+
+        def calculate():
+            """
+            Calculates the risk assessment in a worker process of the inference pool.
+
+            Returns:
+            asyncio.Future: Future of the calculated risk assessment score.
+            """
+            future = pool.submit("calculate_risk_assessment", input, k)
+            return asyncio.wait_for(asyncio.wrap_future(future), InferencePool.CONFIG["timeout"])
+
+        if not DatasetOperationService.CACHE["enabled"]:
+            return await calculate()
+
+        cache = DatasetOperationService.get_cache()
+        key = DatasetOperationService.get_cache_key(input, k)
+        generation = cache.generation
+
+        score = cache.get(key)
+        if score is None:
+            score = await calculate()
+            cache.put(key, score, generation)
+        return score
+
+    @staticmethod
+    def calculate_risk_assessment(input, k=5):
         """
         Calculates risk assessment based on enabled datasets and input weights.
 
         Args:
         input (dict): Input data containing weights for each dataset.
+        k (int, optional): Number of nearest neighbors to consider. Defaults to 5.
 
         Returns:
         float: Calculated risk assessment score.
         """
-        def predict_risk(ds, input_row, k=5):
+        datasets_tools = DatasetsTools.get_instance()
+        instrumentation = Instrumentation.get_instance()
+        stage_metric = "risk_assessment_stage_duration_seconds"
+
+        def predict_risk(ds, spec):
             """
             Predicts risk using the given dataset instance and input data.
 
             Args:
             ds (Dataset): Dataset instance for prediction.
-            input_row (dict): Input data row to predict risk for.
-            k (int, optional): Number of nearest neighbors to consider. Defaults to 5.
+            spec (tuple): RISK_ASSESSMENT_DATASETS entry of the dataset.
 
             Returns:
-            float: Predicted risk value.
-            """
-            k_nearest_rows = datasets_tools.find_nearest_rows(ds, input_row, k)
-            row_to_predict = Mapper.fill_empty_values(input_row, k_nearest_rows)
-            row_to_predict = Mapper.map_to_ds_row(ds, row_to_predict)
-            return ds.predict(row_to_predict)
-        
-        def get_relative_weights(weights, method='linear'):
+            dict: Predicted risk value of each model.
             """
-            Calculates relative weights based on the provided method.
+            _, _, _, map_to_row, _ = spec
+            dataset = type(ds).__name__
+            input_row = map_to_row(input)
+            with instrumentation.time(stage_metric, dataset=dataset, stage="find_nearest_rows"):
+                k_nearest_rows = datasets_tools.find_nearest_rows(ds, input_row, k)
+            with instrumentation.time(stage_metric, dataset=dataset, stage="fill_empty_values"):
+                row_to_predict = Mapper.fill_empty_values(input_row, k_nearest_rows)
+            with instrumentation.time(stage_metric, dataset=dataset, stage="preprocess_row"):
+                row_to_predict = Mapper.map_to_ds_row(ds, row_to_predict)
+            with instrumentation.time(stage_metric, dataset=dataset, stage="predict"):
+                return ds.predict(row_to_predict)
 
-            Args:
-            weights (list of float): List of weights for different datasets.
-            method (str, optional): Method for calculating relative weights ('linear' or 'square'). Defaults to 'linear'.
+        # Calculate relative weights
+        relative_weights = DatasetOperationService.get_input_relative_weights(input)
 
-            Returns:
-            list of float: List of relative weights.
-            
-            Raises:
-            ValueError: If an invalid method is provided.
-            """
-            total_sum = sum(weights)
-            if total_sum == 0:
-                return [0] * len(weights)
-
-            if method == 'linear':
-                relative_weights = [weight / total_sum for weight in weights]
-            elif method == 'square':
-                sqrt_weights = [math.sqrt(weight) for weight in weights]
-                total_sqrt = sum(sqrt_weights)
-                relative_weights = [sqrt_weight / total_sqrt for sqrt_weight in sqrt_weights]
-            else:
-                raise ValueError("Invalid method. Please choose 'linear' or 'square'.")
-
-            return relative_weights
-        
-        def multiply_fractions_with_ratio(rows_weight, user_weight, P=0.25):
+        # Initialize results and weights lists
+        results = {}
+        weights = []
+
+        # Process each enabled dataset and calculate risk
+        for index, dataset, predictions in DatasetOperationService.map_enabled_datasets(predict_risk):
+            label = DatasetOperationService.RISK_ASSESSMENT_DATASETS[index][4]
+            results[label] = predictions
+            weights.append(DatasetOperationService.multiply_fractions_with_ratio(dataset.risk_weight, relative_weights[index]))
+
+        # Calculate final risk assessment score
+        with instrumentation.time(stage_metric, dataset="all", stage="calculate_risk_assessment"):
+            score = RiskAssessments.calculate_risk_assessment(results, weights)
+        return score
+
+    @staticmethod
+    def get_risk_assessments(inputs, k=5):
+        """
+        Gets the risk assessment of several patients, calculating at once the ones missing from the result cache.
+
+        Args:
+        inputs (list): Input data of each patient, as for get_risk_assessment.
+        k (int, optional): Number of nearest neighbors to consider. Defaults to 5.
+
+        Returns:
+        list: Calculated risk assessment of each patient, in input order.
+        """
+        if not DatasetOperationService.CACHE["enabled"]:
+            return DatasetOperationService.calculate_risk_assessments(inputs, k)
+
+        cache = DatasetOperationService.get_cache()
+        keys = [DatasetOperationService.get_cache_key(input, k) for input in inputs]
+        generation = cache.generation
+
+        scores = [cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        calculated = DatasetOperationService.calculate_risk_assessments([inputs[i] for i in missing], k)
+        for i, score in zip(missing, calculated):
+            scores[i] = score
+            cache.put(keys[i], score, generation)
+
+        return scores
+
+    @staticmethod
+    async def get_risk_assessments_async(inputs, k=5):
+        """
+        Gets the risk assessment of several patients without blocking the event loop, calculating at
+        once in the inference pool the ones missing from the result cache.
+
+        When the inference pool is disabled, get_risk_assessments runs in a thread instead.
+
+        Args:
+        inputs (list): Input data of each patient, as for get_risk_assessment.
+        k (int, optional): Number of nearest neighbors to consider. Defaults to 5.
+
+        Returns:
+        list: Calculated risk assessment of each patient, in input order.
+
+        Raises:
+        InferencePoolFull: If the inference pool has too many pending risk assessments.
+        """
+        pool = InferencePool.get_instance()
+        if not pool.enabled:
+            return await asyncio.to_thread(DatasetOperationService.get_risk_assessments, inputs, k)
+
+        async def calculate(pending):
             """
-            Multiplies fractions with ratio to calculate weighted result.
+            Calculates the risk assessment of several patients in a worker process of the inference pool.
 
             Args:
-            rows_weight (float): Weight of dataset rows.
-            user_weight (float): Weight of user input.
-            P (float, optional): Proportion factor. Defaults to 0.25.
+            pending (list): Input data of each patient.
 
             Returns:
-            float: Weighted result.
+            list: Calculated risk assessment of each patient, in input order.
             """
-            weight1 = P
-            weight2 = 1 - P
+            if not pending:
+                return []
+            future = pool.submit("calculate_risk_assessments", pending, k)
+            return await asyncio.wait_for(asyncio.wrap_future(future), InferencePool.CONFIG["timeout"])
 
-            result_numerator_linear = (rows_weight * weight1) + (user_weight * weight2)
-            result = result_numerator_linear
+        if not DatasetOperationService.CACHE["enabled"]:
+            return await calculate(inputs)
 
-            return result
-        
-        # Initialize datasets
-        datasets = {
-            "Disease": Disease() if DatasetOperationService.CONFIG["Disease"] else None,
-            "CKD": Ckd() if DatasetOperationService.CONFIG["CKD"] else None,
-            "CASSI": Cassi() if DatasetOperationService.CONFIG["CASSI"] else None,
-            "MaternalHealth": Maternal() if DatasetOperationService.CONFIG["MaternalHealth"] else None,
-        }
-
-        # Get weights from input
-        weights = [
-            input.get("Disease_Weight") if datasets["Disease"] else 0,
-            input.get("CKD_Weight") if datasets["CKD"] else 0,
-            input.get("SIR_Weight") if datasets["CASSI"] else 0,
-            input.get("MA_Weight") if datasets["MaternalHealth"] else 0,
-        ]
-        
-        # Calculate relative weights
-        relative_weights = get_relative_weights(weights)
+        cache = DatasetOperationService.get_cache()
+        keys = [DatasetOperationService.get_cache_key(input, k) for input in inputs]
+        generation = cache.generation
+
+        scores = [cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        calculated = await calculate([inputs[i] for i in missing])
+        for i, score in zip(missing, calculated):
+            scores[i] = score
+            cache.put(keys[i], score, generation)
+
+        return scores
+
+    @staticmethod
+    def calculate_risk_assessments(inputs, k=5):
+        """
+        Calculates the risk assessment of several patients at once.
+
+        Nearest neighbors, preprocessing and model predictions run once per dataset over all
+        the patients, each patient gets the same result calculate_risk_assessment would return.
+
+        Args:
+        inputs (list): Input data of each patient, as for calculate_risk_assessment.
+        k (int, optional): Number of nearest neighbors to consider. Defaults to 5.
+
+        Returns:
+        list: Calculated risk assessment of each patient, in input order.
+        """
+        if not inputs:
+            return []
+
+        relative_weights = [DatasetOperationService.get_input_relative_weights(input) for input in inputs]
+        results = [{} for _ in inputs]
+        weights = [[] for _ in inputs]
 
-        # Initialize results and weights lists
-        results = {}
-        weights = []
-        
-        # Get datasets tools instance
         datasets_tools = DatasetsTools.get_instance()
+        instrumentation = Instrumentation.get_instance()
+        stage_metric = "risk_assessment_stage_duration_seconds"
 
-        # Process each enabled dataset and calculate risk
-        if datasets["Disease"]:
-            disease_weight = multiply_fractions_with_ratio(datasets["Disease"].risk_weight, relative_weights[0])
-            disease_row = Mapper.map_to_disease_row(input)
-            disease_risks = predict_risk(datasets["Disease"], disease_row)
-            results["Probability of patient in Critical Condition per Disease dataset"] = disease_risks
-            weights.append(disease_weight)
-        
-        if datasets["CKD"]:
-            ckd_weight = multiply_fractions_with_ratio(datasets["CKD"].risk_weight, relative_weights[1])
-            ckd_row = Mapper.map_to_ckd_row(input)
-            ckd_risks = predict_risk(datasets["CKD"], ckd_row)
-            results["Probability of patient having Chronic Kidney Disease per CKD dataset"] = ckd_risks
-            weights.append(ckd_weight)
-        
-        if datasets["CASSI"]:
-            cassi_weight = multiply_fractions_with_ratio(datasets["CASSI"].risk_weight, relative_weights[2])
-            cassi_row = Mapper.map_to_cassi_row(input)
-            cassi_risks = predict_risk(datasets["CASSI"], cassi_row)
-            results["Probability of patient having new infections per CASSI Adult ODP 2022 dataset"] = cassi_risks
-            weights.append(cassi_weight)
-        
-        if datasets["MaternalHealth"]:
-            maternal_weight = multiply_fractions_with_ratio(datasets["MaternalHealth"].risk_weight, relative_weights[3])
-            maternal_row = Mapper.map_to_maternal_row(input)
-            maternal_risks = predict_risk(datasets["MaternalHealth"], maternal_row)
-            results["Patient's risk level per Maternal Health Risk dataset"] = maternal_risks
-            weights.append(maternal_weight)
+        def predict_risks(ds, spec):
+            """
+            Predicts the risk of every patient using the given dataset instance.
 
-        # Calculate final risk assessment score
-        score = RiskAssessments.calculate_risk_assessment(results, weights)
-        return score
\ No newline at end of file
+            Args:
+            ds (Dataset): Dataset instance for prediction.
+            spec (tuple): RISK_ASSESSMENT_DATASETS entry of the dataset.
+
+            Returns:
+            list: Predicted risk values of each model, one dictionary per patient.
+            """
+            _, _, _, map_to_row, _ = spec
+            dataset = type(ds).__name__
+            dataset_rows = [map_to_row(input) for input in inputs]
+            with instrumentation.time(stage_metric, dataset=dataset, stage="find_nearest_rows"):
+                nearest_rows = datasets_tools.find_nearest_rows_batch(ds, dataset_rows, k)
+            with instrumentation.time(stage_metric, dataset=dataset, stage="fill_empty_values"):
+                rows_to_predict = [Mapper.fill_empty_values(row, nearest_row) for row, nearest_row in zip(dataset_rows, nearest_rows)]
+            with instrumentation.time(stage_metric, dataset=dataset, stage="preprocess_row"):
+                rows_to_predict = ds.preprocess_rows(rows_to_predict)
+            with instrumentation.time(stage_metric, dataset=dataset, stage="predict"):
+                return ds.predict_rows(rows_to_predict)
+
+        # Process each enabled dataset for all the patients
+        for index, dataset, predictions in DatasetOperationService.map_enabled_datasets(predict_risks):
+            label = DatasetOperationService.RISK_ASSESSMENT_DATASETS[index][4]
+            for i, prediction in enumerate(predictions):
+                results[i][label] = prediction
+                weights[i].append(DatasetOperationService.multiply_fractions_with_ratio(dataset.risk_weight, relative_weights[i][index]))
+
+        # Calculate final risk assessment score of each patient
+        with instrumentation.time(stage_metric, dataset="all", stage="calculate_risk_assessment"):
+            return [RiskAssessments.calculate_risk_assessment(result, weight) for result, weight in zip(results, weights)]
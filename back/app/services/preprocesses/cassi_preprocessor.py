@@ -4,6 +4,9 @@ from sklearn.model_selection import train_test_split
 from app.interfaces.preprocessor import Preprocessor
 
 class CassiPreprocessor(Preprocessor):
+    # Columns one-hot encoded by convert, None as pd.get_dummies encodes every non-numeric column
+    CATEGORICAL_COLUMNS = None
+
     def load(self, file_path):
         """
         Load the dataset from the file path and drop any rows with missing values.
@@ -5,6 +5,9 @@ from app.entities.configs.datasets import Datasets
 from app.interfaces.preprocessor import Preprocessor
 
 class CkdPreprocessor(Preprocessor):
+    # Columns one-hot encoded by convert
+    CATEGORICAL_COLUMNS = ['rcb', 'pc', 'pcc', 'ba', 'htn', 'dm', 'cad', 'appet', 'pe', 'ane']
+
     def load(self, file_path):
         """
         Load the dataset from the file path.
@@ -43,9 +46,7 @@ class CkdPreprocessor(Preprocessor):
         Returns:
         pandas.DataFrame: Converted dataset with categorical variables one-hot encoded and target variable encoded as binary.
         """
-        # Define categorical columns for one-hot encoding
-        categorical_cols = ['rcb', 'pc', 'pcc', 'ba', 'htn', 'dm', 'cad', 'appet', 'pe', 'ane']
-        df = pd.get_dummies(df, columns=categorical_cols)  # One-hot encode categorical variables
+        df = pd.get_dummies(df, columns=self.CATEGORICAL_COLUMNS)  # One-hot encode categorical variables
 
         # Encode the target variable 'ckd' as binary (ckd: 1, notckd: 0)
         df['ckd'] = df['ckd'].map({'ckd': 1, 'notckd': 0})
@@ -4,6 +4,9 @@ from app.interfaces.preprocessor import Preprocessor
 from app.entities.configs.datasets import Datasets
 
 class DiseasePreprocessor(Preprocessor):
+    # Columns one-hot encoded by convert
+    CATEGORICAL_COLUMNS = ['Critical_Feelings', 'Discharge', 'Feelings_and_Urge', 'Pain_and_Infection', 'Physical_Conditions', 'Disease']
+
     def load(self, file_path):
         """
         Load the dataset from the file path.
@@ -40,7 +43,7 @@ class DiseasePreprocessor(Preprocessor):
         pandas.DataFrame: Converted dataset with categorical variables one-hot encoded and target variable encoded as binary.
         """
         # One-hot encode specified categorical columns
-        df = pd.get_dummies(df, columns=['Critical_Feelings', 'Discharge', 'Feelings_and_Urge', 'Pain_and_Infection', 'Physical_Conditions', 'Disease'])
+        df = pd.get_dummies(df, columns=self.CATEGORICAL_COLUMNS)
         
         # Encode the target variable 'Critical' as binary (Critical: 1, Not Critical: 0)
         df['Critical'] = df['Critical'].map({'Critical': 1, 'Not Critical': 0})
@@ -1,4 +1,5 @@
 from app.interfaces.unlabeled.unlabeled_processor import UnLabeledProcessor
+from app.services.utils.instrumentation import Instrumentation
 
 class CassiProcessor(UnLabeledProcessor):
     def train_models(self, models, X_train, y_train):
@@ -47,12 +48,30 @@ class CassiProcessor(UnLabeledProcessor):
         Returns:
         dict: Dictionary containing model names as keys and their predicted risk levels as values.
         """
-        results = {}
+        return self.predict_models_batch(models, cassi_row)[0]
+
+    def predict_models_batch(self, models, cassi_rows):
+        """
+        Predict risk levels using the trained models for several rows of data at once.
+
+        Args:
+        models (list): List of model instances.
+        cassi_rows (array-like): Rows of data to predict.
+
+        Returns:
+        list: One dictionary per row containing model names as keys and their predicted risk levels as values.
+        """
+        results = [{} for _ in range(len(cassi_rows))]
+
+        instrumentation = Instrumentation.get_instance()
+
         for model in models:
-            prediction = model.predict(cassi_row)
-            cluster_value = model.cluster_risk_levels[prediction[0]]
-            prediction = [self.get_risk_level_value(cluster_value)]
-            results[type(model).__name__] = prediction
+            with instrumentation.time("model_predict_duration_seconds", dataset="Cassi", model=type(model).__name__):
+                predictions = model.predict(cassi_rows)
+
+            for result, prediction in zip(results, predictions):
+                cluster_value = model.cluster_risk_levels[prediction]
+                result[type(model).__name__] = [self.get_risk_level_value(cluster_value)]
 
         return results
     
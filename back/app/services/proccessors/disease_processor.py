@@ -1,4 +1,5 @@
 from app.interfaces.labeled.labeled_processor import LabeledProcessor
+from app.services.utils.instrumentation import Instrumentation
 
 class DiseaseProcessor(LabeledProcessor):
     def train_models(self, models, X_train, y_train):
@@ -47,17 +48,34 @@ class DiseaseProcessor(LabeledProcessor):
         Returns:
         dict: Dictionary containing model names as keys and their predicted risk levels as values.
         """
-        results = {}
+        return self.predict_models_batch(models, disease_row)[0]
+
+    def predict_models_batch(self, models, disease_rows):
+        """
+        Predict risk levels using the trained models for several rows of Disease data at once.
+
+        Args:
+        models (list): List of model instances.
+        disease_rows (array-like): Rows of data to predict.
+
+        Returns:
+        list: One dictionary per row containing model names as keys and their predicted risk levels as values.
+        """
+        results = [{} for _ in range(len(disease_rows))]
+
+        instrumentation = Instrumentation.get_instance()
 
         for model in models:
-            metrics = model.predict(disease_row)
+            with instrumentation.time("model_predict_duration_seconds", dataset="Disease", model=type(model).__name__):
+                metrics = model.predict(disease_rows)
 
-            abs_metrics = abs(metrics[0]) * 100
-            if abs_metrics >= 50:
-                abs_metrics = [100]
-            else:
-                abs_metrics = [0]
+            for result, metric in zip(results, metrics):
+                abs_metrics = abs(metric) * 100
+                if abs_metrics >= 50:
+                    abs_metrics = [100]
+                else:
+                    abs_metrics = [0]
 
-            results[type(model).__name__] = abs_metrics
+                result[type(model).__name__] = abs_metrics
 
         return results
\ No newline at end of file
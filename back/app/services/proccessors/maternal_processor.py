@@ -1,4 +1,5 @@
 from app.interfaces.unlabeled.unlabeled_processor import UnLabeledProcessor
+from app.services.utils.instrumentation import Instrumentation
 
 class MaternalProcessor(UnLabeledProcessor):
     def train_models(self, models, X_train, y_train):
@@ -47,14 +48,31 @@ class MaternalProcessor(UnLabeledProcessor):
         Returns:
         dict: Dictionary containing model names as keys and their predicted risk levels as values.
         """
-        results = {}
+        return self.predict_models_batch(models, maternal_row)[0]
+
+    def predict_models_batch(self, models, maternal_rows):
+        """
+        Predict risk levels using the trained models for several rows of Maternal data at once.
+
+        Args:
+        models (list): List of model instances.
+        maternal_rows (array-like): Rows of data to predict.
+
+        Returns:
+        list: One dictionary per row containing model names as keys and their predicted risk levels as values.
+        """
+        results = [{} for _ in range(len(maternal_rows))]
+
+        instrumentation = Instrumentation.get_instance()
 
         for model in models:
-            prediction = model.predict(maternal_row)
-            cluster_value = model.cluster_risk_levels[prediction[0]]
-            prediction = [self.get_risk_level_value(cluster_value)]
-            results[type(model).__name__] = prediction
-            
+            with instrumentation.time("model_predict_duration_seconds", dataset="Maternal", model=type(model).__name__):
+                predictions = model.predict(maternal_rows)
+
+            for result, prediction in zip(results, predictions):
+                cluster_value = model.cluster_risk_levels[prediction]
+                result[type(model).__name__] = [self.get_risk_level_value(cluster_value)]
+
         return results
     
     def get_risk_level_value(self, risk_level):
@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import OrderedDict
+
+class RiskAssessmentCache:
+    """
+    Bounded LRU cache of risk assessment results with a time to live.
+
+    Results are keyed on the canonicalized risk assessment input, so resubmitting the same
+    values returns the stored assessment instead of scoring the datasets again. The cache is
+    cleared whenever the datasets are preprocessed or the models are retrained.
+
+    Attributes:
+    max_size (int): Maximum number of stored results.
+    ttl_seconds (float): Seconds a stored result stays valid.
+    hits (int): Number of lookups answered from the cache.
+    misses (int): Number of lookups not found in the cache.
+    """
+
+    _instance = None
+
+    @staticmethod
+    def get_instance(max_size=1024, ttl_seconds=600):
+        """
+        Get singleton instance of RiskAssessmentCache.
+
+        Args:
+        max_size (int, optional): Maximum number of stored results. Defaults to 1024.
+        ttl_seconds (float, optional): Seconds a stored result stays valid. Defaults to 600.
+
+        Returns:
+        RiskAssessmentCache: Singleton instance of RiskAssessmentCache.
+        """
+        if RiskAssessmentCache._instance is None:
+            RiskAssessmentCache._instance = RiskAssessmentCache(max_size, ttl_seconds)
+        return RiskAssessmentCache._instance
+
+    def __init__(self, max_size=1024, ttl_seconds=600):
+        """
+        Initialize an empty cache.
+
+        Args:
+        max_size (int, optional): Maximum number of stored results. Defaults to 1024.
+        ttl_seconds (float, optional): Seconds a stored result stays valid. Defaults to 600.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(input, context=()):
+        """
+        Build the cache key of a risk assessment input.
+
+        The mapped input only holds the values to assess and the dataset weights, every field of it is part of the key.
+
+        Args:
+        input (dict): Risk assessment input, as returned by Mapper.map_to_risk_assessment_request.
+        context (tuple, optional): Extra hashable values the result depends on. Defaults to ().
+
+        Returns:
+        tuple: Canonical key, independent of the order of the input fields.
+        """
+        return tuple(sorted(input.items())), context
+
+    @property
+    def generation(self):
+        """
+        Current generation of the cache, increased each time the cache is invalidated.
+
+        Returns:
+        int: Current generation.
+        """
+        return self._generation
+
+    def get(self, key):
+        """
+        Get a stored result, counting the lookup as a hit or a miss.
+
+        Args:
+        key (tuple): Cache key built with get_key.
+
+        Returns:
+        OrderedDict or None: Copy of the stored result, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return OrderedDict(entry[1])
+
+    def put(self, key, result, generation):
+        """
+        Store a result, evicting the least recently used ones beyond max_size.
+
+        The result is dropped if the cache was invalidated since generation was read, as it was
+        calculated from datasets or models that are no longer current.
+
+        Args:
+        key (tuple): Cache key built with get_key.
+        result (OrderedDict): Risk assessment result to store.
+        generation (int): Cache generation read before calculating the result.
+        """
+        with self._lock:
+            if generation != self._generation or self.max_size <= 0:
+                return
+
+            self._entries[key] = (time.monotonic(), OrderedDict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """
+        Remove every stored result.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def get_stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+        dict: Number of hits, misses and stored results, and the hit ratio.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,84 @@
+import threading
+
+class DatasetBundle:
+    """
+    Versioned generations of the data and models of the dataset singletons, swapped in atomically.
+
+    The state a dataset serves predictions from (raw and processed data, train and test splits,
+    models, metrics, distance statistics and row encoder) is the instance dictionary of its
+    singleton. A new generation is built on a staged copy of the dataset, off to the side, and
+    published by replacing the dictionary of the singleton in a single assignment. Inference pins
+    the current generation once and reads every attribute from it, so it sees the old or the new
+    generation as a whole and never waits on preprocessing or training.
+    """
+
+    # Mutable containers copied when a generation is staged, so the staged dataset never changes the live one in place
+    COPIED_ATTRIBUTES = ("models", "metrics")
+
+    _lock = threading.Lock()  # Serializes the publications, readers never take it
+
+    @staticmethod
+    def stage(dataset):
+        """
+        Copy the current generation of a dataset, to build the next generation without touching it.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+
+        Returns:
+        Dataset: Staged copy of the dataset, its attributes can be reassigned and its models retrained.
+        """
+        staged = object.__new__(type(dataset))  # Bypasses the singleton __new__
+        state = dict(dataset.__dict__)
+        for attribute in DatasetBundle.COPIED_ATTRIBUTES:
+            if state.get(attribute) is not None:
+                state[attribute] = list(state[attribute])
+        staged.__dict__ = state
+        return staged
+
+    @staticmethod
+    def publish(dataset, staged):
+        """
+        Make a staged generation the current generation of a dataset.
+
+        Args:
+        dataset: Singleton instance of a dataset class.
+        staged: Staged copy of the dataset returned by stage.
+
+        Returns:
+        int: Generation number of the published generation.
+        """
+        with DatasetBundle._lock:
+            state = staged.__dict__
+            state["generation"] = DatasetBundle.get_generation(dataset) + 1
+            dataset.__dict__ = state  # Single reference swap, readers see the old or the new dictionary
+            return state["generation"]
+
+    @staticmethod
+    def pin(dataset):
+        """
+        Pin the current generation of a dataset for the duration of an inference.
+
+        Args:
+        dataset: Singleton instance of a dataset class.
+
+        Returns:
+        Dataset: View of the dataset reading the generation current at the time of the call,
+                 unaffected by the generations published afterwards.
+        """
+        pinned = object.__new__(type(dataset))
+        pinned.__dict__ = dataset.__dict__
+        return pinned
+
+    @staticmethod
+    def get_generation(dataset):
+        """
+        Get the generation number of a dataset.
+
+        Args:
+        dataset: Instance of a dataset class.
+
+        Returns:
+        int: Number of generations published, 0 for the generation built at startup.
+        """
+        return dataset.__dict__.get("generation", 0)
@@ -0,0 +1,186 @@
+import os
+import numpy as np
+import pandas as pd
+from app.entities.configs.datasets import Datasets
+from app.services.utils.datasets_tools import DatasetsTools
+
+class DatasetScaler:
+    """
+    Generator of synthetic raw datasets statistically similar to the bundled ones, at any number of rows.
+
+    Rows are drawn from the raw dataset with replacement, which keeps the joint distribution of
+    the columns and the relation between the features and the training label. Numeric columns
+    are then jittered by a fraction of their standard deviation and clipped to their min_max
+    range, and a fraction of the categorical values are redrawn from the column frequencies, so
+    the synthetic rows are not exact copies. The training label and the missing values are never
+    altered, so the preprocessors drop the same share of rows as on the bundled datasets.
+
+    The CSV files are read and written as text, so tokens such as '?' for missing values and the
+    number of decimals of each column are kept, and the preprocessors read the synthetic files
+    as they read the bundled ones. Rows are generated and written in chunks, so datasets 1000
+    times larger than the bundled ones fit in memory.
+    """
+
+    # Generation settings: numeric jitter as a fraction of the standard deviation, probability of redrawing
+    # a categorical value, number of distinct values under which a numeric column is treated as categorical,
+    # rows generated at a time, encoding of the CSV files and tokens of the missing values, which are never
+    # redrawn nor drawn so that every generated row keeps the missing values of the row it comes from
+    CONFIG = {
+        "numeric_jitter": 0.05,
+        "categorical_noise": 0.05,
+        "discrete_max_values": 10,
+        "chunk_rows": 100000,
+        "encoding": "ISO-8859-1",
+        "missing_values": ("", "?")
+    }
+
+    def __init__(self, seed=None):
+        """
+        Initialize the scaler.
+
+        Args:
+        seed (int, optional): Seed of the generated rows, the same seed generates the same files. Defaults to None.
+        """
+        self.seed = seed
+
+    @staticmethod
+    def load(path):
+        """
+        Load a raw dataset as text.
+
+        Args:
+        path (str): Path of the raw CSV file.
+
+        Returns:
+        pd.DataFrame: Raw dataset, every cell as the text of the file.
+        """
+        return pd.read_csv(path, dtype=str, keep_default_na=False, encoding=DatasetScaler.CONFIG["encoding"])
+
+    @staticmethod
+    def get_statistics(df, label):
+        """
+        Split the columns of a raw dataset into numeric and categorical ones and get their statistics.
+
+        Args:
+        df (pd.DataFrame): Raw dataset as text.
+        label (str): Training label of the dataset, always categorical.
+
+        Returns:
+        dict: Numeric values, min_max and decimals of the numeric columns, and frequencies of the categorical columns.
+        """
+        numeric = {}
+        for column in df.columns:
+            if column == label:
+                continue
+            values = pd.to_numeric(df[column].str.strip(), errors='coerce')
+            known = values.dropna()
+            if known.empty or len(known) < 0.8 * len(values) or known.nunique() <= DatasetScaler.CONFIG["discrete_max_values"]:
+                continue  # Text, mostly missing or discrete columns are redrawn from their frequencies
+            numeric[column] = values
+
+        numeric_df = pd.DataFrame(numeric)
+        datasets_tools = DatasetsTools.get_instance()
+        decimals = {}
+        for column in numeric:
+            digits = df[column].str.extract(r'\.(\d+)')[0].str.len().max()
+            decimals[column] = 0 if pd.isna(digits) else min(int(digits), 6)
+        return {
+            "numeric": numeric_df,
+            "min_max": datasets_tools.get_min_max_columns(numeric_df),
+            "decimals": decimals,
+            "frequencies": datasets_tools.get_categorical_frequencies(df.drop(columns=list(numeric) + [label]))
+        }
+
+    @staticmethod
+    def generate(df, statistics, rows, rng):
+        """
+        Generate synthetic rows similar to a raw dataset.
+
+        Args:
+        df (pd.DataFrame): Raw dataset as text.
+        statistics (dict): Statistics of the dataset, as returned by get_statistics.
+        rows (int): Number of rows to generate.
+        rng (np.random.Generator): Random generator.
+
+        Returns:
+        pd.DataFrame: Synthetic rows as text, with the columns of the raw dataset.
+        """
+        indices = rng.integers(0, len(df), rows)
+        synthetic = df.iloc[indices].reset_index(drop=True)
+
+        for column, values in statistics["numeric"].items():
+            minimum, maximum = statistics["min_max"][column]
+            sampled = values.to_numpy()[indices]
+            jittered = sampled + rng.normal(0, DatasetScaler.CONFIG["numeric_jitter"] * values.std(), rows)
+            jittered = np.round(np.clip(jittered, minimum, maximum), statistics["decimals"][column])
+            known = ~np.isnan(sampled)  # Missing value tokens are kept as they are
+            text = pd.Series(jittered[known])
+            text = text.astype(np.int64).astype(str) if statistics["decimals"][column] == 0 else text.astype(str)
+            synthetic.loc[known, column] = text.to_numpy()
+
+        for column, frequencies in statistics["frequencies"].items():
+            missing = synthetic[column].str.strip().isin(DatasetScaler.CONFIG["missing_values"]).to_numpy()
+            redrawn = (rng.random(rows) < DatasetScaler.CONFIG["categorical_noise"]) & ~missing
+            count = int(redrawn.sum())
+            categories = [category for category in frequencies if category.strip() not in DatasetScaler.CONFIG["missing_values"]]
+            if count == 0 or not categories:
+                continue
+            weights = np.array([frequencies[category] for category in categories], dtype=float)
+            synthetic.loc[redrawn, column] = rng.choice(categories, size=count, p=weights / weights.sum())
+
+        return synthetic
+
+    def scale(self, dataset_name, rows, output_path):
+        """
+        Write a synthetic version of a bundled raw dataset.
+
+        Args:
+        dataset_name (str): The name of the dataset (e.g., ckd, disease, cassi, maternal).
+        rows (int): Number of rows of the synthetic dataset.
+        output_path (str): Path of the synthetic CSV file.
+
+        Returns:
+        int: Number of rows written.
+        """
+        df = DatasetScaler.load(Datasets.get_raw_dataset(dataset_name))
+        statistics = DatasetScaler.get_statistics(df, Datasets.get_train_label(dataset_name))
+        rng = np.random.default_rng(None if self.seed is None else [self.seed, Datasets.names.index(dataset_name)])
+
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        written = 0
+        while written < rows:
+            chunk = DatasetScaler.generate(df, statistics, min(DatasetScaler.CONFIG["chunk_rows"], rows - written), rng)
+            chunk.to_csv(output_path, mode='w' if written == 0 else 'a', header=written == 0, index=False,
+                         encoding=DatasetScaler.CONFIG["encoding"])
+            written += len(chunk)
+        return written
+
+    def scale_all(self, directory, factor=None, rows=None):
+        """
+        Write a synthetic version of every bundled raw dataset, in the layout expected by Datasets.use_directory.
+
+        Args:
+        directory (str): Directory of the synthetic datasets.
+        factor (float, optional): Number of rows relative to each bundled dataset. Defaults to None.
+        rows (int, optional): Number of rows of every dataset, used when no factor is given. Defaults to None.
+
+        Returns:
+        dict: Number of rows written, by dataset name.
+
+        Raises:
+        ValueError: If neither a factor nor a number of rows is given.
+        """
+        if factor is None and rows is None:
+            raise ValueError("A factor or a number of rows is required")
+
+        for subdirectory in ('raw', 'clean', 'snapshots'):
+            os.makedirs(os.path.join(directory, subdirectory), exist_ok=True)
+
+        written = {}
+        for dataset_name in Datasets.names:
+            dataset_rows = rows
+            if factor is not None:
+                dataset_rows = max(1, round(len(DatasetScaler.load(Datasets.get_raw_dataset(dataset_name))) * factor))
+            output_path = os.path.join(directory, 'raw', Datasets.get_file_name(dataset_name))
+            written[dataset_name] = self.scale(dataset_name, dataset_rows, output_path)
+        return written
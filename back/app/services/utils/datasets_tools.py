@@ -1,10 +1,12 @@
 from collections import Counter
 import math
+import numpy as np
 import pandas as pd
 from app.entities.datasets.disease import Disease
 from app.entities.datasets.ckd import Ckd
 from app.entities.datasets.cassi import Cassi
 from app.entities.datasets.maternal import Maternal
+from app.services.utils.distance_engine import DistanceEngine
 
 class DatasetsTools():
     _instance = None
@@ -35,6 +37,7 @@ class DatasetsTools():
         maternal_health_risk_instance = Maternal()
         instance = DatasetsTools()
         instance._datasets = [ckd_instance, disease_instance, maternal_health_risk_instance, cassi_adult_odp_2022_instance]
+        instance._distance_engines = {}
         return instance
 
     def get_datasets_instances(self):
@@ -87,6 +90,59 @@ class DatasetsTools():
 
         return categorical_frequencies
 
+    def get_categorical_dissimilarities(self, frequencies):
+        """
+        Build a dissimilarity table for each categorical column from its frequencies.
+
+        Each table is indexed by (input value, row value) positions. The last position
+        stands for values that do not appear in the frequencies. Equal known values
+        have a dissimilarity of 0. Any other pair costs an amount that depends only on
+        how frequent the input value is.
+
+        Args:
+        frequencies (dict): Dictionary of categorical frequencies.
+
+        Returns:
+        dict: Dictionary where keys are column names and values are dictionaries holding
+              the value positions ('index') and the dissimilarity matrix ('table').
+        """
+        categorical_dissimilarities = {}
+
+        for col, value_counts in frequencies.items():
+            counts = np.array(list(value_counts.values()), dtype=float)
+            unseen = len(counts)
+            input_freqs = np.append(counts, 0)
+            costs = np.empty(unseen + 1)
+
+            for i, input_freq in enumerate(input_freqs):
+                freq_array = counts[counts != input_freq]
+                if len(freq_array) == 0:
+                    freq_array = np.array([input_freq])  # Every category is as frequent as the input
+                max_freq = max(input_freq, freq_array.max())
+                min_freq = min(input_freq, freq_array.min())
+                costs[i] = (abs(input_freq - max_freq) + min_freq) / max(max_freq, input_freq)
+
+            table = np.repeat(costs[:, np.newaxis], unseen + 1, axis=1)
+            np.fill_diagonal(table[:unseen, :unseen], 0)
+
+            categorical_dissimilarities[col] = {
+                "index": {value: i for i, value in enumerate(value_counts)},
+                "table": table
+            }
+
+        return categorical_dissimilarities
+
+    def set_distance_statistics(self, dataset):
+        """
+        Compute the min-max values, categorical frequencies and dissimilarity tables of a dataset.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+        """
+        dataset.min_max = self.get_min_max_columns(dataset.df_raw)
+        dataset.frequencies = self.get_categorical_frequencies(dataset.df_raw)
+        dataset.dissimilarities = self.get_categorical_dissimilarities(dataset.frequencies)
+
     def get_categorical_enums(self, dataset):
         """
         Get unique categorical values for each categorical column in a dataset.
@@ -95,22 +151,18 @@ class DatasetsTools():
         dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
 
         Returns:
-        dict: Dictionary where keys are column names and values are sets of unique categorical values.
+        dict: Dictionary where keys are column names and values are lists of unique categorical values,
+              in order of first appearance and without missing values.
         """
         categorical_info = {}
 
-        for _, data_row in dataset.df_raw.iterrows():
-            data_row_dict = data_row.to_dict()
-
-            for key, value in data_row_dict.items():
-                if pd.api.types.is_string_dtype(dataset.df_raw[key]):
-                    if key not in categorical_info:
-                        categorical_info[key] = set([value])
-                    else:
-                        categorical_info[key].add(value)
+        for column in dataset.df_raw.columns:
+            series = dataset.df_raw[column]
+            if pd.api.types.is_string_dtype(series):
+                categorical_info[column] = series.dropna().unique().tolist()
         return categorical_info
 
-    def mix_distance(self, dataset_row, input_row_dict, min_max, frequencies):
+    def mix_distance(self, dataset_row, input_row_dict, min_max, dissimilarities):
         """
         Calculate mixed distance between a dataset row and an input row.
 
@@ -118,7 +170,7 @@ class DatasetsTools():
         dataset_row (dict): Dictionary representing a row from a dataset.
         input_row_dict (dict): Dictionary representing an input row.
         min_max (dict): Dictionary of minimum and maximum values for numerical columns.
-        frequencies (dict): Dictionary of categorical frequencies.
+        dissimilarities (dict): Dictionary of categorical dissimilarity tables.
 
         Returns:
         float: Mixed distance between the dataset row and the input row.
@@ -148,14 +200,34 @@ class DatasetsTools():
                     categorical_sum += 0
 
                 else:
-                    input_freq = frequencies[key].get(input_value, 0)
-                    freq_array = [freq_value for freq_value in frequencies[key].values() if freq_value != input_freq]
-                    max_freq = max(input_freq, max(freq_array))
-                    min_freq = min(input_freq, min(freq_array))
-                    categorical_sum += (abs(input_freq - max_freq) + min_freq) / max(max_freq, input_freq)
+                    index = dissimilarities[key]["index"]
+                    unseen = len(index)
+                    categorical_sum += dissimilarities[key]["table"][index.get(input_value, unseen), index.get(value, unseen)]
         
         return math.sqrt(numerical_sum + categorical_sum)
 
+    def get_distance_engine(self, dataset):
+        """
+        Get the compiled distance engine of a dataset, compiling it when the dataset changed.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+
+        Returns:
+        DistanceEngine: Distance engine compiled for the current dataset state.
+        """
+        dataset_name = type(dataset).__name__
+        engine = self._distance_engines.get(dataset_name)
+
+        if dataset.dissimilarities is None:
+            dataset.dissimilarities = self.get_categorical_dissimilarities(dataset.frequencies)
+
+        if engine is None or not engine.is_compiled_for(dataset):
+            engine = DistanceEngine(dataset.df_raw, dataset.min_max, dataset.dissimilarities)
+            self._distance_engines[dataset_name] = engine
+
+        return engine
+
     def find_nearest_rows(self, dataset, input_row_dict, K):
         """
         Find K nearest rows in a dataset to an input row.
@@ -168,18 +240,25 @@ class DatasetsTools():
         Returns:
         list: List of dictionaries representing K nearest rows.
         """
-        nearest_rows = []
-        distances = []
-    
-        for _, data_row in dataset.df_raw.iterrows():
-            data_row_dict = data_row.to_dict()
-            distance = self.mix_distance(data_row_dict, input_row_dict, dataset.min_max, dataset.frequencies)
-    
-            nearest_rows.append(data_row_dict)
-            distances.append(distance)
-    
-        nearest_rows_sorted = [row for _, row in sorted(zip(distances, nearest_rows), key=lambda pair: pair[0])]
-        return self.get_nearest_row(nearest_rows_sorted[:K])
+        engine = self.get_distance_engine(dataset)
+        nearest_rows = [engine.get_row(position) for position in engine.nearest_indices(input_row_dict, K)]
+        return self.get_nearest_row(nearest_rows)
+
+    def find_nearest_rows_batch(self, dataset, input_rows, K):
+        """
+        Find K nearest rows in a dataset to each of several input rows.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+        input_rows (list): List of dictionaries representing input rows.
+        K (int): Number of nearest rows to find.
+
+        Returns:
+        list: Nearest row in terms of mode/mean for each input row, in input order.
+        """
+        engine = self.get_distance_engine(dataset)
+        return [self.get_nearest_row([engine.get_row(position) for position in positions])
+                for positions in engine.batch_nearest_indices(input_rows, K)]
 
     def get_nearest_row(self, nearest_rows):
         """
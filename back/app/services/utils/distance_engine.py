@@ -0,0 +1,295 @@
+import math
+import numpy as np
+import pandas as pd
+
+class DistanceEngine:
+    """
+    Vectorized implementation of DatasetsTools.mix_distance for a single dataset.
+
+    The engine is compiled once from a dataset's raw DataFrame, min-max values and
+    categorical dissimilarity tables. Each column is stored as a float matrix column (for
+    the numerical part of the distance) and as integer positions into its dissimilarity
+    table (for the categorical part), so the distances from a query to every row are
+    computed in one batched pass.
+
+    Attributes:
+    df (pd.DataFrame): The raw DataFrame the engine was compiled from.
+    min_max (dict): Min-max values the engine was compiled with.
+    dissimilarities (dict): Categorical dissimilarity tables the engine was compiled with.
+    columns (list): Column names in DataFrame order.
+    rows (int): Number of rows in the DataFrame.
+    """
+
+    NUMERIC = "numeric"
+    CATEGORICAL = "categorical"
+    SKIP = "skip"
+    CHUNK_SIZE = 256
+
+    def __init__(self, df, min_max, dissimilarities):
+        """
+        Compile the engine for a dataset.
+
+        Args:
+        df (pd.DataFrame): Raw DataFrame of the dataset.
+        min_max (dict): Dictionary of minimum and maximum values for the dataset columns.
+        dissimilarities (dict): Dictionary of categorical dissimilarity tables for the dataset columns.
+        """
+        self.df = df
+        self.min_max = min_max
+        self.dissimilarities = dissimilarities
+        self.columns = list(df.columns)
+        self.rows = len(df)
+        self._values = df.values
+        self._compiled_columns = [self._compile_column(column, df[column]) for column in self.columns]
+
+    def is_compiled_for(self, dataset):
+        """
+        Check whether the engine still reflects the current state of a dataset.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+
+        Returns:
+        bool: True if the dataset data and statistics are the ones the engine was compiled from.
+        """
+        return (self.df is dataset.df_raw
+                and self.min_max is dataset.min_max
+                and self.dissimilarities is dataset.dissimilarities)
+
+    def _compile_column(self, name, series):
+        """
+        Precompute the numerical and categorical representation of a column.
+
+        Args:
+        name (str): Column name.
+        series (pd.Series): Column values.
+
+        Returns:
+        dict: Compiled column data.
+        """
+        codes, uniques = pd.factorize(series)
+        uniques = list(uniques)
+
+        # Values that mix_distance can convert with float() take the numerical branch
+        unique_numbers = np.full(len(uniques), np.nan)
+        unique_numeric_like = np.zeros(len(uniques), dtype=bool)
+        for i, value in enumerate(uniques):
+            try:
+                unique_numbers[i] = float(value)
+                unique_numeric_like[i] = True
+            except (TypeError, ValueError):
+                continue
+
+        present = codes >= 0
+        numbers = np.where(present, unique_numbers[codes], np.nan)
+        numeric_like = present & unique_numeric_like[codes]
+
+        # Positions of the values in the column dissimilarity table, values missing from it share the last one
+        table_positions = None
+        if name in self.dissimilarities:
+            index = self.dissimilarities[name]["index"]
+            unique_positions = np.array([index.get(value, len(index)) for value in uniques] + [len(index)], dtype=int)
+            table_positions = unique_positions[codes]
+
+        # Mirror how mix_distance treats the min-max pair of the column
+        state = self.NUMERIC
+        span = None
+        min_val, max_val = self.min_max.get(name, (None, None))
+        if min_val is None or max_val is None:
+            state = self.SKIP
+        else:
+            try:
+                span = max_val - min_val
+                if DistanceEngine._falls_back_to_categorical(span):
+                    state = self.CATEGORICAL
+            except Exception:
+                state = self.CATEGORICAL
+
+        return {
+            "name": name,
+            "present": present,
+            "numbers": numbers,
+            "numeric_like": numeric_like,
+            "table_positions": table_positions,
+            "state": state,
+            "span": span,
+        }
+
+    @staticmethod
+    def _falls_back_to_categorical(span):
+        """
+        Check whether mix_distance compares the values of a column as categories because of its min-max span.
+
+        mix_distance divides by the span and falls back to categorical when the division raises. A zero
+        span of Python numbers raises ZeroDivisionError, while numpy scalars, as read by get_min_max_columns,
+        divide to inf or nan without raising.
+
+        Args:
+        span: Difference between the maximum and minimum values of the column.
+
+        Returns:
+        bool: True if the span is a zero Python number.
+        """
+        return not isinstance(span, np.generic) and span == 0
+
+    def _table_positions(self, name, values):
+        """
+        Get the positions of values in the dissimilarity table of a column.
+
+        Args:
+        name (str): Column name.
+        values (list): Values to locate.
+
+        Returns:
+        np.ndarray: Table positions, values missing from the table share the last position.
+        """
+        index = self.dissimilarities[name]["index"]
+        return np.array([index.get(value, len(index)) for value in values], dtype=int)
+
+    def batch_distances(self, input_rows):
+        """
+        Calculate the mixed distance between several input rows and every row of the dataset.
+
+        Args:
+        input_rows (list): List of dictionaries representing input rows.
+
+        Returns:
+        np.ndarray: Matrix of shape (len(input_rows), rows) with the mixed distances.
+        """
+        count = len(input_rows)
+        numerical_sum = np.zeros((count, self.rows))
+        categorical_sum = np.zeros((count, self.rows))
+
+        for column in self._compiled_columns:
+            name = column["name"]
+
+            active = np.zeros(count, dtype=bool)
+            numeric_input = np.zeros(count, dtype=bool)
+            input_numbers = np.full(count, np.nan)
+            input_values = [None] * count
+
+            for i, input_row_dict in enumerate(input_rows):
+                input_value = input_row_dict.get(name)
+                if input_value is None or isinstance(input_value, float) and math.isnan(input_value):
+                    continue
+
+                active[i] = True
+                input_values[i] = input_value
+                try:
+                    input_numbers[i] = float(input_value)
+                    numeric_input[i] = True
+                except (TypeError, ValueError):
+                    continue
+
+            if not active.any():
+                continue
+
+            present = column["present"][np.newaxis, :]
+            numeric_like = column["numeric_like"][np.newaxis, :]
+            numeric_queries = (active & numeric_input)[:, np.newaxis]
+            other_queries = (active & ~numeric_input)[:, np.newaxis]
+
+            # Rows whose value and input can both be converted with float() take the numerical branch
+            numeric_rows = numeric_queries & present & numeric_like
+            categorical_rows = (numeric_queries & present & ~numeric_like) | (other_queries & present)
+
+            if column["state"] == self.NUMERIC and numeric_rows.any():
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    contribution = ((column["numbers"][np.newaxis, :] - input_numbers[:, np.newaxis]) / column["span"]) ** 2
+                numerical_sum += np.where(numeric_rows, contribution, 0.0)
+
+            elif column["state"] == self.CATEGORICAL:
+                # mix_distance already converted both values to float when it falls back here
+                mismatched_rows = numeric_rows & (column["numbers"][np.newaxis, :] != input_numbers[:, np.newaxis])
+                if mismatched_rows.any():
+                    positions = self._table_positions(name, input_numbers.tolist())
+                    costs = self.dissimilarities[name]["table"][positions, -1]
+                    categorical_sum += np.where(mismatched_rows, costs[:, np.newaxis], 0.0)
+
+            if categorical_rows.any():
+                positions = self._table_positions(name, input_values)
+                costs = self.dissimilarities[name]["table"][positions[:, np.newaxis], column["table_positions"][np.newaxis, :]]
+                categorical_sum += np.where(categorical_rows, costs, 0.0)
+
+        return np.sqrt(numerical_sum + categorical_sum)
+
+    def distances(self, input_row_dict):
+        """
+        Calculate the mixed distance between an input row and every row of the dataset.
+
+        Args:
+        input_row_dict (dict): Dictionary representing an input row.
+
+        Returns:
+        np.ndarray: Mixed distance of each dataset row to the input row.
+        """
+        return self.batch_distances([input_row_dict])[0]
+
+    def _select_nearest(self, distances, K):
+        """
+        Select the positions of the K smallest distances.
+
+        Ties are broken by row position, exactly like a stable sort over the distances.
+
+        Args:
+        distances (np.ndarray): Distances of each dataset row.
+        K (int): Number of nearest rows to find.
+
+        Returns:
+        np.ndarray: Row positions ordered from nearest to farthest.
+        """
+        if K <= 0:
+            return np.array([], dtype=int)
+        if K >= self.rows:
+            return np.argsort(distances, kind="stable")
+
+        kth_distance = distances[np.argpartition(distances, K - 1)[K - 1]]
+        candidates = np.flatnonzero(distances <= kth_distance)
+        candidates = candidates[np.argsort(distances[candidates], kind="stable")]
+        return candidates[:K]
+
+    def batch_nearest_indices(self, input_rows, K):
+        """
+        Find the positions of the K nearest rows to each of several input rows.
+
+        Input rows are processed in chunks of CHUNK_SIZE to bound the size of the distance matrix.
+
+        Args:
+        input_rows (list): List of dictionaries representing input rows.
+        K (int): Number of nearest rows to find.
+
+        Returns:
+        list: Row positions ordered from nearest to farthest, one array per input row.
+        """
+        nearest = []
+
+        for start in range(0, len(input_rows), self.CHUNK_SIZE):
+            distances = self.batch_distances(input_rows[start:start + self.CHUNK_SIZE])
+            nearest.extend(self._select_nearest(row_distances, K) for row_distances in distances)
+
+        return nearest
+
+    def nearest_indices(self, input_row_dict, K):
+        """
+        Find the positions of the K nearest rows to an input row.
+
+        Args:
+        input_row_dict (dict): Dictionary representing an input row.
+        K (int): Number of nearest rows to find.
+
+        Returns:
+        np.ndarray: Row positions ordered from nearest to farthest.
+        """
+        return self.batch_nearest_indices([input_row_dict], K)[0]
+
+    def get_row(self, position):
+        """
+        Get a dataset row as a dictionary, in the same form DataFrame.iterrows produces.
+
+        Args:
+        position (int): Row position.
+
+        Returns:
+        dict: Dictionary representing the row.
+        """
+        return pd.Series(self._values[position], index=self.columns).to_dict()
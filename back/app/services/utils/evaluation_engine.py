@@ -0,0 +1,148 @@
+import time
+from collections import Counter
+from app.entities.datasets.cassi import Cassi
+from app.entities.datasets.ckd import Ckd
+from app.entities.datasets.disease import Disease
+from app.entities.datasets.maternal import Maternal
+from app.services.utils.dataset_bundle import DatasetBundle
+from app.services.utils.datasets_tools import DatasetsTools
+from app.services.utils.job_queue import JobQueue
+from app.services.utils.mapper import Mapper
+from app.services.utils.tools import split_dataset
+
+class EvaluationEngine:
+    """
+    Offline evaluation of the dataset models on a held-out split of the raw data.
+
+    The whole split is imputed, encoded and predicted as matrices: one batched nearest-row
+    search, one encoding pass and one predict call per model. Evaluations run as background
+    jobs on the evaluation JobQueue.
+    """
+
+    _instance = None
+
+    # Evaluated datasets: dataset class, input columns kept from the split, target column and train ratio,
+    # the models are evaluated on the remaining 1 - ratio of the rows as in the /test-* endpoints
+    EVALUATIONS = {
+        "cass": (Cassi, ['Operative_Procedure', 'Procedure_Count', 'Infections_Reported'], 'SIR', 0.8),
+        "maternal": (Maternal, ['Age', 'SystolicBP', 'BS', 'BodyTemp', 'HeartRate'], 'RiskLevel', 0.8),
+        "ckd": (Ckd, ['age', 'bp', 'bgr'], 'ckd', 0.8),
+        "disease": (Disease, ['Feelings_and_Urge', 'Critical_Feelings', 'Disease'], 'Critical', 0.95),
+    }
+
+    @staticmethod
+    def get_instance():
+        """
+        Get singleton instance of EvaluationEngine.
+
+        Returns:
+        EvaluationEngine: Singleton instance of EvaluationEngine.
+        """
+        if EvaluationEngine._instance is None:
+            EvaluationEngine._instance = EvaluationEngine()
+        return EvaluationEngine._instance
+
+    def __init__(self):
+        """
+        Initialize the engine and its job queue.
+        """
+        self.jobs = JobQueue("evaluation")
+
+    @staticmethod
+    def get_expected_value(dataset, label):
+        """
+        Map a target label of the raw data to the risk value the dataset predictions use.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+        label (str): Target label of a raw row.
+
+        Returns:
+        int or None: Expected risk value, or None if the label is unknown.
+        """
+        if isinstance(dataset, Ckd):
+            return {'ckd': 100, 'notckd': 0}.get(label)
+        if isinstance(dataset, Disease):
+            return {'Critical': 100, 'Not Critical': 0}.get(label)
+        if isinstance(dataset, Cassi):
+            return dataset.processor.get_risk_level_value(f'SIR_{label}')
+        return dataset.processor.get_risk_level_value(f'RiskLevel_{label}')
+
+    def evaluate(self, dataset_name, ratio=None, k=1):
+        """
+        Evaluate every model of a dataset on a random held-out split of its raw data.
+
+        Args:
+        dataset_name (str): Key of the dataset in EVALUATIONS.
+        ratio (float, optional): Train ratio of the split, the models are evaluated on the remaining 1 - ratio
+                                 of the rows. Defaults to the dataset train ratio.
+        k (int, optional): Number of nearest neighbors used to impute the missing values. Defaults to 1.
+
+        Returns:
+        dict: Number of rows, accuracy and confusion counts of each model, and time taken by each stage.
+        """
+        dataset_class, input_columns, target_column, default_ratio = EvaluationEngine.EVALUATIONS[dataset_name]
+        dataset = DatasetBundle.pin(dataset_class())
+        datasets_tools = DatasetsTools.get_instance()
+        timings = {}
+
+        # Split the raw data and build the input rows, the columns left out are imputed
+        start_time = time.perf_counter()
+        test_df = split_dataset(dataset.df_raw, ratio if ratio is not None else default_ratio)
+        feature_columns = [column for column in dataset.df_raw.columns if column != target_column]
+        input_rows = [
+            {column: row[column] if column in input_columns else None for column in feature_columns}
+            for row in test_df[input_columns].to_dict('records')
+        ]
+        expected = [EvaluationEngine.get_expected_value(dataset, label) for label in test_df[target_column]]
+        timings["split"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        nearest_rows = datasets_tools.find_nearest_rows_batch(dataset, input_rows, k)
+        rows_to_predict = [Mapper.fill_empty_values(row, nearest_row) for row, nearest_row in zip(input_rows, nearest_rows)]
+        timings["impute"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        encoded_rows = dataset.preprocess_rows(rows_to_predict)
+        timings["encode"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        predictions = dataset.predict_rows(encoded_rows)
+        timings["predict"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        models = {}
+        for model in dataset.models:
+            model_name = type(model).__name__
+            confusion = Counter((expected_value, prediction[model_name][0]) for expected_value, prediction in zip(expected, predictions))
+            correct = sum(count for (expected_value, predicted_value), count in confusion.items() if expected_value == predicted_value)
+
+            confusion_counts = {}
+            for (expected_value, predicted_value), count in sorted(confusion.items(), key=lambda item: str(item[0])):
+                confusion_counts.setdefault(str(expected_value), {})[str(predicted_value)] = count
+
+            models[model_name] = {
+                "accuracy": correct / len(expected) if expected else 0.0,
+                "confusion": confusion_counts,
+            }
+        timings["score"] = time.perf_counter() - start_time
+
+        return {"dataset": dataset_name, "rows": len(expected), "models": models, "timings": timings}
+
+    def submit(self, dataset_name, ratio=None, k=1):
+        """
+        Queue the evaluation of a dataset as a background job.
+
+        Args:
+        dataset_name (str): Key of the dataset in EVALUATIONS.
+        ratio (float, optional): Train ratio of the split, the models are evaluated on the remaining 1 - ratio
+                                 of the rows. Defaults to the dataset train ratio.
+        k (int, optional): Number of nearest neighbors used to impute the missing values. Defaults to 1.
+
+        Returns:
+        str: Identifier of the evaluation job.
+
+        Raises:
+        JobQueueFull: If too many evaluation jobs are already pending or running.
+        """
+        return self.jobs.submit(f"Evaluate {dataset_name}", self.evaluate, dataset_name, ratio, k)
@@ -0,0 +1,296 @@
+import base64
+import glob
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+
+class ImageStore:
+    """
+    Store of the patient photos and of their generated thumbnails.
+
+    Uploaded photos are written in chunks under the hash of their content, so a photo uploaded
+    twice is stored once. Photos can be downscaled to a maximum dimension when they are stored.
+
+    Photos are served as files, with validators so that clients revalidate them with a 304
+    instead of downloading them again. Thumbnails are generated once per photo version and
+    cached on disk next to the photos, their name holds a hash of the photo size and
+    modification time so a replaced photo gets a new thumbnail. Generating thumbnails requires
+    the Pillow package.
+    """
+
+    _instance = None
+
+    # Photo and thumbnail directories, thumbnail bounding box in pixels, client cache lifetime,
+    # upload chunk and maximum sizes in bytes and bounding box of downscaled photos in pixels
+    CONFIG = {
+        "directory": os.path.join("app", "dal", "images"),
+        "thumbnails": os.path.join("app", "dal", "images", "thumbnails"),
+        "thumbnail_size": 128,
+        "cache_control": "private, max-age=86400",
+        "chunk_size": 1 << 16,
+        "max_upload_size": 10 * 1024 * 1024,
+        "max_dimension": 1024
+    }
+
+    # Accepted photo content types and the extension they are stored with
+    EXTENSIONS = {
+        "image/jpeg": ".jpg",
+        "image/png": ".png",
+        "image/gif": ".gif",
+        "image/webp": ".webp"
+    }
+
+    @staticmethod
+    def get_instance():
+        """
+        Get singleton instance of ImageStore.
+
+        Returns:
+        ImageStore: Singleton instance of ImageStore.
+        """
+        if ImageStore._instance is None:
+            ImageStore._instance = ImageStore()
+        return ImageStore._instance
+
+    def __init__(self):
+        """
+        Initialize the store with no thumbnail being generated.
+        """
+        self._lock = threading.Lock()
+        self._thumbnail_locks = {}
+
+    def get_path(self, file_name):
+        """
+        Get the path of a photo.
+
+        Args:
+        file_name (str): File name of the photo, without any directory.
+
+        Returns:
+        str or None: Path of the photo, or None if the name is not a photo of the store.
+        """
+        if not file_name or os.path.basename(file_name) != file_name or file_name in (".", ".."):
+            return None
+        path = os.path.join(ImageStore.CONFIG["directory"], file_name)
+        return path if os.path.isfile(path) else None
+
+    def save(self, file, content_type="image/jpeg", downscale=False):
+        """
+        Store a photo read in chunks from a file object, under the hash of its content.
+
+        The photo is written to a temporary file while it is hashed, and renamed to its final name
+        unless the same photo is already stored. This method blocks, run it in a worker thread.
+
+        Args:
+        file (file object): Binary file object of the photo, read from its current position.
+        content_type (str, optional): Content type of the photo. Defaults to 'image/jpeg'.
+        downscale (bool, optional): Whether to downscale the photo to the maximum dimension. Defaults to False.
+
+        Returns:
+        str: File name of the stored photo.
+
+        Raises:
+        ValueError: If the content type is not accepted, or the photo is empty or too large.
+        ImportError: If the photo must be downscaled and Pillow is not installed.
+        """
+        extension = ImageStore.EXTENSIONS.get(content_type)
+        if extension is None:
+            raise ValueError(f"Invalid content type. Please choose one of: {', '.join(ImageStore.EXTENSIONS)}.")
+
+        os.makedirs(ImageStore.CONFIG["directory"], exist_ok=True)
+        temporary_path = os.path.join(ImageStore.CONFIG["directory"], f".upload-{uuid.uuid4().hex}.tmp")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(temporary_path, "wb") as temporary_file:
+                for chunk in iter(lambda: file.read(ImageStore.CONFIG["chunk_size"]), b""):
+                    size += len(chunk)
+                    if size > ImageStore.CONFIG["max_upload_size"]:
+                        raise ValueError(f"The photo is larger than {ImageStore.CONFIG['max_upload_size']} bytes.")
+                    digest.update(chunk)
+                    temporary_file.write(chunk)
+            if size == 0:
+                raise ValueError("The photo is empty.")
+
+            # Downscaled photos are named after the uploaded content, so duplicates skip the downscaling too
+            max_dimension = ImageStore.CONFIG["max_dimension"]
+            suffix = f"_{max_dimension}" if downscale else ""
+            file_name = f"{digest.hexdigest()}{suffix}{extension}"
+            path = os.path.join(ImageStore.CONFIG["directory"], file_name)
+            if not os.path.exists(path):
+                if downscale:
+                    ImageStore._downscale(temporary_path, max_dimension)
+                os.replace(temporary_path, path)
+            return file_name
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def save_bytes(self, data, content_type="image/jpeg", downscale=False):
+        """
+        Store a photo held in memory, under the hash of its content.
+
+        Args:
+        data (bytes): Content of the photo.
+        content_type (str, optional): Content type of the photo. Defaults to 'image/jpeg'.
+        downscale (bool, optional): Whether to downscale the photo to the maximum dimension. Defaults to False.
+
+        Returns:
+        str: File name of the stored photo.
+        """
+        return self.save(io.BytesIO(data), content_type, downscale)
+
+    @staticmethod
+    def _downscale(path, max_dimension):
+        """
+        Downscale a photo in place to fit a max_dimension by max_dimension box, keeping its format.
+
+        Args:
+        path (str): Path of the photo.
+        max_dimension (int): Bounding box of the photo in pixels.
+
+        Raises:
+        ImportError: If Pillow is not installed.
+        """
+        try:
+            from PIL import Image
+        except ImportError as e:
+            raise ImportError("Downscaling photos requires the Pillow package.") from e
+
+        with Image.open(path) as image:
+            if max(image.size) <= max_dimension:
+                return
+            image_format = image.format
+            image.thumbnail((max_dimension, max_dimension))
+            if image_format == "JPEG":
+                image = image.convert("RGB")
+        image.save(path, format=image_format)  # The photo is closed before it is overwritten
+
+    @staticmethod
+    def get_validators(path):
+        """
+        Get the validators of a file, used by clients to revalidate their cached copy.
+
+        Args:
+        path (str): Path of the file.
+
+        Returns:
+        tuple: ETag and Last-Modified header values, and the stat result of the file.
+        """
+        stat_result = os.stat(path)
+        version = f"{stat_result.st_mtime_ns}-{stat_result.st_size}"
+        etag = f'"{hashlib.md5(version.encode("utf-8"), usedforsecurity=False).hexdigest()}"'
+        return etag, formatdate(stat_result.st_mtime, usegmt=True), stat_result
+
+    @staticmethod
+    def is_not_modified(headers, etag, last_modified):
+        """
+        Check whether the cached copy of a client is still current.
+
+        Args:
+        headers (Mapping): Request headers.
+        etag (str): Current ETag of the file.
+        last_modified (str): Current Last-Modified value of the file.
+
+        Returns:
+        bool: True if a 304 Not Modified response can be sent.
+        """
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def get_thumbnail_path(self, file_name):
+        """
+        Get the path of the thumbnail of a photo, generating it when the photo has no current thumbnail.
+
+        Args:
+        file_name (str): File name of the photo, without any directory.
+
+        Returns:
+        str or None: Path of the thumbnail, or None if the name is not a photo of the store.
+
+        Raises:
+        ImportError: If the thumbnail must be generated and Pillow is not installed.
+        OSError: If the thumbnail must be generated and Pillow cannot read the photo.
+        """
+        path = self.get_path(file_name)
+        if path is None:
+            return None
+
+        size = ImageStore.CONFIG["thumbnail_size"]
+        stat_result = os.stat(path)
+        version = hashlib.md5(f"{stat_result.st_mtime_ns}-{stat_result.st_size}".encode("utf-8"), usedforsecurity=False).hexdigest()[:12]
+        stem = os.path.splitext(file_name)[0]
+        thumbnail_path = os.path.join(ImageStore.CONFIG["thumbnails"], f"{stem}_{size}_{version}.jpg")
+        if os.path.exists(thumbnail_path):
+            return thumbnail_path
+
+        # Concurrent requests for the same thumbnail generate it once
+        with self._lock:
+            lock = self._thumbnail_locks.setdefault(thumbnail_path, threading.Lock())
+        with lock:
+            if not os.path.exists(thumbnail_path):
+                self._generate_thumbnail(path, thumbnail_path, size)
+                for stale_path in glob.glob(os.path.join(glob.escape(ImageStore.CONFIG["thumbnails"]), f"{glob.escape(stem)}_{size}_*.jpg")):
+                    if stale_path != thumbnail_path:
+                        os.remove(stale_path)
+        with self._lock:
+            self._thumbnail_locks.pop(thumbnail_path, None)
+        return thumbnail_path
+
+    @staticmethod
+    def _generate_thumbnail(path, thumbnail_path, size):
+        """
+        Write the thumbnail of a photo, keeping its aspect ratio within a size by size box.
+
+        Args:
+        path (str): Path of the photo.
+        thumbnail_path (str): Path of the thumbnail to write.
+        size (int): Bounding box of the thumbnail in pixels.
+
+        Raises:
+        ImportError: If Pillow is not installed.
+        """
+        try:
+            from PIL import Image
+        except ImportError as e:
+            raise ImportError("Thumbnails require the Pillow package.") from e
+
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(thumbnail_path), suffix=".tmp")
+        os.close(descriptor)
+        try:
+            with Image.open(path) as image:
+                image.thumbnail((size, size))
+                image.convert("RGB").save(temporary_path, format="JPEG", quality=85)
+        except Exception:
+            os.remove(temporary_path)
+            raise
+        os.replace(temporary_path, thumbnail_path)  # Readers never see a partially written thumbnail
+
+    @staticmethod
+    def load_base64(path):
+        """
+        Read a file as a base64 string.
+
+        Args:
+        path (str): Path of the file.
+
+        Returns:
+        str: Base64 content of the file.
+        """
+        with open(path, "rb") as file:
+            return base64.b64encode(file.read()).decode("utf-8")
@@ -0,0 +1,351 @@
+import atexit
+import multiprocessing
+import os
+import pickle
+import shutil
+import signal
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from app.services.utils.dataset_bundle import DatasetBundle
+from app.services.utils.datasets_tools import DatasetsTools
+from app.services.utils.instrumentation import Instrumentation
+
+class InferencePoolFull(Exception):
+    """
+    Raised when a risk assessment cannot be queued because the inference pool already holds max_pending of them.
+    """
+
+def _initialize_worker(path, niceness):
+    """
+    Prepare an inference worker by installing the dataset generation published by the API process.
+
+    Interrupts are left to the API process, which shuts the workers down, and the worker runs at a
+    lower priority so the API process is scheduled first when the cores are busy.
+
+    Args:
+    path (str): Path of the published generation, as written by InferencePool._publish.
+    niceness (int): Niceness added to the scheduling priority of the worker.
+    """
+    from app.services.dataset_ops.dataset_operation_service import DatasetOperationService
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+    with open(path, 'rb') as file:
+        published = pickle.load(file)
+    DatasetOperationService.CONFIG.update(published["dataset_operations"])
+    Instrumentation.CONFIG.update(published["instrumentation"])
+    for dataset in DatasetsTools.get_instance().get_datasets_instances():
+        dataset.__dict__ = published["datasets"][type(dataset).__name__]
+
+def _ping():
+    """
+    Empty task used to start the worker processes.
+
+    Returns:
+    int: Process id of the worker.
+    """
+    return os.getpid()
+
+def _run_task(method, args):
+    """
+    Run a DatasetOperationService method in an inference worker.
+
+    Args:
+    method (str): Name of the DatasetOperationService method.
+    args (tuple): Positional arguments of the method.
+
+    Returns:
+    tuple: Result of the method and the histograms recorded while it ran, to merge in the API process.
+    """
+    from app.services.dataset_ops.dataset_operation_service import DatasetOperationService
+
+    instrumentation = Instrumentation.get_instance()
+    instrumentation.reset()  # A worker runs one task at a time, so the histograms only hold this task
+    result = getattr(DatasetOperationService, method)(*args)
+    return result, instrumentation.export()
+
+class InferencePool:
+    """
+    Pool of worker processes running the risk assessments outside of the API process.
+
+    The nearest neighbors search and the model predictions are CPU bound and hold the interpreter
+    lock, so running them in the API process slows down every other endpoint it serves. When the
+    pool starts, and again when a preprocess or process run publishes a new generation, the API
+    process pickles the current generation of the dataset singletons to a file and starts new
+    workers loading it. Assessments already queued finish on the previous workers.
+
+    The workers are started from a fork server, or spawned where it is not available, never
+    forked from the API process: its server, scoring and refresh threads may hold locks, or
+    OpenMP and BLAS state, that a forked child would never get back. If the generation cannot
+    be pickled, such as a Birch model trained on a very large dataset, the pool is unavailable
+    until the next generation and the risk assessments run in the API process.
+
+    At most max_pending assessments are queued or running at once, further ones are rejected
+    with InferencePoolFull right away instead of piling up, so callers can answer with a retry
+    later response while the pool catches up. The histograms recorded in the workers are merged
+    into the Instrumentation of the API process when each result comes back. Each gateway worker
+    process has its own pool.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    # Pool switch, number of worker processes, assessments queued or running at once, seconds a caller
+    # waits for the result of a queued assessment and niceness added to the workers' scheduling priority
+    CONFIG = {
+        "enabled": True,
+        "workers": 2,
+        "max_pending": 32,
+        "timeout": 120,
+        "niceness": 10
+    }
+
+    @staticmethod
+    def get_instance():
+        """
+        Get singleton instance of InferencePool, a new one in a forked process.
+
+        Returns:
+        InferencePool: Singleton instance of InferencePool.
+        """
+        if InferencePool._instance is None or InferencePool._instance.pid != os.getpid():
+            with InferencePool._lock:
+                if InferencePool._instance is None or InferencePool._instance.pid != os.getpid():
+                    InferencePool._instance = InferencePool()
+        return InferencePool._instance
+
+    def __init__(self):
+        """
+        Initialize the pool, the worker processes are started by start or by the first submitted task.
+        """
+        self.pid = os.getpid()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._available = True
+        self._directory = None
+        self._published = []
+        self._slots = threading.BoundedSemaphore(InferencePool.CONFIG["max_pending"])
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "pending": 0, "restarts": 0}
+
+    @property
+    def enabled(self):
+        """
+        Whether the risk assessments run in the worker processes.
+
+        Returns:
+        bool: True if the pool is enabled, has workers and the current generation could be published to them.
+        """
+        return InferencePool.CONFIG["enabled"] and InferencePool.CONFIG["workers"] > 0 and self._available
+
+    def _publish(self):
+        """
+        Write the current generation of the dataset singletons for the workers to load.
+
+        The files of the two latest generations are kept, workers of the previous executor may still be loading theirs.
+
+        Returns:
+        str: Path of the published generation, None if it could not be pickled.
+        """
+        from app.services.dataset_ops.dataset_operation_service import DatasetOperationService
+
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="inference-pool-")
+            atexit.register(shutil.rmtree, self._directory, True)
+
+        published = {
+            "datasets": {type(dataset).__name__: DatasetBundle.pin(dataset).__dict__
+                         for dataset in DatasetsTools.get_instance().get_datasets_instances()},
+            "dataset_operations": dict(DatasetOperationService.CONFIG),
+            "instrumentation": dict(Instrumentation.CONFIG)
+        }
+        descriptor, path = tempfile.mkstemp(dir=self._directory, suffix=".pkl")
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                pickle.dump(published, file, protocol=pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError) as e:
+            print(f"Error publishing the datasets to the inference workers: {e}")
+            os.remove(path)
+            return None
+
+        self._published.append(path)
+        while len(self._published) > 2:
+            os.remove(self._published.pop(0))
+        return path
+
+    def _create_executor(self):
+        """
+        Publish the current generation of the dataset singletons and start workers loading it.
+
+        Returns:
+        ProcessPoolExecutor: Executor of the new workers, None if the generation could not be published.
+        """
+        path = self._publish()
+        if path is None:
+            return None
+
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(["app.services.dataset_ops.dataset_operation_service"])  # Imported once
+        else:
+            context = multiprocessing.get_context("spawn")
+        workers = InferencePool.CONFIG["workers"]
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_initialize_worker,
+                                       initargs=(path, InferencePool.CONFIG["niceness"]))
+        wait([executor.submit(_ping) for _ in range(workers)])  # Start every worker before it gets requests
+        return executor
+
+    def start(self):
+        """
+        Start the worker processes if they are not running yet.
+
+        Returns:
+        ProcessPoolExecutor: Executor of the workers, None if the pool is unavailable.
+        """
+        with self._executor_lock:
+            if self._executor is None and self._available:
+                self._executor = self._create_executor()
+                self._available = self._executor is not None
+            return self._executor
+
+    def restart(self):
+        """
+        Replace the running workers by new ones loading the current generation of the dataset singletons.
+
+        Called after a new generation of the datasets is published. The previous workers finish
+        the assessments already queued and exit. If the workers were not started, or the pool was
+        unavailable, the next task starts them.
+        """
+        with self._executor_lock:
+            previous = self._executor
+            if previous is None:
+                self._available = True
+                return
+            self._executor = self._create_executor()
+            self._available = self._executor is not None
+        with self._stats_lock:
+            self._stats["restarts"] += 1
+        previous.shutdown(wait=False)
+
+    def _discard(self, executor):
+        """
+        Drop a broken executor, after one of its workers died, so the next task starts new workers.
+
+        Args:
+        executor (ProcessPoolExecutor): Broken executor, None if the workers could not be started.
+        """
+        if executor is None:
+            return
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def submit(self, method, *args):
+        """
+        Queue a DatasetOperationService method to run in a worker process.
+
+        Args:
+        method (str): Name of the DatasetOperationService method, such as calculate_risk_assessment.
+        *args: Positional arguments of the method, sent to the worker.
+
+        Returns:
+        Future: Future of the result of the method.
+
+        Raises:
+        InferencePoolFull: If max_pending assessments are already queued or running.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._stats["rejected"] += 1
+            raise InferencePoolFull(f"{InferencePool.CONFIG['max_pending']} risk assessments are already pending")
+
+        result = Future()
+        result.set_running_or_notify_cancel()  # Callers giving up on the result do not stop the worker
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+            self._stats["pending"] += 1
+
+        def done(task, executor):
+            """
+            Release the slot of a finished task and resolve its result in the API process.
+
+            Args:
+            task (Future): Future of the task in the worker.
+            executor (ProcessPoolExecutor): Executor the task ran on.
+            """
+            self._slots.release()
+            error = task.exception()
+            with self._stats_lock:
+                self._stats["pending"] -= 1
+                self._stats["failed" if error else "completed"] += 1
+            if error is not None:
+                if isinstance(error, BrokenProcessPool):
+                    self._discard(executor)
+                result.set_exception(error)
+                return
+            value, histograms = task.result()
+            Instrumentation.get_instance().merge(histograms)
+            result.set_result(value)
+
+        executor = None
+        try:
+            executor = self.start()
+            if executor is None:
+                raise RuntimeError("The inference pool is unavailable")
+            task = executor.submit(_run_task, method, args)
+        except Exception as e:
+            task = Future()
+            task.set_exception(e)
+            done(task, executor)
+            return result
+        task.add_done_callback(lambda task: done(task, executor))
+        return result
+
+    def run(self, method, *args):
+        """
+        Run a DatasetOperationService method in a worker process and wait for its result.
+
+        Args:
+        method (str): Name of the DatasetOperationService method.
+        *args: Positional arguments of the method.
+
+        Returns:
+        object: Result of the method.
+
+        Raises:
+        InferencePoolFull: If max_pending assessments are already queued or running.
+        TimeoutError: If the result did not come back within the configured timeout.
+        """
+        return self.submit(method, *args).result(timeout=InferencePool.CONFIG["timeout"])
+
+    def get_stats(self):
+        """
+        Get the counters of the pool.
+
+        Returns:
+        dict: Configuration, whether the workers are running, and the submitted, completed, failed,
+              rejected and pending tasks and the number of restarts.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {
+            "enabled": self.enabled,
+            "running": self._executor is not None,
+            "workers": InferencePool.CONFIG["workers"],
+            "max_pending": InferencePool.CONFIG["max_pending"],
+            **stats
+        }
+
+    def shutdown(self):
+        """
+        Stop the worker processes once their queued tasks are done.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,355 @@
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from fastapi.responses import Response
+
+class Histogram:
+    """
+    Latency histogram with fixed bucket upper bounds, as exposed by Prometheus.
+
+    Attributes:
+    buckets (tuple): Sorted upper bounds of the buckets in seconds, the last bucket is +Inf.
+    counts (list): Number of observations in each bucket, not cumulated.
+    sum (float): Sum of the observations.
+    count (int): Number of observations.
+    """
+
+    def __init__(self, buckets):
+        """
+        Initialize an empty histogram.
+
+        Args:
+        buckets (tuple): Sorted upper bounds of the buckets in seconds.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """
+        Record an observation.
+
+        Args:
+        value (float): Observed duration in seconds.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        """
+        Get a consistent copy of the histogram counters.
+
+        Returns:
+        tuple: Cumulative count of each bucket including +Inf, sum and count of the observations.
+        """
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, running = [], 0
+        for bucket_count in counts:
+            running += bucket_count
+            cumulative.append(running)
+        return cumulative, total, count
+
+    def merge(self, counts, total, count):
+        """
+        Add the counters of a histogram with the same buckets recorded elsewhere.
+
+        Args:
+        counts (list): Number of observations in each bucket, not cumulated.
+        total (float): Sum of the observations.
+        count (int): Number of observations.
+        """
+        with self._lock:
+            self.counts = [current + added for current, added in zip(self.counts, counts)]
+            self.sum += total
+            self.count += count
+
+class Instrumentation:
+    """
+    Registry of the latency histograms of the services, exposed in the Prometheus text format.
+
+    Recording an observation costs a bucket bisection and an uncontended lock, the text is only
+    built when /metrics is scraped. Endpoint latencies are recorded by InstrumentationMiddleware,
+    the stages of the risk assessments and the predictions of each model by the services.
+    Histograms are kept per process. The workers of a prefork gateway share them through files
+    of a common directory, see share, so that each worker exposes the histograms of all of them.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    # Recording switch, bucket upper bounds in seconds and seconds between two writes of the shared histograms
+    CONFIG = {
+        "enabled": True,
+        "buckets": (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+        "share_interval": 1.0
+    }
+
+    # Recorded histograms and their description
+    METRICS = {
+        "http_request_duration_seconds": "Latency of the HTTP requests by service, method, route and status.",
+        "risk_assessment_stage_duration_seconds": "Latency of the stages of the risk assessments by dataset and stage.",
+        "model_predict_duration_seconds": "Latency of the predictions of each model by dataset and model."
+    }
+
+    @staticmethod
+    def get_instance():
+        """
+        Get singleton instance of Instrumentation.
+
+        Returns:
+        Instrumentation: Singleton instance of Instrumentation.
+        """
+        if Instrumentation._instance is None:
+            with Instrumentation._lock:
+                if Instrumentation._instance is None:
+                    Instrumentation._instance = Instrumentation()
+        return Instrumentation._instance
+
+    def __init__(self):
+        """
+        Initialize an empty registry.
+        """
+        self._histograms = {name: {} for name in Instrumentation.METRICS}
+        self._lock = threading.Lock()
+        self._shared_directory = None
+
+    def observe(self, name, seconds, **labels):
+        """
+        Record a duration in a histogram.
+
+        Args:
+        name (str): Name of the histogram, a key of METRICS.
+        seconds (float): Observed duration in seconds.
+        **labels: Label values of the observation, always given in the same order for a histogram.
+        """
+        if not Instrumentation.CONFIG["enabled"]:
+            return
+
+        key = tuple(labels.items())
+        histograms = self._histograms[name]
+        histogram = histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = histograms.setdefault(key, Histogram(Instrumentation.CONFIG["buckets"]))
+        histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, name, **labels):
+        """
+        Context manager recording the duration of its block in a histogram.
+
+        Args:
+        name (str): Name of the histogram, a key of METRICS.
+        **labels: Label values of the observation.
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    @staticmethod
+    def _format_labels(labels, extra=()):
+        """
+        Format label values for the Prometheus text format.
+
+        Args:
+        labels (tuple): Label names and values.
+        extra (tuple, optional): Additional label names and values. Defaults to ().
+
+        Returns:
+        str: Labels between braces, or an empty string if there are none.
+        """
+        pairs = []
+        for label, value in tuple(labels) + tuple(extra):
+            value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+            pairs.append(f'{label}="{value}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def share(self, directory):
+        """
+        Share the histograms of this process with the other processes serving the same application.
+
+        The histograms are written every share_interval seconds to a file of the directory named
+        after the process id, and render adds the files of the other processes to the histograms of
+        this one. The files of exited processes are kept, so the counters never go backwards when a
+        worker is replaced.
+
+        Args:
+        directory (str): Directory shared by the processes, created before they are forked.
+        """
+        self._shared_directory = directory
+        thread = threading.Thread(target=self._write_shared, name="instrumentation-share", daemon=True)
+        thread.start()
+
+    def _write_shared(self):
+        """
+        Write the histograms of this process to the shared directory, every share_interval seconds.
+        """
+        path = os.path.join(self._shared_directory, f"{os.getpid()}.json")
+        while True:
+            time.sleep(Instrumentation.CONFIG["share_interval"])
+            descriptor, temporary_path = tempfile.mkstemp(dir=self._shared_directory, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "w") as file:
+                    json.dump(self.export(), file)
+                os.replace(temporary_path, path)  # Readers never see a partially written file
+            except OSError as e:
+                print(f"Error: {e}")
+
+    def _gather(self):
+        """
+        Combine the histograms of this process with the ones written by the other processes.
+
+        Returns:
+        Instrumentation: Registry holding the histograms of every process.
+        """
+        registry = Instrumentation()
+        registry.merge(self.export())
+        own = f"{os.getpid()}.json"
+        for file_name in os.listdir(self._shared_directory):
+            if not file_name.endswith(".json") or file_name == own:
+                continue
+            try:
+                with open(os.path.join(self._shared_directory, file_name)) as file:
+                    exported = json.load(file)
+            except (OSError, ValueError):
+                continue
+            registry.merge([(name, tuple(tuple(pair) for pair in labels), counts, total, count)
+                            for name, labels, counts, total, count in exported])
+        return registry
+
+    def render(self):
+        """
+        Render every histogram in the Prometheus text exposition format.
+
+        Returns:
+        str: Text of the histograms, of every process sharing them when share was called.
+        """
+        registry = self._gather() if self._shared_directory else self
+        lines = []
+        for name, description in Instrumentation.METRICS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} histogram")
+            with registry._lock:
+                histograms = list(registry._histograms[name].items())
+            for labels, histogram in histograms:
+                cumulative, total, count = histogram.snapshot()
+                bounds = [repr(float(bound)) for bound in histogram.buckets] + ["+Inf"]
+                for bound, bucket_count in zip(bounds, cumulative):
+                    lines.append(f"{name}_bucket{Instrumentation._format_labels(labels, (('le', bound),))} {bucket_count}")
+                lines.append(f"{name}_sum{Instrumentation._format_labels(labels)} {total}")
+                lines.append(f"{name}_count{Instrumentation._format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def add_metrics_route(app):
+        """
+        Add the /metrics endpoint of a service to its FastAPI application.
+
+        Args:
+        app (FastAPI): Application of the service.
+        """
+        def metrics():
+            """
+            Metrics endpoint exposing the latency histograms of the service in the Prometheus text format.
+
+            Returns:
+            Response: Histograms of the endpoints, of the risk assessment stages and of the model predictions.
+            """
+            return Response(Instrumentation.get_instance().render(), media_type=Instrumentation.CONTENT_TYPE)
+
+        app.add_api_route("/metrics", metrics, methods=["GET"], tags=["Health Check"], summary="Metrics")
+
+    def export(self):
+        """
+        Export the counters of every histogram, to merge them into the registry of another process.
+
+        Returns:
+        list: Name, labels, bucket counts not cumulated, sum and count of each histogram.
+        """
+        exported = []
+        with self._lock:
+            histograms = [(name, labels, histogram) for name, by_labels in self._histograms.items()
+                          for labels, histogram in by_labels.items()]
+        for name, labels, histogram in histograms:
+            with histogram._lock:
+                exported.append((name, labels, list(histogram.counts), histogram.sum, histogram.count))
+        return exported
+
+    def merge(self, exported):
+        """
+        Add histograms exported by another process, such as the inference workers, to the registry.
+
+        Args:
+        exported (list): Histograms as returned by export.
+        """
+        for name, labels, counts, total, count in exported:
+            histograms = self._histograms[name]
+            histogram = histograms.get(labels)
+            if histogram is None:
+                with self._lock:
+                    histogram = histograms.setdefault(labels, Histogram(Instrumentation.CONFIG["buckets"]))
+            histogram.merge(counts, total, count)
+
+    def reset(self):
+        """
+        Remove every recorded observation.
+        """
+        with self._lock:
+            self._histograms = {name: {} for name in Instrumentation.METRICS}
+
+class InstrumentationMiddleware:
+    """
+    ASGI middleware recording the latency of each HTTP request of a service.
+
+    Requests are labelled with the route template rather than the requested path, so that path
+    parameters do not create a histogram per value. Streaming responses are timed until their
+    last chunk is sent.
+    """
+
+    def __init__(self, app, service):
+        """
+        Wrap an ASGI application.
+
+        Args:
+        app: ASGI application.
+        service (str): Name of the service, used as the service label.
+        """
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start_time = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            Instrumentation.get_instance().observe(
+                "http_request_duration_seconds", time.perf_counter() - start_time,
+                service=self.service, method=scope["method"],
+                route=getattr(route, "path", "unmatched"), status=str(status))
@@ -0,0 +1,287 @@
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+class JobCancelled(Exception):
+    """
+    Raised inside a cancellable job to stop it once its cancellation was requested.
+    """
+
+class JobQueueFull(Exception):
+    """
+    Raised when a job cannot be queued because the queue already holds max_pending unfinished jobs.
+    """
+
+class JobContext:
+    """
+    Handle given to a cancellable job to report its progress and check whether it was cancelled.
+
+    Attributes:
+    job_id (str): Identifier of the job.
+    """
+
+    def __init__(self, queue, job):
+        """
+        Initialize the handle of a job.
+
+        Args:
+        queue (JobQueue): Queue running the job.
+        job (dict): Job record.
+        """
+        self.job_id = job["id"]
+        self._queue = queue
+        self._job = job
+
+    def report(self, **progress):
+        """
+        Update the progress of the job, the given fields replace the previous values.
+
+        Args:
+        **progress: Progress fields, such as the current stage and the steps done and total.
+        """
+        with self._queue._lock:
+            self._job["progress"] = {**(self._job["progress"] or {}), **progress}
+
+    @property
+    def cancelled(self):
+        """
+        Whether the cancellation of the job was requested.
+
+        Returns:
+        bool: True if the job should stop.
+        """
+        return self._job["cancel_requested"]
+
+    def check_cancelled(self):
+        """
+        Stop the job if its cancellation was requested.
+
+        Raises:
+        JobCancelled: If the cancellation of the job was requested.
+        """
+        if self.cancelled:
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+class JobQueue:
+    """
+    In-process queue running long operations as background jobs.
+
+    Jobs run on a bounded thread pool and their status, result or error is kept so that clients
+    can poll them instead of blocking a request while the operation runs. At most max_pending
+    jobs are pending or running at once, further submissions are rejected with JobQueueFull.
+    Finished jobs are kept until the registry holds more than max_jobs jobs, the oldest finished
+    ones are then forgotten. Unfinished jobs are never forgotten, they can always be polled and
+    cancelled.
+
+    Jobs submitted with submit_cancellable receive a JobContext to report their progress and to
+    check for cancellation at their own checkpoints. A pending job is cancelled right away, a
+    running one when it reaches its next checkpoint.
+
+    Attributes:
+    name (str): Name of the queue, used as the prefix of its worker threads.
+    max_jobs (int): Maximum number of jobs kept in the registry.
+    max_pending (int): Maximum number of jobs pending or running at once.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    # Statuses of the jobs that will not change anymore
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+    def __init__(self, name, max_workers=1, max_jobs=100, max_pending=10):
+        """
+        Initialize an empty job queue.
+
+        Args:
+        name (str): Name of the queue, used as the prefix of its worker threads.
+        max_workers (int, optional): Number of jobs running at the same time. Defaults to 1.
+        max_jobs (int, optional): Maximum number of jobs kept in the registry. Defaults to 100.
+        max_pending (int, optional): Maximum number of jobs pending or running at once. Defaults to 10.
+        """
+        self.name = name
+        self.max_jobs = max_jobs
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, description, function, *args, **kwargs):
+        """
+        Queue a function call as a background job.
+
+        Args:
+        description (str): Human readable description of the job.
+        function (callable): Function to run.
+        *args: Positional arguments of the function.
+        **kwargs: Keyword arguments of the function.
+
+        Returns:
+        str: Identifier of the job.
+
+        Raises:
+        JobQueueFull: If max_pending jobs are already pending or running.
+        """
+        return self._submit(description, function, args, kwargs, False)
+
+    def submit_cancellable(self, description, function, *args, **kwargs):
+        """
+        Queue a function call as a background job reporting its progress and supporting cancellation.
+
+        Args:
+        description (str): Human readable description of the job.
+        function (callable): Function to run, called with the JobContext of the job before its arguments.
+        *args: Positional arguments of the function.
+        **kwargs: Keyword arguments of the function.
+
+        Returns:
+        str: Identifier of the job.
+
+        Raises:
+        JobQueueFull: If max_pending jobs are already pending or running.
+        """
+        return self._submit(description, function, args, kwargs, True)
+
+    def _submit(self, description, function, args, kwargs, with_context):
+        """
+        Register a job and queue it on the thread pool.
+
+        Args:
+        description (str): Human readable description of the job.
+        function (callable): Function to run.
+        args (tuple): Positional arguments of the function.
+        kwargs (dict): Keyword arguments of the function.
+        with_context (bool): Whether the function receives the JobContext of the job.
+
+        Returns:
+        str: Identifier of the job.
+
+        Raises:
+        JobQueueFull: If max_pending jobs are already pending or running.
+        """
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "description": description,
+            "status": JobQueue.PENDING,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "progress": None,
+            "cancel_requested": False,
+            "result": None,
+            "error": None,
+        }
+
+        with self._lock:
+            unfinished = sum(1 for queued in self._jobs.values() if queued["status"] not in JobQueue.FINISHED)
+            if unfinished >= self.max_pending:
+                raise JobQueueFull(f"{unfinished} {self.name} jobs are already pending or running")
+            self._jobs[job_id] = job
+            # Forget the oldest finished jobs, unfinished ones must stay reachable to be polled and cancelled
+            finished = [queued_id for queued_id, queued in self._jobs.items() if queued["status"] in JobQueue.FINISHED]
+            for queued_id in finished[:max(0, len(self._jobs) - self.max_jobs)]:
+                del self._jobs[queued_id]
+
+        if with_context:
+            args = (JobContext(self, job),) + tuple(args)
+        self._executor.submit(self._run, job, function, args, kwargs)
+        return job_id
+
+    def _run(self, job, function, args, kwargs):
+        """
+        Run a job and record its outcome.
+
+        Args:
+        job (dict): Job record.
+        function (callable): Function to run.
+        args (tuple): Positional arguments of the function.
+        kwargs (dict): Keyword arguments of the function.
+        """
+        with self._lock:
+            if job["status"] == JobQueue.CANCELLED:
+                return
+            job["status"] = JobQueue.RUNNING
+            job["started_at"] = time.time()
+
+        try:
+            result = function(*args, **kwargs)
+        except JobCancelled:
+            self._finish(job, JobQueue.CANCELLED)
+            return
+        except Exception as e:
+            traceback.print_exc()
+            self._finish(job, JobQueue.FAILED, error=str(e))
+            return
+
+        self._finish(job, JobQueue.DONE, result=result)
+
+    def _finish(self, job, status, result=None, error=None):
+        """
+        Record the outcome of a job.
+
+        Args:
+        job (dict): Job record.
+        status (str): Final status of the job.
+        result (optional): Result of the job. Defaults to None.
+        error (str, optional): Error of the job. Defaults to None.
+        """
+        with self._lock:
+            job["status"] = status
+            job["result"] = result
+            job["error"] = error
+            job["finished_at"] = time.time()
+
+    def cancel(self, job_id):
+        """
+        Request the cancellation of a job.
+
+        A pending job is cancelled right away. A running job is cancelled at its next checkpoint if
+        it was submitted with submit_cancellable, other running jobs run to completion.
+
+        Args:
+        job_id (str): Identifier of the job.
+
+        Returns:
+        dict or None: Copy of the job record, or None if the job is unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] not in JobQueue.FINISHED:
+                job["cancel_requested"] = True
+                if job["status"] == JobQueue.PENDING:
+                    job["status"] = JobQueue.CANCELLED
+                    job["finished_at"] = time.time()
+            return dict(job)
+
+    def get(self, job_id):
+        """
+        Get a job record.
+
+        Args:
+        job_id (str): Identifier of the job.
+
+        Returns:
+        dict or None: Copy of the job record, or None if the job is unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def list(self):
+        """
+        Get the records of every kept job, oldest first, without their results.
+
+        Returns:
+        list: Copies of the job records.
+        """
+        with self._lock:
+            return [{key: value for key, value in job.items() if key != "result"} for job in self._jobs.values()]
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import sklearn
+from app.entities.configs.datasets import Datasets
+
+class ModelSnapshotStore:
+    """
+    Store of trained model snapshots, used to skip training on startup when nothing has changed.
+
+    Each dataset snapshot holds its trained models and metrics, the training feature columns and
+    the min-max values and frequencies of the raw data. It is keyed by a hash of the raw CSV
+    content, the hyperparameters of the models and the scikit-learn version, so any change to
+    them makes the snapshot stale and the dataset is trained again.
+    """
+
+    _instance = None
+
+    # Increase when the snapshot content changes, to discard the snapshots written by older versions
+    SNAPSHOT_VERSION = 2  # 2: models fitted on feature matrices instead of DataFrames
+
+    @staticmethod
+    def get_instance():
+        """
+        Get singleton instance of ModelSnapshotStore.
+
+        Returns:
+        ModelSnapshotStore: Singleton instance of ModelSnapshotStore.
+        """
+        if ModelSnapshotStore._instance is None:
+            ModelSnapshotStore._instance = ModelSnapshotStore(Datasets.snapshots)
+        return ModelSnapshotStore._instance
+
+    def __init__(self, directory):
+        """
+        Initialize the store.
+
+        Args:
+        directory (str): Directory where the snapshots are written.
+        """
+        self.directory = directory
+
+    @staticmethod
+    def get_file_hash(path, chunk_size=1 << 20):
+        """
+        Calculate the SHA-256 hash of a file content.
+
+        Args:
+        path (str): Path of the file.
+        chunk_size (int, optional): Bytes read at a time. Defaults to 1 MiB.
+
+        Returns:
+        str: Hexadecimal hash of the file content.
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_hyperparameters(models):
+        """
+        Get a stable description of the hyperparameters of a list of models.
+
+        Args:
+        models (list): Model instances of a dataset.
+
+        Returns:
+        list: Model class name and sorted estimator parameters of each model.
+        """
+        hyperparameters = []
+        for model in models:
+            estimator = getattr(model, 'model', None)
+            params = estimator.get_params() if hasattr(estimator, 'get_params') else {}
+            hyperparameters.append((type(model).__name__, sorted((key, repr(value)) for key, value in params.items())))
+        return hyperparameters
+
+    def get_key(self, dataset):
+        """
+        Calculate the snapshot key of a dataset.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+
+        Returns:
+        str: Hexadecimal key of the raw data and model configuration of the dataset.
+        """
+        digest = hashlib.sha256()
+        digest.update(repr((
+            ModelSnapshotStore.SNAPSHOT_VERSION,
+            type(dataset).__name__,
+            ModelSnapshotStore.get_file_hash(dataset.path),
+            ModelSnapshotStore.get_hyperparameters(dataset.models),
+            sklearn.__version__,
+        )).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_path(self, dataset):
+        """
+        Get the snapshot file path of a dataset.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+
+        Returns:
+        str: Path of the dataset snapshot file.
+        """
+        return os.path.join(self.directory, f'{type(dataset).__name__.lower()}.pkl')
+
+    def save(self, dataset):
+        """
+        Write the snapshot of a preprocessed and trained dataset.
+
+        A snapshot that cannot be written is reported and skipped, the dataset is then trained again
+        on the next startup. Some models cannot be pickled once trained on large datasets, such as a
+        Birch tree whose linked leaves exceed the recursion limit.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+
+        Returns:
+        bool: True if the snapshot was written.
+        """
+        snapshot = {
+            'key': self.get_key(dataset),
+            'columns': list(dataset.X_train.columns),
+            'models': dataset.models,
+            'metrics': dataset.metrics,
+            'min_max': dataset.min_max,
+            'frequencies': dataset.frequencies,
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.get_path(dataset)
+        # A unique temporary file, gateway workers may save the same snapshot at the same time
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError) as e:
+            print(f"Error saving snapshot of {type(dataset).__name__}: {e}")
+            os.remove(temporary_path)
+            return False
+        os.replace(temporary_path, path)  # Readers never see a partially written snapshot
+        return True
+
+    def load(self, dataset):
+        """
+        Install the snapshot of a preprocessed dataset if it is up to date.
+
+        The dataset must be preprocessed, its training columns are checked against the snapshot.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+
+        Returns:
+        bool: True if the snapshot was installed, False if it is missing, stale or unreadable.
+        """
+        path = self.get_path(dataset)
+        if not os.path.exists(path):
+            return False
+
+        try:
+            with open(path, 'rb') as file:
+                snapshot = pickle.load(file)
+        except Exception:
+            return False
+
+        if snapshot.get('key') != self.get_key(dataset) or snapshot.get('columns') != list(dataset.X_train.columns):
+            return False
+
+        dataset.models = snapshot['models']
+        dataset.metrics = snapshot['metrics']
+        dataset.min_max = snapshot['min_max']
+        dataset.frequencies = snapshot['frequencies']
+        dataset.dissimilarities = None  # Rebuilt from the frequencies on first use
+        return True
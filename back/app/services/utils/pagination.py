@@ -0,0 +1,157 @@
+import asyncio
+import base64
+import csv
+import io
+import itertools
+import json
+
+class Pagination:
+    """
+    Keyset pagination and streaming helpers for the database listings.
+
+    A page is requested with a limit and the cursor token of the previous page. The token wraps
+    the key of the last row sent, so the next page is read with an indexed "key > last key"
+    condition instead of an OFFSET that rereads every skipped row.
+    """
+
+    # Bounds of the page sizes and number of rows fetched at a time by the exports
+    CONFIG = {
+        "max_limit": 1000,
+        "export_batch_size": 1000
+    }
+
+    @staticmethod
+    def encode_cursor(last_key):
+        """
+        Encode the key of the last row of a page as an opaque cursor token.
+
+        Args:
+        last_key (int): Key of the last row of the page.
+
+        Returns:
+        str: Cursor token of the next page.
+        """
+        payload = json.dumps({"after": last_key}, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(token):
+        """
+        Decode a cursor token into the key of the last row of the previous page.
+
+        Args:
+        token (str or None): Cursor token, None for the first page.
+
+        Returns:
+        int or None: Key of the last row of the previous page, None for the first page.
+
+        Raises:
+        ValueError: If the token is not a valid cursor.
+        """
+        if not token:
+            return None
+        try:
+            payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            last_key = json.loads(payload)["after"]
+        except Exception as e:
+            raise ValueError("Invalid cursor") from e
+        if not isinstance(last_key, int) or isinstance(last_key, bool):
+            raise ValueError("Invalid cursor")
+        return last_key
+
+    @staticmethod
+    def get_page(rows, limit, columns):
+        """
+        Build a page from the rows read for it.
+
+        The rows are read with a limit one above the page size, the extra row only tells that
+        another page follows.
+
+        Args:
+        rows (list): Rows read for the page, at most limit + 1, keyed by their first column.
+        limit (int): Page size.
+        columns (list): Column names of the rows.
+
+        Returns:
+        tuple: Rows of the page as dictionaries, and the cursor token of the next page or None.
+        """
+        rows = list(rows)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = Pagination.encode_cursor(rows[-1][0]) if has_more else None
+        return [dict(zip(columns, row)) for row in rows], next_cursor
+
+    @staticmethod
+    async def prefetch(rows):
+        """
+        Read the first row of streamed rows before the response starts.
+
+        The rows are only read once the response is being sent, when its status can no longer
+        change, so a query error would end a successful response early. Reading the first row
+        runs the query and fetches the first batch while an error can still be answered.
+
+        Args:
+        rows (generator or async generator): Streamed rows, not read yet.
+
+        Returns:
+        iterator or async generator: The same rows, of the same kind.
+
+        Raises:
+        Exception: If there's an error while executing the query.
+        """
+        if hasattr(rows, "__aiter__"):
+            try:
+                first = [await rows.__anext__()]
+            except StopAsyncIteration:
+                first = []
+
+            async def chained():
+                for row in first:
+                    yield row
+                async for row in rows:
+                    yield row
+            return chained()
+
+        end = object()
+        first = await asyncio.to_thread(next, rows, end)  # The query blocks, keep it off the event loop
+        return itertools.chain([] if first is end else [first], rows)
+
+    @staticmethod
+    def _csv_line(values):
+        """
+        Format values as a CSV line.
+
+        Args:
+        values (list): Values of the line.
+
+        Returns:
+        str: CSV line, ending with a line break.
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(values)
+        return buffer.getvalue()
+
+    @staticmethod
+    def stream_csv(columns, rows):
+        """
+        Format streamed rows as CSV lines, one row at a time.
+
+        Args:
+        columns (list): Column names, written as the header line.
+        rows (iterable or async iterable): Rows to format.
+
+        Returns:
+        generator or async generator: CSV lines, of the same kind as the rows.
+        """
+        if hasattr(rows, "__aiter__"):
+            async def lines():
+                yield Pagination._csv_line(columns)
+                async for row in rows:
+                    yield Pagination._csv_line(row)
+            return lines()
+
+        def lines():
+            yield Pagination._csv_line(columns)
+            for row in rows:
+                yield Pagination._csv_line(row)
+        return lines()
@@ -0,0 +1,132 @@
+import os
+import signal
+import socket
+import time
+import traceback
+import uvicorn
+
+class PreforkServer:
+    """
+    Server running an ASGI application in several forked worker processes sharing one socket.
+
+    The parent process binds the listening socket and is expected to load the trained dataset
+    singletons before run is called, so the workers inherit them copy-on-write instead of each
+    training or loading its own copy. The application itself is created in each worker after the
+    fork, so every worker opens its own database connection. A worker exiting before shutdown
+    is replaced by a new one. Where fork is not available, or with a single worker, the
+    application is served from the current process.
+
+    Attributes:
+    app_factory (callable): Function creating the ASGI application.
+    host (str): Host address to bind.
+    port (int): Port number to bind.
+    workers (int): Number of worker processes.
+    """
+
+    def __init__(self, app_factory, host, port, workers=1):
+        """
+        Initialize the server.
+
+        Args:
+        app_factory (callable): Function creating the ASGI application.
+        host (str): Host address to bind.
+        port (int): Port number to bind.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        """
+        self.app_factory = app_factory
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self._children = {}  # Start time of each worker process by pid
+        self._stopping = False
+
+    def _bind(self):
+        """
+        Bind the listening socket shared by the workers.
+
+        Returns:
+        socket.socket: Listening socket.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _serve(self, sock):
+        """
+        Create the application and serve it on the shared socket until shutdown.
+
+        Args:
+        sock (socket.socket): Listening socket.
+        """
+        config = uvicorn.Config(self.app_factory(), host=self.host, port=self.port)
+        uvicorn.Server(config).run(sockets=[sock])
+
+    def _stop(self, signum, frame):
+        """
+        Forward a shutdown signal to the worker processes.
+
+        Args:
+        signum (int): Received signal number.
+        frame: Current stack frame.
+        """
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _spawn(self, sock):
+        """
+        Fork a worker process serving the application on the shared socket.
+
+        Args:
+        sock (socket.socket): Listening socket.
+        """
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                self._serve(sock)
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self._children[pid] = time.monotonic()
+
+    def run(self):
+        """
+        Start the workers, replace the ones exiting before shutdown and wait for them to exit.
+        """
+        sock = self._bind()
+
+        if self.workers == 1 or not hasattr(os, "fork"):
+            print(f"Starting gateway on {self.host}:{self.port} in a single process...")
+            self._serve(sock)
+            return
+
+        print(f"Starting gateway on {self.host}:{self.port} with {self.workers} worker processes...")
+        for _ in range(self.workers):
+            self._spawn(sock)
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self._children.pop(pid, None)
+            if started is None or self._stopping:
+                continue
+            print(f"Gateway worker {pid} exited with code {os.waitstatus_to_exitcode(status)}, starting a new one...")
+            if time.monotonic() - started < 1:
+                time.sleep(1)  # Do not fork in a tight loop when workers fail right after starting
+            if not self._stopping:
+                self._spawn(sock)
+        sock.close()
@@ -0,0 +1,194 @@
+import csv
+import os
+import numpy as np
+
+class ResultWriter:
+    """
+    Streaming sink for evaluation rows, written to a CSV or Parquet file.
+
+    The output is opened once, on the first flush, and rows are appended as they are produced,
+    so writing n rows costs O(n) I/O instead of rereading and rewriting the whole file for every
+    row. CSV output appends to an existing file under its header, as append_dict_to_csv did, or
+    sets the file aside and starts a new one when the columns changed.
+    Parquet output requires pyarrow and replaces any existing file.
+
+    Attributes:
+    path (str): Path of the output file.
+    output_format (str): Output format, 'csv' or 'parquet'.
+    buffer_rows (int): Rows kept in memory before they are written out.
+    rows (int): Number of rows written so far.
+    """
+
+    FORMATS = ("csv", "parquet")
+
+    def __init__(self, path, output_format="csv", buffer_rows=256):
+        """
+        Prepare the output file, which is opened when the first rows are flushed.
+
+        Args:
+        path (str): Path of the output file.
+        output_format (str, optional): Output format, 'csv' or 'parquet'. Defaults to 'csv'.
+        buffer_rows (int, optional): Rows kept in memory before they are written out. Defaults to 256.
+
+        Raises:
+        ValueError: If the output format is not supported.
+        ImportError: If Parquet output is requested and pyarrow is not installed.
+        """
+        ResultWriter.check_format(output_format)
+
+        self.path = path
+        self.output_format = output_format
+        self.buffer_rows = buffer_rows
+        self.rows = 0
+        self._buffer = []
+        self._fieldnames = None
+        self._file = None
+        self._writer = None
+
+    @staticmethod
+    def check_format(output_format):
+        """
+        Check that an output format is supported and its optional dependency is installed.
+
+        Args:
+        output_format (str): Output format, 'csv' or 'parquet'.
+
+        Raises:
+        ValueError: If the output format is not supported.
+        ImportError: If Parquet output is requested and pyarrow is not installed.
+        """
+        if output_format not in ResultWriter.FORMATS:
+            raise ValueError(f"Invalid output format. Please choose one of: {', '.join(ResultWriter.FORMATS)}.")
+
+        if output_format == "parquet":
+            try:
+                import pyarrow  # Fail early when the optional dependency is missing
+            except ImportError as e:
+                raise ImportError("Parquet output requires the pyarrow package.") from e
+
+    def _read_csv_header(self):
+        """
+        Read the header of an existing CSV output, so appended rows keep its columns.
+
+        Returns:
+        list or None: Column names of the existing file, or None if it is missing or empty.
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return None
+        with open(self.path, newline="", encoding="utf-8") as file:
+            return next(csv.reader(file), None)
+
+    @staticmethod
+    def _to_scalar(value):
+        """
+        Unwrap the single-value lists and arrays returned by model predictions.
+
+        Args:
+        value: Row value.
+
+        Returns:
+        Value as a plain scalar when it holds a single element.
+        """
+        if isinstance(value, (list, tuple, np.ndarray)) and len(value) == 1:
+            value = value[0]
+        if isinstance(value, np.generic):
+            value = value.item()
+        return value
+
+    def write(self, row):
+        """
+        Append a row to the output.
+
+        Args:
+        row (dict): Column names and values of the row.
+        """
+        self._buffer.append({column: ResultWriter._to_scalar(value) for column, value in row.items()})
+        self.rows += 1
+        if len(self._buffer) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered rows to the output file.
+        """
+        if not self._buffer:
+            return
+
+        if self.output_format == "parquet":
+            self._flush_parquet()
+        else:
+            self._flush_csv()
+        self._buffer = []
+
+    def _set_aside(self):
+        """
+        Rename the existing CSV output to the first free numbered name next to it, such as ckd_result.1.csv.
+
+        Returns:
+        str: New path of the existing file.
+        """
+        root, extension = os.path.splitext(self.path)
+        number = 1
+        while os.path.exists(f"{root}.{number}{extension}"):
+            number += 1
+        moved_path = f"{root}.{number}{extension}"
+        os.replace(self.path, moved_path)
+        return moved_path
+
+    def _flush_csv(self):
+        """
+        Write the buffered rows to the CSV file, starting it with a header when it is new.
+
+        An existing file whose header differs from the columns of the rows is set aside and a new
+        file is started, appending under the old header would misalign or reject the rows.
+        """
+        if self._writer is None:
+            fieldnames = list(self._buffer[0].keys())
+            header = self._read_csv_header()
+            if header is not None and header != fieldnames:
+                moved_path = self._set_aside()
+                print(f"The columns of {self.path} changed, the previous results were moved to {moved_path}")
+                header = None
+            self._fieldnames = fieldnames
+            self._file = open(self.path, "a", newline="", encoding="utf-8", buffering=1 << 16)
+            self._writer = csv.DictWriter(self._file, fieldnames=self._fieldnames)
+            if header is None:
+                self._writer.writeheader()
+
+        self._writer.writerows(self._buffer)
+        self._file.flush()
+
+    def _flush_parquet(self):
+        """
+        Write the buffered rows as a Parquet row group, opening the Parquet writer on first use.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self._fieldnames = list(self._buffer[0].keys())
+            table = pa.Table.from_pylist(self._buffer)
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = pa.Table.from_pylist(self._buffer, schema=self._writer.schema)
+
+        self._writer.write_table(table)
+
+    def close(self):
+        """
+        Flush the remaining rows and close the output file.
+        """
+        self.flush()
+        if self.output_format == "parquet":
+            if self._writer is not None:
+                self._writer.close()
+        elif self._file is not None:
+            self._file.close()
+        self._writer = None
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,119 @@
+import math
+import numbers
+import numpy as np
+
+class RowEncoder:
+    """
+    Compiled replacement of the preprocessor convert + reindex steps for prediction rows.
+
+    The encoder is fitted once from the training feature columns and writes each raw input
+    row straight into a preallocated float matrix. The values are the ones the models read
+    from the one-row DataFrame built by pd.get_dummies and reindexed to the training columns:
+    one-hot columns are 1.0 for the row value and 0.0 otherwise, other training columns hold
+    float(value), and columns missing from the row are 0.0.
+
+    Attributes:
+    columns (pd.Index): Training feature columns the encoder was fitted with.
+    categorical_columns (list or None): Columns one-hot encoded by the preprocessor, or None
+                                        when pd.get_dummies encodes every non-numeric column.
+    """
+
+    def __init__(self, columns, categorical_columns=None):
+        """
+        Fit the encoder.
+
+        Args:
+        columns (pd.Index): Training feature columns, in model order.
+        categorical_columns (list, optional): Columns one-hot encoded by the preprocessor. Defaults to None,
+                                              meaning every non-numeric value is one-hot encoded.
+        """
+        self.columns = columns
+        self.categorical_columns = categorical_columns
+        self._positions = {column: position for position, column in enumerate(columns)}
+        self._categorical = set(categorical_columns) if categorical_columns is not None else None
+
+    def is_compiled_for(self, columns):
+        """
+        Check whether the encoder was fitted with the given training columns.
+
+        Args:
+        columns (pd.Index): Training feature columns.
+
+        Returns:
+        bool: True if the encoder was fitted with these columns.
+        """
+        return self.columns is columns
+
+    def _is_categorical(self, column, value):
+        """
+        Check whether a row value is one-hot encoded by the preprocessor.
+
+        Args:
+        column (str): Column name.
+        value: Row value, not missing.
+
+        Returns:
+        bool: True if the value is one-hot encoded.
+        """
+        if self._categorical is not None:
+            return column in self._categorical
+        # pd.get_dummies(df) only encodes object columns, numbers and booleans keep their column
+        return not isinstance(value, (numbers.Number, np.number, np.bool_))
+
+    def encode_row(self, input_row, out):
+        """
+        Encode a raw input row into a preallocated feature vector.
+
+        Args:
+        input_row (dict): Raw input row, keyed by dataset column.
+        out (np.ndarray): Zeroed feature vector to fill, with one value per training column.
+        """
+        for column, value in input_row.items():
+            if value is None:
+                # A column holding only None is an object column, so pd.get_dummies drops it without encoding it
+                if self._categorical is None or column in self._categorical:
+                    continue
+                value = math.nan
+            elif isinstance(value, float) and math.isnan(value):
+                if self._categorical is not None and column in self._categorical:
+                    continue
+            elif self._is_categorical(column, value):
+                position = self._positions.get(f"{column}_{value}")
+                if position is not None:
+                    out[position] = 1.0
+                continue
+
+            position = self._positions.get(column)
+            if position is not None:
+                out[position] = float(value)
+
+    @staticmethod
+    def get_matrix(features):
+        """
+        Get the float feature matrix of training or testing features.
+
+        The models are fitted, tested and asked to predict on plain matrices, the layout encode_rows
+        produces, so no feature names are checked and no DataFrame is built for a prediction.
+
+        Args:
+        features (pd.DataFrame): Features in training column order, such as X_train or X_test.
+
+        Returns:
+        np.ndarray: Feature matrix of shape (len(features), len(columns)).
+        """
+        return features.to_numpy(dtype=float)
+
+    def encode_rows(self, input_rows):
+        """
+        Encode several raw input rows into a feature matrix.
+
+        Args:
+        input_rows (list): Raw input rows, keyed by dataset column.
+
+        Returns:
+        np.ndarray: Feature matrix of shape (len(input_rows), len(columns)).
+        """
+        matrix = np.zeros((len(input_rows), len(self.columns)))
+        for input_row, out in zip(input_rows, matrix):
+            self.encode_row(input_row, out)
+        return matrix
@@ -1,5 +1,7 @@
 from app.services.utils.utils import Utils
 from app.services.utils.datasets_tools import DatasetsTools
+from app.services.utils.model_snapshot_store import ModelSnapshotStore
+from app.services.utils.training_scheduler import TrainingScheduler
 
 class Startup:
     _instance = None
@@ -21,6 +23,7 @@ class Startup:
         Initializes the Startup instance if not already initialized.
 
         This method initializes necessary datasets and enums using DatasetsTools and Utils.
+        Trained models are loaded from ModelSnapshotStore when the raw data and model hyperparameters did not change.
         """
         if not self._initialized:
             self._initialized = True
@@ -28,12 +31,22 @@ class Startup:
             datasets_tools_instance = DatasetsTools.get_instance()
             # Get instances of datasets from DatasetsTools
             datasets_instances = datasets_tools_instance.get_datasets_instances()
-            # Preprocess each dataset and set attributes
+            # Obtain singleton instance of ModelSnapshotStore
+            snapshot_store = ModelSnapshotStore.get_instance()
+            # Preprocess each dataset and set attributes, training only when no up to date snapshot exists
+            datasets_to_process = []
             for dataset in datasets_instances:
                 dataset.preprocess()
-                dataset.min_max = datasets_tools_instance.get_min_max_columns(dataset.df_raw)
-                dataset.frequencies = datasets_tools_instance.get_categorical_frequencies(dataset.df_raw)
-                dataset.process()
+                if snapshot_store.load(dataset):
+                    dataset.dissimilarities = datasets_tools_instance.get_categorical_dissimilarities(dataset.frequencies)
+                    continue
+                datasets_tools_instance.set_distance_statistics(dataset)
+                datasets_to_process.append(dataset)
+            # Train the models of the remaining datasets in parallel
+            for report in TrainingScheduler.get_instance().process(datasets_to_process):
+                print(f"Trained {report['model']} for {report['dataset']} in {report['seconds']:.2f} seconds")
+            for dataset in datasets_to_process:
+                snapshot_store.save(dataset)
             # Set relative weights for datasets
             datasets_tools_instance.set_relative_weights(datasets_instances)
             # Obtain enums using Utils
@@ -1,9 +1,9 @@
 from fastapi.responses import JSONResponse
-import pandas as pd
 from sklearn.model_selection import train_test_split
 
 from app.services.utils.mapper import Mapper
 from app.services.utils.datasets_tools import DatasetsTools
+from app.services.utils.result_writer import ResultWriter
 
 def split_dataset(df, ratio):
     """
@@ -11,7 +11,7 @@ def split_dataset(df, ratio):
 
     Args:
     df (pd.DataFrame): Input DataFrame to split.
-    ratio (float): Ratio of test data to total data.
+    ratio (float): Ratio of train data to total data, the test set holds the remaining 1 - ratio of the rows.
 
     Returns:
     pd.DataFrame: Test DataFrame.
@@ -32,178 +32,175 @@ def filter_test_columns(test_df, columns_to_keep):
     """
     return test_df[columns_to_keep]
 
-def append_dict_to_csv(data_dict, csv_name):
+def encoded_row_to_dict(ds, encoded_row):
     """
-    Append dictionary data to a CSV file.
+    Convert an encoded prediction row back to a dictionary of training columns.
 
     Args:
-    data_dict (dict): Dictionary containing data to append to CSV.
-    csv_name (str): Name of the CSV file to append to.
+    ds (object): Dataset object the row was encoded for.
+    encoded_row (np.ndarray): One-row feature matrix returned by the dataset preprocess_row.
 
     Returns:
-    pd.DataFrame: Combined DataFrame after appending.
+    dict: Training column names and encoded values of the row.
     """
-    # Convert the dictionary to a DataFrame
-    df = pd.DataFrame.from_dict(data_dict)
-    
-    try:
-        # Try to read the existing CSV file
-        existing_df = pd.read_csv(csv_name)
-        # Concatenate the existing DataFrame with the new DataFrame
-        combined_df = pd.concat([existing_df, df], ignore_index=True)
-    except FileNotFoundError:
-        # If the CSV file does not exist, the combined DataFrame is just the new DataFrame
-        combined_df = df
-    
-    # Save the combined DataFrame to the CSV file
-    combined_df.to_csv(csv_name, index=False)
-    
-    return combined_df
-        
-def process_and_append_maternal_data(maternal, df, name=''):
+    return dict(zip(ds.X_train.columns, encoded_row[0]))
+
+def process_and_append_maternal_data(maternal, df, name='', output_format='csv'):
     """
-    Process maternal data, predict outcomes, and append results to CSV files.
+    Process maternal data, predict outcomes, and stream results to CSV or Parquet files.
 
     Args:
     maternal (object): Maternal model object for prediction.
     df (pd.DataFrame): Input DataFrame containing maternal data.
-    name (str, optional): Name prefix for CSV files (default is None).
+    name (str, optional): Name prefix for the output files (default is None).
+    output_format (str, optional): Output files format, 'csv' or 'parquet' (default is 'csv').
 
     Returns:
     JSONResponse: JSON response indicating completion status.
     """
-    for index, row in df.iterrows():
-        maternal_row = {
-            "Age": row.Age,
-            "SystolicBP": row.SystolicBP,
-            "DiastolicBP": None,
-            "BS": row.BS,
-            "BodyTemp": row.BodyTemp,
-            "HeartRate": row.HeartRate,
-        }
-        datasets_tools = DatasetsTools.get_instance()
-        k_nearest_rows = datasets_tools.find_nearest_rows(maternal, maternal_row, 1)
-        row_to_predict = Mapper.fill_empty_values(maternal_row, k_nearest_rows)
-        row_to_predict = Mapper.map_to_ds_row(maternal, row_to_predict)
-        result = maternal.predict(row_to_predict)
-        result_csv_name = name + 'maternal_result.csv'
-        lines_csv_name = name + 'maternal_lines.csv'
-        result["Expected_Risk"] = row.RiskLevel
-        append_dict_to_csv(result, result_csv_name)
-        append_dict_to_csv(row_to_predict, lines_csv_name)
+    datasets_tools = DatasetsTools.get_instance()
+    result_file_name = f'{name}maternal_result.{output_format}'
+    lines_file_name = f'{name}maternal_lines.{output_format}'
+
+    with ResultWriter(result_file_name, output_format) as results, ResultWriter(lines_file_name, output_format) as lines:
+        for index, row in df.iterrows():
+            maternal_row = {
+                "Age": row.Age,
+                "SystolicBP": row.SystolicBP,
+                "DiastolicBP": None,
+                "BS": row.BS,
+                "BodyTemp": row.BodyTemp,
+                "HeartRate": row.HeartRate,
+            }
+            k_nearest_rows = datasets_tools.find_nearest_rows(maternal, maternal_row, 1)
+            row_to_predict = Mapper.fill_empty_values(maternal_row, k_nearest_rows)
+            row_to_predict = Mapper.map_to_ds_row(maternal, row_to_predict)
+            result = maternal.predict(row_to_predict)
+            result["Expected_Risk"] = row.RiskLevel
+            results.write(result)
+            lines.write(encoded_row_to_dict(maternal, row_to_predict))
     return JSONResponse(content={"message": "Done"})
 
-def process_and_append_ckd_data(ckd, df, name=''):
+def process_and_append_ckd_data(ckd, df, name='', output_format='csv'):
     """
-    Process CKD data, predict outcomes, and append results to CSV files.
+    Process CKD data, predict outcomes, and stream results to CSV or Parquet files.
 
     Args:
     ckd (object): CKD model object for prediction.
     df (pd.DataFrame): Input DataFrame containing CKD data.
-    name (str, optional): Name prefix for CSV files (default is None).
+    name (str, optional): Name prefix for the output files (default is None).
+    output_format (str, optional): Output files format, 'csv' or 'parquet' (default is 'csv').
 
     Returns:
     JSONResponse: JSON response indicating completion status.
     """
-    for index, row in df.iterrows():
-        ckd_row = {
-            "age": row.age,
-            "bp": row.bp,
-            "sg": None,
-            "al": None,
-            "su": None,
-            "rcb": None,
-            "pc": None,
-            "pcc": None,
-            "ba": None,
-            "bgr": row.bgr,
-            "bu": None,
-            "sc": None,
-            "sod": None,
-            "pot": None,
-            "hemo": None,
-            "pcv": None,
-            "wbcc": None,
-            "rbcc": None,
-            "htn": None,
-            "dm": None,
-            "cad": None,
-            "appet": None,
-            "pe": None,
-            "ane": None,
-        }
-        datasets_tools = DatasetsTools.get_instance()
-        k_nearest_rows = datasets_tools.find_nearest_rows(ckd, ckd_row, 1)
-        row_to_predict = Mapper.fill_empty_values(ckd_row, k_nearest_rows)
-        row_to_predict = Mapper.map_to_ds_row(ckd, row_to_predict)
-        result = ckd.predict(row_to_predict)
-        result_csv_name = name + 'ckd_result.csv'
-        lines_csv_name = name + 'ckd_lines.csv'
-        result["Expected_CKD"] = row.ckd
-        append_dict_to_csv(result, result_csv_name)
-        append_dict_to_csv(row_to_predict, lines_csv_name)
+    datasets_tools = DatasetsTools.get_instance()
+    result_file_name = f'{name}ckd_result.{output_format}'
+    lines_file_name = f'{name}ckd_lines.{output_format}'
+
+    with ResultWriter(result_file_name, output_format) as results, ResultWriter(lines_file_name, output_format) as lines:
+        for index, row in df.iterrows():
+            ckd_row = {
+                "age": row.age,
+                "bp": row.bp,
+                "sg": None,
+                "al": None,
+                "su": None,
+                "rcb": None,
+                "pc": None,
+                "pcc": None,
+                "ba": None,
+                "bgr": row.bgr,
+                "bu": None,
+                "sc": None,
+                "sod": None,
+                "pot": None,
+                "hemo": None,
+                "pcv": None,
+                "wbcc": None,
+                "rbcc": None,
+                "htn": None,
+                "dm": None,
+                "cad": None,
+                "appet": None,
+                "pe": None,
+                "ane": None,
+            }
+            k_nearest_rows = datasets_tools.find_nearest_rows(ckd, ckd_row, 1)
+            row_to_predict = Mapper.fill_empty_values(ckd_row, k_nearest_rows)
+            row_to_predict = Mapper.map_to_ds_row(ckd, row_to_predict)
+            result = ckd.predict(row_to_predict)
+            result["Expected_CKD"] = row.ckd
+            results.write(result)
+            lines.write(encoded_row_to_dict(ckd, row_to_predict))
     return JSONResponse(content={"message": "Done"})
 
-def process_and_append_disease_data(disease, df, name=''):
+def process_and_append_disease_data(disease, df, name='', output_format='csv'):
     """
-    Process Disease data, predict outcomes, and append results to CSV files.
+    Process Disease data, predict outcomes, and stream results to CSV or Parquet files.
 
     Args:
     disease (object): Disease model object for prediction.
     df (pd.DataFrame): Input DataFrame containing Disease data.
-    name (str, optional): Name prefix for CSV files (default is None).
+    name (str, optional): Name prefix for the output files (default is None).
+    output_format (str, optional): Output files format, 'csv' or 'parquet' (default is 'csv').
 
     Returns:
     JSONResponse: JSON response indicating completion status.
     """
-    for index, row in df.iterrows():
-        disease_row = {
-            "Discharge": None,
-            "Feelings_and_Urge": row.Feelings_and_Urge,
-            "Pain_and_Infection": None,
-            "Physical_Conditions": None,
-            "Critical_Feelings": row.Critical_Feelings,
-            "Disease": row.Disease,
-        }
-        datasets_tools = DatasetsTools.get_instance()
-        k_nearest_rows = datasets_tools.find_nearest_rows(disease, disease_row, 1)
-        row_to_predict = Mapper.fill_empty_values(disease_row, k_nearest_rows)
-        row_to_predict = Mapper.map_to_ds_row(disease, row_to_predict)
-        result = disease.predict(row_to_predict)
-        result_csv_name = name + 'disease_result.csv'
-        lines_csv_name = name + 'disease_lines.csv'
-        result["Expected_Critical"] = row.Critical
-        append_dict_to_csv(result, result_csv_name)
-        append_dict_to_csv(row_to_predict, lines_csv_name)
+    datasets_tools = DatasetsTools.get_instance()
+    result_file_name = f'{name}disease_result.{output_format}'
+    lines_file_name = f'{name}disease_lines.{output_format}'
+
+    with ResultWriter(result_file_name, output_format) as results, ResultWriter(lines_file_name, output_format) as lines:
+        for index, row in df.iterrows():
+            disease_row = {
+                "Discharge": None,
+                "Feelings_and_Urge": row.Feelings_and_Urge,
+                "Pain_and_Infection": None,
+                "Physical_Conditions": None,
+                "Critical_Feelings": row.Critical_Feelings,
+                "Disease": row.Disease,
+            }
+            k_nearest_rows = datasets_tools.find_nearest_rows(disease, disease_row, 1)
+            row_to_predict = Mapper.fill_empty_values(disease_row, k_nearest_rows)
+            row_to_predict = Mapper.map_to_ds_row(disease, row_to_predict)
+            result = disease.predict(row_to_predict)
+            result["Expected_Critical"] = row.Critical
+            results.write(result)
+            lines.write(encoded_row_to_dict(disease, row_to_predict))
     return JSONResponse(content={"message": "Done"})
 
-def process_and_append_cass_data(cassi, df, name=''):
+def process_and_append_cass_data(cassi, df, name='', output_format='csv'):
     """
-    Process Cassi data, predict outcomes, and append results to CSV files.
+    Process Cassi data, predict outcomes, and stream results to CSV or Parquet files.
 
     Args:
     cassi (object): Cassi model object for prediction.
     df (pd.DataFrame): Input DataFrame containing Cassi data.
-    name (str, optional): Name prefix for CSV files (default is None).
+    name (str, optional): Name prefix for the output files (default is None).
+    output_format (str, optional): Output files format, 'csv' or 'parquet' (default is 'csv').
 
     Returns:
     JSONResponse: JSON response indicating completion status.
     """
-    for index, row in df.iterrows():
-        cassi_row = {
-            "Operative_Procedure": row.Operative_Procedure,
-            "Infections_Reported": row.Infections_Reported,
-            "Infections_Predicted": None,
-            "Procedure_Count": row.Procedure_Count,
-        }
-        datasets_tools = DatasetsTools.get_instance()
-        k_nearest_rows = datasets_tools.find_nearest_rows(cassi, cassi_row, 1)
-        row_to_predict = Mapper.fill_empty_values(cassi_row, k_nearest_rows)
-        row_to_predict = Mapper.map_to_ds_row(cassi, row_to_predict)
-        result = cassi.predict(row_to_predict)
-        result_csv_name = name + 'cassi_result.csv'
-        lines_csv_name = name + 'cassi_lines.csv'
-        result["Expected_SIR"] = row.SIR
-        append_dict_to_csv(result, result_csv_name)
-        append_dict_to_csv(row_to_predict, lines_csv_name)
+    datasets_tools = DatasetsTools.get_instance()
+    result_file_name = f'{name}cassi_result.{output_format}'
+    lines_file_name = f'{name}cassi_lines.{output_format}'
+
+    with ResultWriter(result_file_name, output_format) as results, ResultWriter(lines_file_name, output_format) as lines:
+        for index, row in df.iterrows():
+            cassi_row = {
+                "Operative_Procedure": row.Operative_Procedure,
+                "Infections_Reported": row.Infections_Reported,
+                "Infections_Predicted": None,
+                "Procedure_Count": row.Procedure_Count,
+            }
+            k_nearest_rows = datasets_tools.find_nearest_rows(cassi, cassi_row, 1)
+            row_to_predict = Mapper.fill_empty_values(cassi_row, k_nearest_rows)
+            row_to_predict = Mapper.map_to_ds_row(cassi, row_to_predict)
+            result = cassi.predict(row_to_predict)
+            result["Expected_SIR"] = row.SIR
+            results.write(result)
+            lines.write(encoded_row_to_dict(cassi, row_to_predict))
     return JSONResponse(content={"message": "Done"})
\ No newline at end of file
@@ -0,0 +1,174 @@
+import copy
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from threadpoolctl import threadpool_limits
+from app.services.utils.row_encoder import RowEncoder
+
+# Environment variables read by the BLAS and OpenMP runtimes when they start in a worker process
+BLAS_THREAD_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+def _limit_blas_threads(blas_threads):
+    """
+    Limit the BLAS and OpenMP threads of a training worker process.
+
+    Args:
+    blas_threads (int): Number of threads each worker may use.
+    """
+    for variable in BLAS_THREAD_VARIABLES:
+        os.environ[variable] = str(blas_threads)
+    threadpool_limits(limits=blas_threads)
+
+def _train_model(job):
+    """
+    Train a single model in a worker process.
+
+    Args:
+    job (tuple): Dataset name, model index, model instance, training features and labels.
+
+    Returns:
+    tuple: Dataset name, model index, trained model instance and wall time in seconds.
+    """
+    dataset_name, index, model, X_train, y_train = job
+    start_time = time.perf_counter()
+    model.train(X_train, y_train)
+    return dataset_name, index, model, time.perf_counter() - start_time
+
+class TrainingScheduler:
+    """
+    Scheduler training the models of several datasets in parallel.
+
+    Each (dataset, model) pair is a training job sent to a process pool. Each worker is limited to
+    CONFIG["blas_threads"] BLAS threads so that the workers do not oversubscribe the cores.
+    Workers are started from a fork server, or spawned where it is not available, as the inference
+    pool does. Trained models are installed back into the dataset singletons in dataset and model order,
+    whatever the order the jobs finish in, and are then tested as in the dataset process step.
+    Models are trained on copies and only installed once every job is done, so a cancelled
+    training leaves the current models in place.
+
+    Attributes:
+    reports (list): Dataset, model and wall time of each job of the last training.
+    """
+
+    _instance = None
+
+    # Configuration of the parallel training, max_workers None uses every core, and seconds between
+    # two cancellation checks while waiting for the workers
+    CONFIG = {
+        "enabled": True,
+        "max_workers": None,
+        "blas_threads": 1,
+        "poll_interval": 0.5
+    }
+
+    @staticmethod
+    def get_instance():
+        """
+        Get singleton instance of TrainingScheduler.
+
+        Returns:
+        TrainingScheduler: Singleton instance of TrainingScheduler.
+        """
+        if TrainingScheduler._instance is None:
+            TrainingScheduler._instance = TrainingScheduler()
+        return TrainingScheduler._instance
+
+    def __init__(self):
+        """
+        Initialize the scheduler with no training reports.
+        """
+        self.reports = []
+
+    def get_max_workers(self, jobs):
+        """
+        Get the number of worker processes to use.
+
+        Args:
+        jobs (int): Number of training jobs.
+
+        Returns:
+        int: Number of worker processes, never more than the number of jobs.
+        """
+        max_workers = TrainingScheduler.CONFIG["max_workers"] or os.cpu_count() or 1
+        return max(1, min(max_workers, jobs))
+
+    def process(self, datasets, job=None):
+        """
+        Train and test the models of several datasets, as their process step does.
+
+        Args:
+        datasets (list): Preprocessed dataset instances to process.
+        job (JobContext, optional): Context of the background job running the training, to report
+                                    the trained models and stop when the job is cancelled. Defaults to None.
+
+        Returns:
+        list: Dictionaries with the dataset, model and wall time in seconds of each training job.
+
+        Raises:
+        JobCancelled: If the job was cancelled, no model is installed.
+        """
+        jobs = [
+            (type(dataset).__name__, index, model, RowEncoder.get_matrix(dataset.X_train), dataset.y_train)
+            for dataset in datasets
+            for index, model in enumerate(dataset.models)
+        ]
+        results = [None] * len(jobs)
+
+        def report(position, result):
+            # Record a finished training job and report it as progress
+            results[position] = result
+            if job is not None:
+                dataset_name, _, model, seconds = result
+                job.report(stage="train", done=sum(result is not None for result in results), total=len(jobs),
+                           last={"dataset": dataset_name, "model": type(model).__name__, "seconds": seconds})
+
+        if job is not None:
+            job.report(stage="train", done=0, total=len(jobs))
+
+        if not TrainingScheduler.CONFIG["enabled"] or self.get_max_workers(len(jobs)) == 1:
+            for position, (dataset_name, index, model, X_train, y_train) in enumerate(jobs):
+                if job is not None:
+                    job.check_cancelled()
+                report(position, _train_model((dataset_name, index, copy.deepcopy(model), X_train, y_train)))
+        else:
+            # Workers are never forked from the API process, whose server, job and refresh threads may hold
+            # locks, or OpenMP and BLAS state, that a forked child would never get back
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+            else:
+                context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.get_max_workers(len(jobs)), mp_context=context,
+                                     initializer=_limit_blas_threads,
+                                     initargs=(TrainingScheduler.CONFIG["blas_threads"],)) as executor:
+                futures = {executor.submit(_train_model, training_job): position for position, training_job in enumerate(jobs)}
+                pending = set(futures)
+                try:
+                    while pending:
+                        done, pending = wait(pending, timeout=TrainingScheduler.CONFIG["poll_interval"], return_when=FIRST_COMPLETED)
+                        for future in done:
+                            report(futures[future], future.result())
+                        if job is not None:
+                            job.check_cancelled()
+                except BaseException:
+                    # Jobs not started yet are dropped, the running ones finish when the pool shuts down
+                    for future in pending:
+                        future.cancel()
+                    raise
+
+        if job is not None:
+            job.check_cancelled()
+
+        # Install the trained models in dataset and model order, then test them
+        datasets_by_name = {type(dataset).__name__: dataset for dataset in datasets}
+        self.reports = []
+        for dataset_name, index, model, seconds in results:
+            datasets_by_name[dataset_name].models[index] = model
+            self.reports.append({"dataset": dataset_name, "model": type(model).__name__, "seconds": seconds})
+
+        for dataset in datasets:
+            if job is not None:
+                job.report(stage="test", dataset=type(dataset).__name__)
+            dataset.metrics.append(dataset.processor.test_models(dataset.models, RowEncoder.get_matrix(dataset.X_test), dataset.y_test))
+
+        return self.reports
@@ -1,8 +1,18 @@
+import hashlib
+import json
+import os
+import tempfile
+from app.entities.configs.datasets import Datasets
 from app.services.utils.datasets_tools import DatasetsTools
+from app.services.utils.model_snapshot_store import ModelSnapshotStore
 
 class Utils:
     _instance = None
     _cached_enums = None
+    _cached_enums_payload = None
+
+    # Enum columns served to the frontend by /get-enums
+    SELECTED_ENUMS = ["Operative_Procedure", "Feelings_and_Urge", "Disease", "Critical_Feelings"]
 
     def __new__(cls, *args, **kwargs):
         """
@@ -43,9 +53,86 @@ class Utils:
         enums_list = []
 
         for dataset in datasets_instances:
-            enums = dataset_tools_instance.get_categorical_enums(dataset)
+            enums = cls.get_dataset_enums(dataset)
             if enums:
                 enums_list.append(enums)
         
         cls._cached_enums = enums_list
-        return enums_list
\ No newline at end of file
+        return enums_list
+
+    @staticmethod
+    def get_dataset_enums(dataset):
+        """
+        Retrieve the enums of a dataset, from the enums file next to its clean dataset when the raw data did not change.
+
+        Args:
+        dataset: Instance of a dataset class (e.g., Ckd, Disease, Cassi, Maternal).
+
+        Returns:
+        dict: Dictionary where keys are column names and values are lists of unique categorical values.
+        """
+        path = Datasets.get_enums_file(type(dataset).__name__)
+        content_hash = ModelSnapshotStore.get_file_hash(dataset.path)
+
+        try:
+            with open(path, encoding='utf-8') as file:
+                cached = json.load(file)
+            if cached.get("hash") == content_hash:
+                return cached["enums"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        enums = DatasetsTools.get_instance().get_categorical_enums(dataset)
+
+        # The enums file is only a cache, the enums are returned even when it cannot be written
+        temporary_path = None
+        try:
+            descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                json.dump({"hash": content_hash, "enums": enums}, file)
+            os.replace(temporary_path, path)
+        except OSError as e:
+            print(f"Error writing the enums file {path}: {e}")
+            if temporary_path is not None and os.path.exists(temporary_path):
+                os.remove(temporary_path)
+        return enums
+
+    @classmethod
+    def get_selected_enums(cls):
+        """
+        Retrieve the enums served to the frontend, merged across datasets.
+
+        Returns:
+        dict: Dictionary where keys are the SELECTED_ENUMS columns and values are lists of their values.
+        """
+        selected_enums = {column: [] for column in cls.SELECTED_ENUMS}
+
+        # Extract and organize selected enums
+        for enum in cls.get_enums():
+            for column in cls.SELECTED_ENUMS:
+                if column in enum:
+                    selected_enums[column].extend(enum[column])
+
+        return selected_enums
+
+    @classmethod
+    def get_enums_payload(cls):
+        """
+        Retrieve the precomputed JSON response body of the selected enums and its ETag.
+
+        Returns:
+        tuple: JSON body as bytes and its ETag.
+        """
+        if cls._cached_enums_payload is None:
+            body = json.dumps({"enums": cls.get_selected_enums()}, separators=(',', ':')).encode('utf-8')
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            cls._cached_enums_payload = (body, etag)
+        return cls._cached_enums_payload
+
+    @classmethod
+    def clear_enums(cls):
+        """
+        Clear the in-memory enums, so they are retrieved again on next use.
+        """
+        cls._cached_enums = None
+        cls._cached_enums_payload = None
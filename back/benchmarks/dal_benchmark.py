@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the backend directory to sys.path so the app package can be imported when run as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.dal.async_proxys.account_proxy import AsyncAccountProxy
+from app.dal.async_proxys.widget_proxy import AsyncWidgetProxy
+from app.dal.proxys.account_proxy import AccountProxy
+from app.dal.proxys.widget_proxy import WidgetProxy
+from app.entities.configs.postgresql import Postgresql
+
+# Benchmarked queries: synchronous proxy method, asynchronous proxy method and their arguments
+QUERIES = {
+    "widgets": (lambda: WidgetProxy().get_widgets, lambda: AsyncWidgetProxy().get_widgets, ()),
+    "accounts": (lambda: AccountProxy().get_accounts, lambda: AsyncAccountProxy().get_accounts, (0,)),
+}
+
+def summarize(path, latencies, seconds):
+    """
+    Summarize the latencies of a benchmark run.
+
+    Args:
+    path (str): Benchmarked DAL path.
+    latencies (list): Latency of each call in seconds.
+    seconds (float): Wall time of the run in seconds.
+
+    Returns:
+    dict: Throughput and latency percentiles of the run.
+    """
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "path": path,
+        "requests": len(latencies),
+        "throughput": len(latencies) / seconds if seconds else 0.0,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+def run_sync(method, args, requests, concurrency):
+    """
+    Call a synchronous proxy method from a thread pool, as FastAPI runs sync endpoints.
+
+    Args:
+    method (callable): Synchronous proxy method.
+    args (tuple): Arguments of the method.
+    requests (int): Number of calls.
+    concurrency (int): Number of concurrent calls.
+
+    Returns:
+    dict: Throughput and latency percentiles of the run.
+    """
+    def timed_call(_):
+        start_time = time.perf_counter()
+        method(*args)
+        return time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(timed_call, range(requests)))
+    return summarize("sync", latencies, time.perf_counter() - start_time)
+
+async def run_async(method, args, requests, concurrency):
+    """
+    Call an asynchronous proxy method from concurrent tasks on one event loop.
+
+    Args:
+    method (callable): Asynchronous proxy method.
+    args (tuple): Arguments of the method.
+    requests (int): Number of calls.
+    concurrency (int): Number of concurrent calls.
+
+    Returns:
+    dict: Throughput and latency percentiles of the run.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_call():
+        async with semaphore:
+            start_time = time.perf_counter()
+            await method(*args)
+            return time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    latencies = await asyncio.gather(*(timed_call() for _ in range(requests)))
+    return summarize("async", list(latencies), time.perf_counter() - start_time)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the synchronous and asynchronous DAL against a PostgreSQL server.")
+    parser.add_argument("--query", choices=sorted(QUERIES), default="widgets", help="Benchmarked query")
+    parser.add_argument("--requests", type=int, default=1000, help="Number of calls of each path")
+    parser.add_argument("--concurrency", type=int, default=Postgresql.MAX_CONNECTIONS, help="Concurrent calls")
+    parser.add_argument("--host", default=Postgresql.HOST, help="Host of the PostgreSQL server")
+    parser.add_argument("--port", type=int, default=Postgresql.PORT, help="Port of the PostgreSQL server")
+    parser.add_argument("--dbname", default=Postgresql.DBNAME, help="Name of the database")
+    arguments = parser.parse_args()
+
+    Postgresql.HOST, Postgresql.PORT, Postgresql.DBNAME = arguments.host, arguments.port, arguments.dbname
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    sync_method, async_method, args = QUERIES[arguments.query]
+    for result in (run_sync(sync_method(), args, arguments.requests, arguments.concurrency),
+                   asyncio.run(run_async(async_method(), args, arguments.requests, arguments.concurrency))):
+        print(f"{result['path']:>5}: {result['requests']} requests, {result['throughput']:.1f} req/s, "
+              f"p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
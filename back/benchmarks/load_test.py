@@ -0,0 +1,307 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+# Add the backend directory to sys.path so the app package can be imported when run as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.entities.configs.datasets import Datasets
+from ml_benchmark import WEIGHT_FIELDS, generate_patients, install_stub_database, summarize
+
+# Fields of RiskAssessmentRequest, by key of the input data returned by Mapper.map_to_risk_assessment_request
+REQUEST_FIELDS = {
+    "Age": "age",
+    "Blood Pressure": "bloodPressure",
+    "Blood Sugar": "bloodSugar",
+    "Procedure Count": "procedureCount",
+    "Infections Reported": "infectionsReported",
+    "Body Temperature": "bodyTemperature",
+    "Heart Rate": "heartRate",
+    "Operative_Procedure": "operativeProcedure",
+    "Feelings_and_Urge": "feelingsAndUrge",
+    "Critical_Feelings": "criticalFeelings",
+    "Disease": "disease",
+    "SIR_Weight": "sirRating",
+    "MA_Weight": "maRating",
+    "Disease_Weight": "diseaseRating",
+    "CKD_Weight": "ckdRating",
+}
+
+# Load test scenarios: HTTP method, path and function building the JSON body from the load test and a random generator.
+# Only read endpoints are replayed among the CRUD controllers, so a load test never changes the database
+SCENARIOS = {
+    "risk-assessment": ("POST", "/get-risk-assessment", lambda test, rng: rng.choice(test.payloads)),
+    "risk-assessments": ("POST", "/get-risk-assessments",
+                         lambda test, rng: {"patients": rng.sample(test.payloads, min(test.batch_size, len(test.payloads)))}),
+    "enums": ("GET", "/get-enums", None),
+    "widgets": ("GET", "/get-widgets", None),
+    "accounts": ("POST", "/get-accounts", lambda test, rng: {"id": test.account_id, "limit": 50}),
+    "patients": ("GET", "/get-patients/{doctor_id}?limit=50", None),
+    "algorithms": ("GET", "/get-algorithms", None),
+    "models": ("GET", "/get-all-models", None),
+    "datasets": ("GET", "/get-datasets", None),
+}
+
+def to_request_payload(patient, enums, rng, index):
+    """
+    Convert generated input data into the JSON body of a RiskAssessmentRequest, as sent by the front end.
+
+    Args:
+    patient (dict): Input data of a patient, as returned by generate_patients.
+    enums (dict): Values of each categorical field.
+    rng (random.Random): Seeded random generator.
+    index (int): Index of the patient, used in its contact details.
+
+    Returns:
+    dict: JSON body of the request.
+    """
+    payload = {"name": f"Load Test {index}", "email": f"load.test.{index}@example.com", "phoneNumber": "0600000000"}
+    for field, request_field in REQUEST_FIELDS.items():
+        value = patient[field]
+        if field in WEIGHT_FIELDS:
+            payload[request_field] = value
+        elif field in enums:
+            payload[request_field] = value if value is not None else rng.choice(enums[field])
+        else:
+            payload[request_field] = "" if value is None else str(value)  # Empty numeric fields are filled from the nearest rows
+    return payload
+
+class LoadTest:
+    """
+    Closed loop load generator: each of the concurrent clients sends its next request as soon as the previous one answered.
+
+    Attributes:
+    client (httpx.AsyncClient): Client sending the requests, in process or to a local server.
+    scenarios (list): Names of the replayed scenarios.
+    weights (list): Relative share of the requests of each scenario.
+    payloads (list): JSON bodies of the risk assessment requests.
+    batch_size (int): Number of patients of each batch risk assessment.
+    account_id (int): Account identifier of the account listings.
+    doctor_id (int): Doctor identifier of the patient listings.
+    latencies (dict): Latency in seconds of each measured request, by scenario.
+    statuses (dict): Number of measured responses of each status code or failure, by scenario.
+    """
+
+    def __init__(self, client, scenarios, weights, payloads, batch_size, account_id, doctor_id):
+        self.client = client
+        self.scenarios = scenarios
+        self.weights = weights
+        self.payloads = payloads
+        self.batch_size = batch_size
+        self.account_id = account_id
+        self.doctor_id = doctor_id
+        self.latencies = {scenario: [] for scenario in scenarios}
+        self.statuses = {scenario: Counter() for scenario in scenarios}
+        self._remaining = 0
+
+    async def send(self, rng):
+        """
+        Send one request of a randomly chosen scenario.
+
+        Args:
+        rng (random.Random): Random generator of the client.
+
+        Returns:
+        tuple: Scenario, latency in seconds and status code, or exception name if the request failed.
+        """
+        scenario = rng.choices(self.scenarios, self.weights)[0]
+        method, path, build_body = SCENARIOS[scenario]
+        body = build_body(self, rng) if build_body else None
+        start_time = time.perf_counter()
+        try:
+            response = await self.client.request(method, path.format(doctor_id=self.doctor_id), json=body)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        return scenario, time.perf_counter() - start_time, status
+
+    async def run_client(self, rng, deadline, record):
+        """
+        Send requests until the requests are exhausted or the deadline passes.
+
+        Args:
+        rng (random.Random): Random generator of the client.
+        deadline (float or None): Monotonic time to stop at, or None to stop when the requests are exhausted.
+        record (bool): Whether the requests are measured, warm up requests are not.
+        """
+        while (deadline is None and self._remaining > 0) or (deadline is not None and time.monotonic() < deadline):
+            self._remaining -= 1
+            scenario, latency, status = await self.send(rng)
+            if record:
+                self.latencies[scenario].append(latency)
+                self.statuses[scenario][status] += 1
+
+    async def run(self, requests, duration, concurrency, seed, record=True):
+        """
+        Run the concurrent clients.
+
+        Args:
+        requests (int): Number of requests, used when no duration is given.
+        duration (float or None): Seconds to run for.
+        concurrency (int): Number of concurrent clients.
+        seed (int): Seed of the clients, each client gets its own generator.
+        record (bool, optional): Whether the requests are measured. Defaults to True.
+
+        Returns:
+        float: Wall time of the run in seconds.
+        """
+        self._remaining = requests
+        deadline = time.monotonic() + duration if duration else None
+        start_time = time.perf_counter()
+        await asyncio.gather(*(self.run_client(random.Random(seed * 1000 + client), deadline, record) for client in range(concurrency)))
+        return time.perf_counter() - start_time
+
+    def report(self, seconds):
+        """
+        Summarize the measured requests.
+
+        Args:
+        seconds (float): Wall time of the run in seconds.
+
+        Returns:
+        dict: Requests, errors, error rate, throughput, latency percentiles and status codes, by scenario and in total.
+        """
+        def summarize_requests(latencies, statuses):
+            errors = sum(count for status, count in statuses.items() if not isinstance(status, int) or status >= 400)
+            summary = {
+                "requests": len(latencies),
+                "errors": errors,
+                "error_rate": errors / len(latencies) if latencies else 0.0,
+                "throughput": len(latencies) / seconds if seconds else 0.0,
+            }
+            if latencies:
+                summary.update(summarize(latencies))
+            summary["statuses"] = {str(status): count for status, count in sorted(statuses.items(), key=str)}
+            return summary
+
+        scenarios = {scenario: summarize_requests(self.latencies[scenario], self.statuses[scenario]) for scenario in self.scenarios}
+        total_statuses = sum(self.statuses.values(), Counter())
+        total_latencies = [latency for latencies in self.latencies.values() for latency in latencies]
+        return {"seconds": seconds, "scenarios": scenarios, "total": summarize_requests(total_latencies, total_statuses)}
+
+def parse_scenarios(values):
+    """
+    Parse the scenarios of the command line, each one optionally followed by its weight.
+
+    Args:
+    values (list): Scenarios such as "risk-assessment" or "risk-assessment:8".
+
+    Returns:
+    tuple: Names and weights of the scenarios.
+    """
+    scenarios, weights = [], []
+    for value in values:
+        name, _, weight = value.partition(":")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name}, choose from {', '.join(SCENARIOS)}")
+        scenarios.append(name)
+        weights.append(float(weight) if weight else 1.0)
+    return scenarios, weights
+
+def create_client(arguments):
+    """
+    Create the HTTP client, sending the requests to a local server or to the gateway application in this process.
+
+    The datasets of the in-process application must be loaded first, as run.py does before serving.
+
+    Args:
+    arguments (argparse.Namespace): Parsed command line arguments.
+
+    Returns:
+    httpx.AsyncClient: The HTTP client.
+    """
+    timeout = httpx.Timeout(arguments.timeout)
+    if arguments.url:
+        limits = httpx.Limits(max_connections=arguments.concurrency, max_keepalive_connections=arguments.concurrency)
+        return httpx.AsyncClient(base_url=arguments.url, timeout=timeout, limits=limits)
+
+    from app.controllers.gateway_controller import GatewayController
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=GatewayController.get_app()), base_url="http://loadtest", timeout=timeout)
+
+async def main_async(arguments, scenarios, weights, payloads):
+    async with create_client(arguments) as client:
+        load_test = LoadTest(client, scenarios, weights, payloads, arguments.batch_size, arguments.account_id, arguments.doctor_id)
+        if arguments.warmup:
+            await load_test.run(arguments.warmup, None, arguments.concurrency, arguments.seed + 1, record=False)
+        seconds = await load_test.run(arguments.requests, arguments.duration, arguments.concurrency, arguments.seed)
+        return load_test.report(seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay risk assessment and CRUD read requests at a fixed concurrency, "
+                                                 "against the application in this process or a local server.")
+    parser.add_argument("--url", help="Base URL of a running server, such as http://127.0.0.1:8000 for the gateway. "
+                                      "The application is started in this process when it is not given")
+    parser.add_argument("--enums-url", help="Base URL of the server serving /get-enums, when it is not the one of --url, "
+                                            "such as the utils controller when each controller runs on its own port")
+    parser.add_argument("--scenario", action="append", metavar="NAME[:WEIGHT]",
+                        help=f"Replayed scenario and its relative weight, repeatable, among {', '.join(SCENARIOS)}. "
+                             "Defaults to risk-assessment")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent clients")
+    parser.add_argument("--requests", type=int, default=1000, help="Number of measured requests")
+    parser.add_argument("--duration", type=float, help="Seconds to run for, instead of a number of requests")
+    parser.add_argument("--warmup", type=int, default=50, help="Number of requests sent before measuring")
+    parser.add_argument("--payloads", type=int, default=500, help="Number of distinct risk assessment payloads")
+    parser.add_argument("--batch-size", type=int, default=20, help="Number of patients of each batch risk assessment")
+    parser.add_argument("--account-id", type=int, default=1, help="Account of the accounts scenario")
+    parser.add_argument("--doctor-id", type=int, default=1, help="Doctor of the patients scenario")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds before a request is counted as failed")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the payloads and of the scenario choices")
+    parser.add_argument("--stub-database", action="store_true",
+                        help="Replace the database with an in-process stub, to measure the API without PostgreSQL "
+                             "when the application runs in this process")
+    parser.add_argument("--datasets-dir", help="Directory of the datasets of the in-process application, "
+                                               "such as synthetic datasets written by scale_datasets.py")
+    parser.add_argument("--output", help="JSON file the report is written to")
+    arguments = parser.parse_args()
+
+    try:
+        scenarios, weights = parse_scenarios(arguments.scenario or ["risk-assessment"])
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    if arguments.url and (arguments.stub_database or arguments.datasets_dir):
+        parser.error("--stub-database and --datasets-dir only apply to the application started in this process")
+
+    if arguments.datasets_dir:
+        Datasets.use_directory(arguments.datasets_dir)
+    if arguments.stub_database:
+        install_stub_database()
+
+    if arguments.url:
+        response = httpx.get(f"{(arguments.enums_url or arguments.url).rstrip('/')}/get-enums", timeout=arguments.timeout)
+        response.raise_for_status()
+        enums = response.json()["enums"]
+    else:
+        from app.services.utils.startup import Startup
+        from app.services.utils.utils import Utils
+        Startup()
+        enums = Utils.get_selected_enums()
+    rng = random.Random(arguments.seed)
+    payloads = [to_request_payload(patient, enums, rng, index)
+                for index, patient in enumerate(generate_patients(rng, enums, arguments.payloads))]
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    report = asyncio.run(main_async(arguments, scenarios, weights, payloads))
+
+    print(f"{'scenario':<18} {'requests':>8} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, summary in list(report["scenarios"].items()) + [("total", report["total"])]:
+        print(f"{name:<18} {summary['requests']:>8} {summary['error_rate']:>7.1%} {summary['throughput']:>9.1f} "
+              f"{summary.get('p50_ms', 0):>9.2f} {summary.get('p95_ms', 0):>9.2f} {summary.get('p99_ms', 0):>9.2f}")
+    for name, summary in report["scenarios"].items():
+        print(f"{name} statuses: {summary['statuses']}")
+
+    if arguments.output:
+        report["environment"] = vars(arguments)
+        with open(arguments.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Report written to {arguments.output}")
+
+if __name__ == "__main__":
+    main()
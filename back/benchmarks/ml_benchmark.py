@@ -0,0 +1,494 @@
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import sklearn
+
+# Add the backend directory to sys.path so the app package can be imported when run as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.dal.databases.postgresql_connection import PostgresqlConnection
+from app.dal.queries.widget_queries import GET_WIDGETS_QUERY
+from app.entities.configs.datasets import Datasets
+from app.services.dataset_ops.dataset_operation_service import DatasetOperationService
+from app.services.utils.datasets_tools import DatasetsTools
+from app.services.utils.mapper import Mapper
+from app.services.utils.model_snapshot_store import ModelSnapshotStore
+from app.services.utils.row_encoder import RowEncoder
+from app.services.utils.startup import Startup
+from app.services.utils.utils import Utils
+
+# Ranges of the numeric fields of the generated patients, as (minimum, maximum)
+NUMERIC_FIELDS = {
+    "Age": (18, 90),
+    "Blood Pressure": (80, 180),
+    "Blood Sugar": (70, 250),
+    "Procedure Count": (0, 5),
+    "Infections Reported": (0, 5),
+    "Body Temperature": (96, 104),
+    "Heart Rate": (50, 130),
+}
+
+# Rating fields of the generated patients, from 0 to 5
+WEIGHT_FIELDS = ("SIR_Weight", "MA_Weight", "Disease_Weight", "CKD_Weight")
+
+# Rows returned by the stub database for the queries that always return one, such as the widget counters
+STUB_ROWS = {
+    GET_WIDGETS_QUERY: (0,) * 11,
+}
+
+class StubCursor:
+    """
+    Cursor of the stub database, recording the queries and returning no rows, or the STUB_ROWS row of the query.
+    """
+
+    def __init__(self, queries):
+        self.queries = queries
+        self.rowcount = 0
+        self.query = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        self.queries.append(query)
+        self.query = query
+
+    def fetchone(self):
+        return STUB_ROWS.get(self.query)
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+class StubConnection:
+    """
+    Connection of the stub database.
+    """
+
+    closed = 0
+
+    def __init__(self, queries):
+        self.queries = queries
+
+    def cursor(self):
+        return StubCursor(self.queries)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+class StubPostgresqlConnection:
+    """
+    Offline replacement of the PostgresqlConnection pool, so the benchmark never reaches a database.
+
+    Attributes:
+    pid (int): Process the pool belongs to, as checked by PostgresqlConnection.get_instance.
+    queries (list): Queries executed through the pool.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.queries = []
+
+    @contextmanager
+    def connection(self):
+        yield StubConnection(self.queries)
+
+    def health_check(self):
+        return True
+
+    def get_stats(self):
+        return {"open": 0, "idle": 0, "borrowed": 0, "max_size": 0}
+
+    def close(self):
+        pass
+
+def install_stub_database():
+    """
+    Make PostgresqlConnection.get_instance return a stub pool for the current process.
+
+    Returns:
+    StubPostgresqlConnection: The installed stub pool.
+    """
+    stub = StubPostgresqlConnection()
+    with PostgresqlConnection._lock:
+        PostgresqlConnection._instance = stub
+    return stub
+
+def seed_everything(seed):
+    """
+    Seed the random generators used by the data splits, the models and the generated patients.
+
+    Args:
+    seed (int): Seed of the run.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+
+def summarize(latencies):
+    """
+    Summarize latencies in milliseconds.
+
+    Args:
+    latencies (list): Latency of each call in seconds.
+
+    Returns:
+    dict: Median, 95th and 99th percentile and mean latencies in milliseconds.
+    """
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+def timed(function, *args):
+    """
+    Call a function and measure its wall time.
+
+    Args:
+    function (callable): Function to call.
+    *args: Arguments of the function.
+
+    Returns:
+    tuple: Result of the function and its wall time in seconds.
+    """
+    start_time = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_time
+
+def get_peak_memory_mb():
+    """
+    Get the peak resident memory of the process since it started.
+
+    Returns:
+    float or None: Peak resident memory in MiB, or None if the platform does not report it.
+    """
+    try:
+        import resource
+    except ImportError:
+        return get_peak_memory_mb_windows()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # Bytes on macOS, KiB elsewhere
+
+def get_peak_memory_mb_windows():
+    """
+    Get the peak working set of the process on Windows.
+
+    Returns:
+    float or None: Peak working set in MiB, or None if it cannot be read.
+    """
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+    except (AttributeError, OSError):
+        return None
+
+def generate_patients(rng, enums, count, missing_rate=0.2):
+    """
+    Generate risk assessment inputs, in the format of Mapper.map_to_risk_assessment_request.
+
+    Args:
+    rng (random.Random): Seeded random generator.
+    enums (dict): Values of each categorical field, as returned by Utils.get_selected_enums.
+    count (int): Number of patients.
+    missing_rate (float, optional): Probability of a field left empty, filled from the nearest rows. Defaults to 0.2.
+
+    Returns:
+    list: Input data of each patient.
+    """
+    patients = []
+    for _ in range(count):
+        patient = {}
+        for field, (minimum, maximum) in NUMERIC_FIELDS.items():
+            patient[field] = None if rng.random() < missing_rate else rng.randint(minimum, maximum)
+        for field, values in enums.items():
+            patient[field] = None if rng.random() < missing_rate else rng.choice(values)
+        for field in WEIGHT_FIELDS:
+            patient[field] = rng.randint(0, 5)
+        patients.append(patient)
+    return patients
+
+def reset_startup(snapshot_directory):
+    """
+    Forget the startup state, so the next Startup preprocesses the datasets again.
+
+    Args:
+    snapshot_directory (str): Directory the model snapshots are read from and written to.
+    """
+    Startup._instance = None
+    ModelSnapshotStore._instance = ModelSnapshotStore(snapshot_directory)
+
+def benchmark_startup(snapshot_directory):
+    """
+    Measure the startup time without model snapshots, training every model, then with the snapshots just written.
+
+    Args:
+    snapshot_directory (str): Empty directory for the model snapshots.
+
+    Returns:
+    dict: Cold and warm startup times in seconds.
+    """
+    reset_startup(snapshot_directory)
+    _, cold_seconds = timed(Startup)
+    reset_startup(snapshot_directory)
+    _, warm_seconds = timed(Startup)
+    return {"cold_seconds": cold_seconds, "warm_seconds": warm_seconds}
+
+def benchmark_models(repeats, train_repeats):
+    """
+    Measure the training and prediction times of every model of every dataset, keeping the median of several runs.
+
+    Models are trained on copies, the served models are left untouched.
+
+    Args:
+    repeats (int): Number of measured predictions of each model.
+    train_repeats (int): Number of measured trainings of each model.
+
+    Returns:
+    dict: Training time, single row prediction latency and test set prediction time of each model, by dataset.
+    """
+    results = {}
+    for dataset in DatasetsTools.get_instance().get_datasets_instances():
+        dataset_results = results.setdefault(type(dataset).__name__, {})
+        # The served models are fitted and queried on feature matrices
+        X_train = RowEncoder.get_matrix(dataset.X_train)
+        X_test = RowEncoder.get_matrix(dataset.X_test)
+        for model in dataset.models:
+            train_latencies = []
+            for _ in range(train_repeats):
+                trained = copy.deepcopy(model)
+                train_latencies.append(timed(trained.train, X_train, dataset.y_train)[1])
+            row = X_test[:1]
+            trained.predict(row)  # Warm up
+            row_latencies = [timed(trained.predict, row)[1] for _ in range(repeats)]
+            test_set_latencies = [timed(trained.predict, X_test)[1] for _ in range(repeats)]
+            dataset_results[type(model).__name__] = {
+                "train_ms": statistics.median(train_latencies) * 1000,
+                "predict_row_ms": statistics.median(row_latencies) * 1000,
+                "predict_test_set_ms": statistics.median(test_set_latencies) * 1000,
+                "test_set_rows": len(dataset.X_test),
+            }
+    return results
+
+def benchmark_stages(patients, k):
+    """
+    Measure the nearest neighbors search and the preprocessing of a row for every dataset.
+
+    Args:
+    patients (list): Input data of each patient.
+    k (int): Number of nearest neighbors.
+
+    Returns:
+    dict: Latencies of find_nearest_rows and preprocess_row, by dataset.
+    """
+    datasets_tools = DatasetsTools.get_instance()
+    results = {}
+    for name, dataset_class, _, map_to_row, _ in DatasetOperationService.RISK_ASSESSMENT_DATASETS:
+        dataset = dataset_class()
+        rows = [map_to_row(patient) for patient in patients]
+        nearest_latencies, preprocess_latencies = [], []
+        for row in rows:
+            nearest_rows, seconds = timed(datasets_tools.find_nearest_rows, dataset, row, k)
+            nearest_latencies.append(seconds)
+            filled_row = Mapper.fill_empty_values(row, nearest_rows)
+            preprocess_latencies.append(timed(dataset.preprocess_row, filled_row)[1])
+        results[type(dataset).__name__] = {
+            "find_nearest_rows": summarize(nearest_latencies),
+            "preprocess_row": summarize(preprocess_latencies),
+        }
+    return results
+
+def benchmark_risk_assessments(patients, batch_size, k):
+    """
+    Measure the latency of single patient and batch risk assessments, with the result cache disabled.
+
+    Args:
+    patients (list): Input data of each patient.
+    batch_size (int): Number of patients of each batch.
+    k (int): Number of nearest neighbors.
+
+    Returns:
+    dict: Latencies of single patient assessments, and of batches with their per patient cost.
+    """
+    cache_enabled = DatasetOperationService.CACHE["enabled"]
+    DatasetOperationService.CACHE["enabled"] = False
+    try:
+        DatasetOperationService.get_risk_assessment(patients[0], k)  # Warm up the distance engines and the thread pool
+        single_latencies = [timed(DatasetOperationService.get_risk_assessment, patient, k)[1] for patient in patients]
+        batches = [patients[start:start + batch_size] for start in range(0, len(patients), batch_size)]
+        batch_latencies = [timed(DatasetOperationService.get_risk_assessments, batch, k)[1] for batch in batches]
+    finally:
+        DatasetOperationService.CACHE["enabled"] = cache_enabled
+
+    batch = summarize(batch_latencies)
+    batch["per_patient_ms"] = sum(batch_latencies) * 1000 / len(patients)
+    batch["batch_size"] = batch_size
+    return {"single": summarize(single_latencies), "batch": batch}
+
+def flatten(results, prefix=""):
+    """
+    Flatten nested results into dotted metric names.
+
+    Args:
+    results (dict): Nested results.
+    prefix (str, optional): Prefix of the metric names. Defaults to "".
+
+    Returns:
+    dict: Value of each metric, by dotted name.
+    """
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, f"{name}."))
+        else:
+            metrics[name] = value
+    return metrics
+
+def compare(metrics, baseline_metrics, tolerance, min_delta_ms):
+    """
+    Compare the metrics of a run with a baseline, every metric being a time or a memory size where lower is better.
+
+    Args:
+    metrics (dict): Metrics of the run, by dotted name.
+    baseline_metrics (dict): Metrics of the baseline, by dotted name.
+    tolerance (float): Relative increase over the baseline reported as a regression.
+    min_delta_ms (float): Smallest increase of a latency in milliseconds reported as a regression, below it is noise.
+
+    Returns:
+    list: Tuples of metric name, baseline value, current value and ratio of the regressions.
+    """
+    regressions = []
+    for name, baseline_value in sorted(baseline_metrics.items()):
+        value = metrics.get(name)
+        if not isinstance(value, (int, float)) or not isinstance(baseline_value, (int, float)) or baseline_value <= 0:
+            continue
+        if name.endswith(("test_set_rows", "batch_size")):
+            continue  # Sizes of the run, not measurements
+        if name.endswith("_ms") and value - baseline_value < min_delta_ms:
+            continue
+        ratio = value / baseline_value
+        if ratio > 1 + tolerance:
+            regressions.append((name, baseline_value, value, ratio))
+    return regressions
+
+def run(arguments):
+    """
+    Run every benchmark.
+
+    Args:
+    arguments (argparse.Namespace): Parsed command line arguments.
+
+    Returns:
+    dict: Environment of the run and nested results.
+    """
+    stub = install_stub_database()
+    seed_everything(arguments.seed)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as snapshot_directory:
+        results["startup"] = benchmark_startup(snapshot_directory)
+    results["memory"] = {"peak_after_startup_mb": get_peak_memory_mb()}
+
+    seed_everything(arguments.seed)
+    results["models"] = benchmark_models(arguments.repeats, arguments.train_repeats)
+
+    rng = random.Random(arguments.seed)
+    patients = generate_patients(rng, Utils.get_selected_enums(), arguments.patients)
+    results["stages"] = benchmark_stages(patients, arguments.k)
+    results["risk_assessment"] = benchmark_risk_assessments(patients, arguments.batch_size, arguments.k)
+    results["memory"]["peak_mb"] = get_peak_memory_mb()
+
+    return {
+        "environment": {
+            "seed": arguments.seed,
+            "patients": arguments.patients,
+            "k": arguments.k,
+            "datasets_dir": arguments.datasets_dir,
+            "repeats": arguments.repeats,
+            "train_repeats": arguments.train_repeats,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scikit-learn": sklearn.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+            "database_queries": len(stub.queries),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startup, model training and prediction, and risk assessments offline.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the data splits, the models and the generated patients")
+    parser.add_argument("--patients", type=int, default=200, help="Number of generated patients")
+    parser.add_argument("--batch-size", type=int, default=50, help="Number of patients of each batch risk assessment")
+    parser.add_argument("--repeats", type=int, default=50, help="Number of measured predictions of each model")
+    parser.add_argument("--train-repeats", type=int, default=3, help="Number of measured trainings of each model")
+    parser.add_argument("--k", type=int, default=5, help="Number of nearest neighbors")
+    parser.add_argument("--datasets-dir", help="Directory of the datasets to benchmark instead of the bundled ones, "
+                                               "such as synthetic datasets written by scale_datasets.py")
+    parser.add_argument("--output", help="JSON file the results are written to, to be used as a baseline by later runs")
+    parser.add_argument("--baseline", help="JSON file of a previous run to compare the results with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Relative slowdown over the baseline reported as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Smallest slowdown in milliseconds reported as a regression")
+    arguments = parser.parse_args()
+
+    if arguments.datasets_dir:
+        Datasets.use_directory(arguments.datasets_dir)
+    report = run(arguments)
+    metrics = flatten(report["results"])
+    for name, value in metrics.items():
+        print(f"{name}: {value:.3f}" if isinstance(value, float) else f"{name}: {value}")
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {arguments.output}")
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(metrics, flatten(baseline["results"]), arguments.tolerance, arguments.min_delta_ms)
+        for name, baseline_value, value, ratio in regressions:
+            print(f"Regression: {name} {baseline_value:.3f} -> {value:.3f} ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regression over {arguments.tolerance:.0%} against {arguments.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import argparse
+import os
+import sys
+import time
+
+# Add the backend directory to sys.path so the app package can be imported when run as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.utils.dataset_scaler import DatasetScaler
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic versions of the bundled datasets, for load and scaling tests. "
+                                                 "Start the backend or the benchmarks with --datasets-dir to use them.")
+    parser.add_argument("directory", help="Directory of the synthetic datasets, created if needed")
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument("--factor", type=float, help="Number of rows relative to each bundled dataset, such as 100 or 1000")
+    size.add_argument("--rows", type=int, help="Number of rows of every dataset")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the generated rows")
+    arguments = parser.parse_args()
+
+    start_time = time.perf_counter()
+    written = DatasetScaler(arguments.seed).scale_all(arguments.directory, factor=arguments.factor, rows=arguments.rows)
+    for dataset_name, rows in written.items():
+        print(f"{dataset_name}: {rows} rows")
+    print(f"Datasets written to {arguments.directory} in {time.perf_counter() - start_time:.1f} seconds")
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,29 @@
+import argparse
 import asyncio
+import os
+import shutil
+import tempfile
 import uvicorn
 import sys
+from functools import partial
 from app.controllers.accounts_controller import AccountsController
 from app.controllers.admins_controller import AdminsController
 from app.controllers.algorithms_controller import AlgorithmsController
 from app.controllers.dataset_operations_controller import DatasetPperationsController
 from app.controllers.dataset_views_controller import DatasetViewsController
 from app.controllers.doctors_controller import DoctorsController
+from app.controllers.gateway_controller import GatewayController
 from app.controllers.models_controller import ModelsController
 from app.controllers.patients_controller import PatientsController
 from app.controllers.tools_controller import ToolsController
 from app.controllers.utils_controller import UtilsController
 from app.controllers.widgets_controller import WidgetsController
+from app.entities.configs.datasets import Datasets
 from app.entities.configs.endpoint import Endpoint
+from app.entities.configs.postgresql import Postgresql
+from app.services.utils.inference_pool import InferencePool
+from app.services.utils.instrumentation import Instrumentation
+from app.services.utils.prefork_server import PreforkServer
 from app.services.utils.startup import Startup
 
 sys.path.append(".Controllers")
@@ -42,6 +53,59 @@ async def start():
 
     await asyncio.gather(*tasks)
 
+def start_inference_pool():
+    # Start the inference workers from the trained datasets before the servers accept requests
+    pool = InferencePool.get_instance()
+    if pool.enabled:
+        pool.start()
+        print(f"Started {InferencePool.CONFIG['workers']} inference worker processes...")
+
+def create_gateway_app(workers, metrics_directory):
+    # Each gateway worker scores its risk assessments in its own inference pool
+    start_inference_pool()
+    if metrics_directory:
+        # Drop the histograms recorded before the fork, the workers add up their own ones
+        instrumentation = Instrumentation.get_instance()
+        instrumentation.reset()
+        instrumentation.share(metrics_directory)
+    return GatewayController.get_app(workers)
+
+def start_gateway(port, workers):
+    # The datasets are trained before the fork, the application and its connections are created in each worker
+    workers = max(1, workers) if hasattr(os, "fork") else 1  # Without fork, the gateway is served from this process
+    metrics_directory = tempfile.mkdtemp(prefix="gateway-metrics-") if workers > 1 else None
+    try:
+        PreforkServer(partial(create_gateway_app, workers, metrics_directory), Endpoint.host, port, workers).run()
+    finally:
+        if metrics_directory:
+            shutil.rmtree(metrics_directory, ignore_errors=True)
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Start the backend servers.")
+    parser.add_argument("--mode", choices=["ports", "gateway"], default=Endpoint.mode,
+                        help="Serve each controller on its own port, or every controller from one gateway")
+    parser.add_argument("--port", type=int, default=Endpoint.gateway_port, help="Port of the gateway")
+    parser.add_argument("--workers", type=int, default=Endpoint.workers, help="Worker processes of the gateway, the training and evaluation endpoints need a single one")
+    parser.add_argument("--async-dal", action="store_true", default=Postgresql.ASYNC_DAL,
+                        help="Use the asynchronous database access layer")
+    parser.add_argument("--datasets-dir", help="Directory of the datasets to serve instead of the bundled ones, "
+                                               "such as synthetic datasets written by benchmarks/scale_datasets.py")
+    parser.add_argument("--inference-workers", type=int, default=InferencePool.CONFIG["workers"],
+                        help="Processes calculating the risk assessments, per gateway worker in gateway mode, "
+                             "0 to calculate them in the API process")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    arguments = parse_arguments()
+    Postgresql.ASYNC_DAL = arguments.async_dal
+    InferencePool.CONFIG["workers"] = arguments.inference_workers
+    if arguments.datasets_dir:
+        Datasets.use_directory(arguments.datasets_dir)
+    if Postgresql.ASYNC_DAL and sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())  # The async DAL needs add_reader
     Startup()
-    asyncio.run(start())
\ No newline at end of file
+    if arguments.mode == "gateway":
+        start_gateway(arguments.port, arguments.workers)
+    else:
+        start_inference_pool()
+        asyncio.run(start())
@@ -12,6 +12,10 @@ class TestAccountsController(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTrue(isinstance(response.json(), list))
 
+    def test_get_accounts_page_invalid_cursor(self):
+        response = self.client.post("/get-accounts", json={"id": 1, "limit": 10, "cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
     def test_health_check(self):
         response = self.client.get("/health")
         self.assertEqual(response.status_code, 200)
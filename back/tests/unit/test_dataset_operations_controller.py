@@ -1,13 +1,13 @@
 import unittest
 from fastapi.testclient import TestClient
-from app.controllers.dataset_operations_controller import DatasetOperationsController
+from app.controllers.dataset_operations_controller import DatasetPperationsController
 from app.services.dataset_ops.dataset_operation_service import DatasetOperationService
 from app.entities.requests.risk_assessment_request import RiskAssessmentRequest
 
 class TestDatasetOperationsController(unittest.TestCase):
 
     def setUp(self):
-        self.client = TestClient(DatasetOperationsController.get_app())
+        self.client = TestClient(DatasetPperationsController.get_app())
 
     def test_preprocess_datasets(self):
         response = self.client.post("/preprocess_datasets")
@@ -26,6 +26,36 @@ class TestDatasetOperationsController(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("Details of risk assessment calculations:", response.json()["message"])
 
+    def test_get_risk_assessments_empty(self):
+        response = self.client.post("/get-risk-assessments", json={"patients": []})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["assessments"], [])
+
+    def test_get_risk_assessment_cache(self):
+        response = self.client.get("/risk-assessment-cache")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("hits", response.json())
+        self.assertIn("misses", response.json())
+
+    def test_get_inference_pool(self):
+        response = self.client.get("/inference-pool")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("pending", response.json())
+        self.assertIn("rejected", response.json())
+
+    def test_list_training_jobs(self):
+        response = self.client.get("/training-jobs")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.json()["jobs"], list)
+
+    def test_get_training_job_not_found(self):
+        response = self.client.get("/training-jobs/unknown")
+        self.assertEqual(response.status_code, 404)
+
+    def test_cancel_training_job_not_found(self):
+        response = self.client.post("/training-jobs/unknown/cancel")
+        self.assertEqual(response.status_code, 404)
+
     def test_health_check(self):
         response = self.client.get("/health")
         self.assertEqual(response.status_code, 200)
@@ -0,0 +1,67 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from app.entities.configs.datasets import Datasets
+from app.entities.datasets.disease import Disease
+from app.entities.datasets.ckd import Ckd
+from app.entities.datasets.cassi import Cassi
+from app.entities.datasets.maternal import Maternal
+from app.services.utils.datasets_tools import DatasetsTools
+from app.services.utils.distance_engine import DistanceEngine
+
+# Bundled raw datasets, located from the test file so the tests run from any directory and platform
+RAW_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'datasets', 'raw')
+DATASETS = {'ckd': Ckd, 'disease': Disease, 'cassi': Cassi, 'maternal': Maternal}
+
+class TestDistanceEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tools = DatasetsTools()
+
+    def compile(self, df):
+        min_max = self.tools.get_min_max_columns(df)
+        dissimilarities = self.tools.get_categorical_dissimilarities(self.tools.get_categorical_frequencies(df))
+        return DistanceEngine(df, min_max, dissimilarities)
+
+    def assert_same_distances(self, engine, input_rows):
+        # Distances of the engine against the row by row mix_distance it replaces
+        records = engine.df.to_dict('records')
+        distances = engine.batch_distances(input_rows)
+        for input_row, row_distances in zip(input_rows, distances):
+            expected = [self.tools.mix_distance(record, input_row, engine.min_max, engine.dissimilarities) for record in records]
+            np.testing.assert_allclose(row_distances, expected, rtol=1e-12, atol=1e-12)
+
+    def test_bundled_datasets(self):
+        for name, dataset_class in DATASETS.items():
+            with self.subTest(dataset=name):
+                dataset = dataset_class()
+                df = dataset.preprocessor.clean(dataset.preprocessor.load(os.path.join(RAW_DIRECTORY, Datasets.get_file_name(name))))
+                engine = self.compile(df)
+
+                input_rows = df.sample(n=5, random_state=0).to_dict('records')
+                unseen = dict(input_rows[0])
+                for column in df.columns:
+                    if df[column].dtype == object:
+                        unseen[column] = 'unseen value'
+                missing = {column: value for column, value in input_rows[1].items() if column != df.columns[0]}
+                missing[df.columns[-1]] = None
+                self.assert_same_distances(engine, input_rows + [unseen, missing])
+
+    def test_zero_span_of_numpy_scalars(self):
+        # get_min_max_columns reads numpy scalars, a constant column divides to inf or nan
+        engine = self.compile(pd.DataFrame({'constant': [3.0, 3.0, 3.0], 'value': [1.0, 2.0, 4.0]}))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.assert_same_distances(engine, [{'constant': 3.0, 'value': 2.0}, {'constant': 5.0, 'value': 1.0}])
+        self.assertTrue(np.isnan(engine.distances({'constant': 3.0})).all())
+
+    def test_zero_span_of_python_numbers(self):
+        # Python numbers raise ZeroDivisionError, mix_distance then compares the values as categories
+        df = pd.DataFrame({'constant': [3.0, 3.0, 3.0], 'value': [1.0, 2.0, 4.0]})
+        engine = self.compile(df)
+        engine = DistanceEngine(df, {column: (float(low), float(high)) for column, (low, high) in engine.min_max.items()}, engine.dissimilarities)
+        self.assert_same_distances(engine, [{'constant': 3.0, 'value': 2.0}, {'value': 1.0}])
+        np.testing.assert_array_equal(engine.distances({'constant': 3.0}), [0.0, 0.0, 0.0])
+
+if __name__ == "__main__":
+    unittest.main()
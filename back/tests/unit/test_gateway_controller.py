@@ -0,0 +1,35 @@
+import unittest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from app.controllers.gateway_controller import GatewayController
+
+class TestGatewayController(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(GatewayController.get_app())
+
+    def tearDown(self):
+        # Clean up any test data after each test if needed
+        pass
+
+    def test_routes_of_every_controller(self):
+        paths = {route.path for route in GatewayController.get_app().router.routes if isinstance(route, APIRoute)}
+        for controller in GatewayController.CONTROLLERS:
+            for route in controller.get_app().router.routes:
+                if isinstance(route, APIRoute):
+                    self.assertIn(route.path, paths)
+
+    def test_stateful_endpoints_with_several_workers(self):
+        client = TestClient(GatewayController._create_instance(workers=4))
+        response = client.post("/process_datasets")
+        self.assertEqual(response.status_code, 501)
+        response = client.get("/training-jobs/unknown")
+        self.assertEqual(response.status_code, 501)
+
+    def test_health_check(self):
+        response = self.client.get("/health")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "ok")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -82,6 +82,30 @@ class TestPatientsController(unittest.TestCase):
         self.assertEqual(delete_response.status_code, 200)
         self.assertEqual(delete_response.json()["message"], "Patient deleted successfully")
 
+    def test_get_patients_page_invalid_cursor(self):
+        response = self.client.get("/get-patients/1", params={"limit": 10, "cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_upload_patient_invalid_photo_type(self):
+        response = self.client.post("/upload-patient", data={
+            "name": "John Doe",
+            "age": "40",
+            "phone_number": "0600000000",
+            "email": "john.doe@example.com",
+            "doctor_id": "12345"
+        }, files={"photo": ("notes.txt", b"not an image", "text/plain")})
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_patient_image_not_found(self):
+        response = self.client.get("/patient-image/does-not-exist.jpg")
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_patient_image_not_modified(self):
+        response = self.client.get("/patient-image/re.jpg")
+        self.assertEqual(response.status_code, 200)
+        cached_response = self.client.get("/patient-image/re.jpg", headers={"If-None-Match": response.headers["etag"]})
+        self.assertEqual(cached_response.status_code, 304)
+
     def test_health_check(self):
         response = self.client.get("/health")
         self.assertEqual(response.status_code, 200)
@@ -0,0 +1,66 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from app.entities.configs.datasets import Datasets
+from app.entities.datasets.disease import Disease
+from app.entities.datasets.ckd import Ckd
+from app.entities.datasets.cassi import Cassi
+from app.entities.datasets.maternal import Maternal
+
+# Bundled raw datasets, located from the test file so the tests run from any directory and platform
+RAW_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'datasets', 'raw')
+DATASETS = {'ckd': Ckd, 'disease': Disease, 'cassi': Cassi, 'maternal': Maternal}
+
+# Target columns the preprocessors encode in convert, added as placeholders to the rows as preprocess_row did
+TARGETS = {'ckd': Datasets.ckd_train, 'disease': Datasets.disease_train}
+
+class TestRowEncoder(unittest.TestCase):
+
+    def load(self, name):
+        # Same steps as preprocess, without writing the clean dataset
+        dataset = DATASETS[name]()
+        dataset.df_raw = dataset.preprocessor.load(os.path.join(RAW_DIRECTORY, Datasets.get_file_name(name)))
+        df = dataset.preprocessor.convert(dataset.preprocessor.clean(dataset.df_raw))
+        dataset.X_train, dataset.X_test, dataset.y_train, dataset.y_test = dataset.preprocessor.get_train_test(df)
+        return dataset
+
+    def legacy_encode(self, name, dataset, input_row):
+        # pd.get_dummies and reindex path the encoder replaces
+        df_row = pd.DataFrame([input_row])
+        target = TARGETS.get(name)
+        if target is not None:
+            df_row[target] = 0
+        df_row = dataset.preprocessor.convert(df_row)
+        if target is not None:
+            df_row = df_row.drop(columns=[target])
+        return df_row.reindex(columns=dataset.X_train.columns, fill_value=0).to_numpy(dtype=float)[0]
+
+    def test_bundled_datasets(self):
+        for name in DATASETS:
+            with self.subTest(dataset=name):
+                dataset = self.load(name)
+                target = TARGETS.get(name)
+                input_rows = [{column: value for column, value in row.items() if column != target}
+                              for row in dataset.df_raw.sample(n=5, random_state=0).to_dict('records')]
+                # Values missing from the training data only have no one-hot column in categorical columns
+                categorical_columns = dataset.preprocessor.CATEGORICAL_COLUMNS
+                unseen = dict(input_rows[0])
+                for column, value in unseen.items():
+                    if column in categorical_columns if categorical_columns is not None else isinstance(value, str):
+                        unseen[column] = 'unseen value'
+                input_rows.append(unseen)
+
+                # pd.get_dummies requires the listed categorical columns, only the other ones may be missing
+                optional = [column for column in input_rows[1] if categorical_columns is None or column not in categorical_columns]
+                if optional:
+                    missing = {column: value for column, value in input_rows[1].items() if column != optional[0]}
+                    missing[optional[-1]] = None
+                    input_rows.append(missing)
+
+                matrix = dataset.preprocess_rows(input_rows)
+                for input_row, encoded in zip(input_rows, matrix):
+                    np.testing.assert_array_equal(encoded, self.legacy_encode(name, dataset, input_row))
+
+if __name__ == "__main__":
+    unittest.main()
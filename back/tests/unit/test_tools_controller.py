@@ -1,3 +1,4 @@
+import importlib.util
 import unittest
 from fastapi.testclient import TestClient
 from app.controllers.tools_controller import ToolsController
@@ -39,6 +40,23 @@ class TestToolsController(unittest.TestCase):
         self.assertIn("message", response.json())
         self.assertEqual(response.json()["message"], "Done")
 
+    def test_test_ckd_controller_invalid_output_format(self):
+        response = self.client.post("/test-ckd", params={"output_format": "xlsx"})
+        self.assertEqual(response.status_code, 422)
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow") is not None, "pyarrow is installed")
+    def test_test_ckd_controller_parquet_without_pyarrow(self):
+        response = self.client.post("/test-ckd", params={"output_format": "parquet"})
+        self.assertEqual(response.status_code, 501)
+
+    def test_evaluate_controller_unknown_dataset(self):
+        response = self.client.post("/evaluate/unknown")
+        self.assertEqual(response.status_code, 422)
+
+    def test_get_evaluation_controller_not_found(self):
+        response = self.client.get("/evaluations/unknown")
+        self.assertEqual(response.status_code, 404)
+
     def test_make_test_files_controller(self):
         response = self.client.post("/make-test-files")
         self.assertEqual(response.status_code, 200)
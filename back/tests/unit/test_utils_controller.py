@@ -21,10 +21,24 @@ class TestUtilsController(unittest.TestCase):
         self.assertIn("Disease", selected_enums)
         self.assertIn("Critical_Feelings", selected_enums)
 
+    def test_get_enums_controller_not_modified(self):
+        response = self.client.get("/get-enums")
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        response = self.client.get("/get-enums", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
     def test_health_check(self):
         response = self.client.get("/health")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["status"], "ok")
 
+    def test_metrics(self):
+        self.client.get("/health")
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn('http_request_duration_seconds_count{service="utils",method="GET",route="/health",status="200"}', response.text)
+
 if __name__ == "__main__":
     unittest.main()